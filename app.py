@@ -1,87 +1,170 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-from google.cloud import firestore
-from google.oauth2 import service_account
+from flask import Flask, Response, abort, render_template, request, jsonify, redirect, url_for, flash, stream_with_context
+from flask.helpers import get_debug_flag
 import os
 import re
-import random
-import string
-from datetime import datetime
+import time
 from dotenv import load_dotenv
-from form_security import require_turnstile
-from courses import get_courses_by_category, get_course_by_id, get_course_stats, format_price, set_db
-from video_config import get_video_urls
 
 load_dotenv()
 
+from form_security import require_turnstile
+from idempotency import idempotent, idempotent_document_id
+import idempotency
+from storage import create_storage, is_valid_document_id, SERVER_TIMESTAMP
+from courses import get_courses_by_category, get_course_by_id, get_courses_by_ids, add_display_fields, get_category_info, set_storage
+import courses as courses_module
+from video_config import get_video_urls
+from program_pages import PROGRAMS, PROGRAM_TEMPLATE, program_assets
+from url_signing import sign_course_videos, video_signer
+from validation import validate_partnership_application, build_partnership_document, generate_reference_number, get_remote_ip
+from content_store import fetch_with_fallback, store as last_known_good
+from catalog import catalog
+from enrollment_counters import record_enrollment, enrollment_rollup
+from search_index import search_index, ensure_indexed, handle_catalog_change, handle_catalog_refresh
+import blog_render
+from freeze import register_freeze_command
+from early_hints import early_hints, asset_hints
+from critical_css import critical_css, register_critical_css_command
+from fragment_cache import FragmentCacheExtension
+from http_cache import cache_policy, add_surrogate_keys, mark_uncacheable, purge_hook, shared_lifetime, STATIC_PAGE, CONTENT_PAGE, LISTING_PAGE, FORM_PAGE
+from json_provider import FirestoreJSONProvider
+from exports import EXPORT_COLUMNS, EXPORT_FORMATS, require_export_token, decode_cursor, parse_date, export_rows, iter_csv, iter_ndjson
+from feeds import feed_etag, get_feed, iter_sitemap_index, iter_urlset, sitemap_page_count
+
 app = Flask(__name__)
+app.json = FirestoreJSONProvider(app)
+app.jinja_env.add_extension(FragmentCacheExtension)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your_secret_key_here')
 
-def initialize_firestore():
-    try:
-        cred_dict = {
-            "type": "service_account",
-            "project_id": os.getenv('FIREBASE_PROJECT_ID'),
-            "private_key_id": os.getenv('FIREBASE_PRIVATE_KEY_ID'),
-            "private_key": os.getenv('FIREBASE_PRIVATE_KEY').replace('\\n', '\n'),
-            "client_email": os.getenv('FIREBASE_CLIENT_EMAIL'),
-            "client_id": os.getenv('FIREBASE_CLIENT_ID'),
-            "auth_uri": os.getenv('FIREBASE_AUTH_URI'),
-            "token_uri": os.getenv('FIREBASE_TOKEN_URI'),
-            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-            "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('FIREBASE_CLIENT_EMAIL')}"
-        }
-
-        credentials = service_account.Credentials.from_service_account_info(cred_dict)
-        client = firestore.Client(credentials=credentials, project=os.getenv('FIREBASE_PROJECT_ID'))
-        print("Firestore initialized successfully!")
-        return client
-    except Exception as e:
-        print(f"Error initializing Firestore: {e}")
-        return None
-
-db = initialize_firestore()
-set_db(db)
+# Listings at least this long are written to the client in chunks
+JSON_STREAM_MIN_ITEMS = int(os.getenv('JSON_STREAM_MIN_ITEMS', '200'))
+# Canonical origin for sitemap and feed links
+SITE_URL = os.getenv('SITE_URL', '').rstrip('/')
+# `python app.py` and `flask --debug run` may link to whatever origin they are served on
+LOCAL_DEBUG = __name__ == '__main__' or get_debug_flag()
+if not SITE_URL and not LOCAL_DEBUG:
+    raise RuntimeError("SITE_URL is not set; sitemap and feed links need the site's canonical origin")
+# Most course IDs accepted by /api/courses in one request
+COURSE_IDS_MAX = int(os.getenv('COURSE_IDS_MAX', '50'))
+FIELD_PATH_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$')
+
+# Signed hero links must stay valid as long as the CDN may serve a page embedding them
+_longest_page_lifetime = max(shared_lifetime(policy) for policy in (STATIC_PAGE, CONTENT_PAGE, LISTING_PAGE))
+if video_signer.enabled and video_signer.ttl < _longest_page_lifetime:
+    print(f"VIDEO_URL_TTL {video_signer.ttl}s is shorter than the longest page cache lifetime; "
+          f"using {_longest_page_lifetime}s")
+    video_signer.ttl = _longest_page_lifetime
+
+storage = None
+
+def init_worker(warm=True):
+    """
+    Create this process's storage backend and hand it to the data modules.
+
+    Called at import for single-process servers (Vercel, `python app.py`),
+    or from gunicorn's post_fork hook when FIRESTORE_DEFER_INIT=1 so that no
+    gRPC channel is ever created in the preloading master.
+    """
+    global storage
+    storage = create_storage()
+    set_storage(storage)
+    catalog.set_storage(storage)
+    idempotency.set_storage(storage)
+    enrollment_rollup.start(lambda: storage, lambda: list(catalog.courses))
+    last_known_good.start_snapshots()
+    if warm and storage is not None:
+        warm_up()
+    return storage
+
+def warm_up():
+    """Open the backend connection and prime the hot queries before taking traffic."""
+    steps = [
+        ('recent posts', lambda: get_recent_posts(3)),
+        ('blog listing', lambda: get_recent_posts(20)),
+    ]
+    for category in PROGRAMS:
+        steps.append((f'{category} courses', lambda category=category: get_courses_by_category(category)))
+    # With a shared snapshot this only maps the file (or publishes it once)
+    if catalog.snapshot or os.getenv('WARMUP_CATALOG', '0') == '1':
+        steps.append(('catalog', catalog.ensure_fresh))
+
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            print(f"Warm-up {name}: {(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            print(f"Warm-up {name} failed: {e}")
+
+if os.getenv('FIRESTORE_DEFER_INIT', '0') != '1':
+    init_worker(warm=False)
+catalog.subscribe(handle_catalog_change)
+catalog.after_refresh(handle_catalog_refresh)
+catalog.subscribe(courses_module.handle_catalog_change)
+catalog.subscribe(purge_hook.handle_catalog_change)
+catalog.after_refresh(purge_hook.after_refresh)
+catalog.subscribe(blog_render.handle_catalog_change)
+register_freeze_command(app)
+register_critical_css_command(app)
+app.after_request(critical_css.inline)
+
+def get_recent_posts(limit=3):
+    """Latest published blog posts, served from the last known good store on error."""
+    return fetch_with_fallback(f'blogs:recent:{limit}', lambda: storage.list_blogs(limit=limit))
+
+def save_submission(collection, data):
+    """
+    Write a form submission, once per idempotency key.
+
+    Returns:
+        The stored document; for a retry that raced the original, the
+        original document (so e.g. its reference_number can be returned)
+    """
+    doc_id = idempotent_document_id()
+    if doc_id:
+        return storage.create_submission(collection, doc_id, data)
+    storage.add_submission(collection, data)
+    return data
 
 @app.route('/')
+@cache_policy(**LISTING_PAGE, keys=['home', 'blogs'])
+@early_hints('index.html')
 def index():
     try:
         # Fetch latest 3 blog posts for homepage
-        blog_posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING).limit(3)
-        posts = []
-        
-        for doc in blog_posts_ref.stream():
-            post_data = doc.to_dict()
-            post_data['id'] = doc.id
-            posts.append(post_data)
+        posts = get_recent_posts(3)
+        add_surrogate_keys(*[f"blog:{post['id']}" for post in posts])
         
         return render_template('index.html', recent_posts=posts, **get_video_urls())
     except Exception as e:
         print(f"Error fetching data for homepage: {e}")
+        mark_uncacheable()
         return render_template('index.html', recent_posts=[], **get_video_urls())
 
 @app.route('/about')
+@cache_policy(**STATIC_PAGE, keys=['static'])
+@early_hints('about.html')
 def about():
     return render_template('about.html')
 
 @app.route('/courses')
+@cache_policy(**LISTING_PAGE, keys=['courses'])
+@early_hints('courses.html')
 def courses():
     try:
         # Fetch courses from database
-        courses_ref = db.collection('courses').where('status', '==', 'active').get()
-        courses_list = []
-        
-        for doc in courses_ref:
-            course_data = doc.to_dict()
-            course_data['id'] = doc.id
-            courses_list.append(course_data)
-        
+        courses_list = fetch_with_fallback('courses:active', lambda: storage.list_courses(status='active'))
         return render_template('courses.html', courses=courses_list)
     except Exception as e:
         print(f"Error fetching courses: {e}")
+        mark_uncacheable()
         return render_template('courses.html', courses=[])
 
 @app.route('/contact', methods=['GET', 'POST'])
+@early_hints('contact.html')
+@idempotent
 @require_turnstile
+@cache_policy(**FORM_PAGE)
 def contact():
     if request.method == 'POST':
         try:
@@ -91,11 +174,11 @@ def contact():
                 'phone': request.form.get('phone'),
                 'subject': request.form.get('subject'),
                 'message': request.form.get('message'),
-                'timestamp': firestore.SERVER_TIMESTAMP,
+                'timestamp': SERVER_TIMESTAMP,
                 'status': 'new'
             }
             
-            db.collection('contact_submissions').add(contact_data)
+            save_submission('contact_submissions', contact_data)
             
             flash('Thank you for contacting us! We will get back to you soon.', 'success')
             return redirect(url_for('contact'))
@@ -108,143 +191,58 @@ def contact():
     return render_template('contact.html', turnstile_site_key=turnstile_site_key)
 
 @app.route('/team')
+@cache_policy(**LISTING_PAGE, keys=['team'])
+@early_hints('team.html')
 def team():
     try:
         # Fetch team members from database
-        team_ref = db.collection('team_members').where('status', '==', 'active').get()
-        team_members = []
-        
-        for doc in team_ref:
-            member_data = doc.to_dict()
-            member_data['id'] = doc.id
-            team_members.append(member_data)
-        
+        team_members = fetch_with_fallback('team_members:active', lambda: storage.list_team_members(status='active'))
         return render_template('team.html', team_members=team_members)
     except Exception as e:
         print(f"Error fetching team members: {e}")
+        mark_uncacheable()
         return render_template('team.html', team_members=[])
 
-@app.route('/programs/doctalks')
-def doctalks():
-    try:
-        # Fetch courses for doctalks category
-        courses = get_courses_by_category('doctalks')
-
-        # Add formatted stats and price to each course
-        for course in courses:
-            course['stats'] = get_course_stats(course)
-            course['formatted_actual_price'] = format_price(course.get('actual_price', 0))
-            course['formatted_discounted_price'] = format_price(course.get('discounted_price', 0))
-
-        # Fetch latest blog posts
-        blog_posts = []
-        try:
-            posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING).limit(3)
-            for doc in posts_ref.stream():
-                post_data = doc.to_dict()
-                post_data['id'] = doc.id
-                if 'slug' not in post_data:
-                    post_data['slug'] = doc.id
-                blog_posts.append(post_data)
-        except Exception as blog_err:
-            print(f"Error fetching blog posts for doctalks: {blog_err}")
-
-        return render_template('programs/doctalks.html', courses=courses, blog_posts=blog_posts, **get_video_urls())
-    except Exception as e:
-        print(f"Error fetching doctalks courses: {e}")
-        return render_template('programs/doctalks.html', courses=[], blog_posts=[], **get_video_urls())
-
-@app.route('/programs/denttalks')
-def denttalks():
+def program_page(category):
+    """Landing page of a program (DocTALKS, DentTALKS, ...); see program_pages."""
+    program = PROGRAMS[category]
     try:
-        # Fetch courses for denttalks category
-        courses = get_courses_by_category('denttalks')
+        # Fetch courses for this program's category
+        courses = get_courses_by_category(category)
 
         # Add formatted stats and price to each course
         for course in courses:
-            course['stats'] = get_course_stats(course)
-            course['formatted_actual_price'] = format_price(course.get('actual_price', 0))
-            course['formatted_discounted_price'] = format_price(course.get('discounted_price', 0))
+            add_display_fields(course)
 
         # Fetch latest blog posts
         blog_posts = []
         try:
-            posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING).limit(3)
-            for doc in posts_ref.stream():
-                post_data = doc.to_dict()
-                post_data['id'] = doc.id
-                if 'slug' not in post_data:
-                    post_data['slug'] = doc.id
-                blog_posts.append(post_data)
+            blog_posts = get_recent_posts(3)
         except Exception as blog_err:
-            print(f"Error fetching blog posts for denttalks: {blog_err}")
+            print(f"Error fetching blog posts for {category}: {blog_err}")
 
-        return render_template('programs/denttalks.html', courses=courses, blog_posts=blog_posts, **get_video_urls())
+        add_surrogate_keys(*[f"course:{course['id']}" for course in courses])
+        add_surrogate_keys(*[f"blog:{post['id']}" for post in blog_posts])
+        return render_template(PROGRAM_TEMPLATE, program=program, courses=courses, blog_posts=blog_posts, **get_video_urls())
     except Exception as e:
-        print(f"Error fetching denttalks courses: {e}")
-        return render_template('programs/denttalks.html', courses=[], blog_posts=[], **get_video_urls())
-
-@app.route('/programs/nursetalks')
-def nursetalks():
-    try:
-        # Fetch courses for nursetalks category
-        courses = get_courses_by_category('nursetalks')
-
-        # Add formatted stats and price to each course
-        for course in courses:
-            course['stats'] = get_course_stats(course)
-            course['formatted_actual_price'] = format_price(course.get('actual_price', 0))
-            course['formatted_discounted_price'] = format_price(course.get('discounted_price', 0))
-
-        # Fetch latest blog posts
-        blog_posts = []
-        try:
-            posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING).limit(3)
-            for doc in posts_ref.stream():
-                post_data = doc.to_dict()
-                post_data['id'] = doc.id
-                if 'slug' not in post_data:
-                    post_data['slug'] = doc.id
-                blog_posts.append(post_data)
-        except Exception as blog_err:
-            print(f"Error fetching blog posts for nursetalks: {blog_err}")
-
-        return render_template('programs/nursetalks.html', courses=courses, blog_posts=blog_posts, **get_video_urls())
-    except Exception as e:
-        print(f"Error fetching nursetalks courses: {e}")
-        return render_template('programs/nursetalks.html', courses=[], blog_posts=[], **get_video_urls())
-
-@app.route('/programs/pharmatalks')
-def pharmatalks():
-    try:
-        # Fetch courses for pharmatalks category
-        courses = get_courses_by_category('pharmatalks')
-
-        # Add formatted stats and price to each course
-        for course in courses:
-            course['stats'] = get_course_stats(course)
-            course['formatted_actual_price'] = format_price(course.get('actual_price', 0))
-            course['formatted_discounted_price'] = format_price(course.get('discounted_price', 0))
-
-        # Fetch latest blog posts
-        blog_posts = []
-        try:
-            posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING).limit(3)
-            for doc in posts_ref.stream():
-                post_data = doc.to_dict()
-                post_data['id'] = doc.id
-                if 'slug' not in post_data:
-                    post_data['slug'] = doc.id
-                blog_posts.append(post_data)
-        except Exception as blog_err:
-            print(f"Error fetching blog posts for pharmatalks: {blog_err}")
-
-        return render_template('programs/pharmatalks.html', courses=courses, blog_posts=blog_posts, **get_video_urls())
-    except Exception as e:
-        print(f"Error fetching pharmatalks courses: {e}")
-        return render_template('programs/pharmatalks.html', courses=[], blog_posts=[], **get_video_urls())
+        print(f"Error fetching {category} courses: {e}")
+        mark_uncacheable()
+        return render_template(PROGRAM_TEMPLATE, program=program, courses=[], blog_posts=[], **get_video_urls())
+
+# One view for every program; the endpoint keeps the category name for url_for()
+for category, program in PROGRAMS.items():
+    app.add_url_rule(
+        program['url'],
+        endpoint=category,
+        defaults={'category': category},
+        view_func=cache_policy(**LISTING_PAGE, keys=[f'category:{category}', 'blogs'])(
+            early_hints(PROGRAM_TEMPLATE, assets=program_assets(program))(program_page)
+        ),
+    )
 
 @app.route('/course/<course_id>')
+@cache_policy(**CONTENT_PAGE)
+@early_hints('course-detail.html')
 def course_detail(course_id):
     """Dynamic course detail page for all courses."""
     try:
@@ -256,26 +254,14 @@ def course_detail(course_id):
             return redirect(url_for('courses'))
         
         # Add formatted stats and price
-        course['stats'] = get_course_stats(course)
-        course['formatted_actual_price'] = format_price(course.get('actual_price', 0))
-        course['formatted_discounted_price'] = format_price(course.get('discounted_price', 0))
+        add_display_fields(course)
+        sign_course_videos(course)
         
         # Get category info for breadcrumb and styling
         category = course.get('category', '')
-        category_info = {
-            'denttalks': {'name': 'DentTALKS', 'url': '/programs/denttalks', 'icon': '🦷', 'color': '#0e415b'},
-            'doctalks': {'name': 'DocTALKS', 'url': '/programs/doctalks', 'icon': '🩺', 'color': '#0e415b'},
-            'nursetalks': {'name': 'NurseTALKS', 'url': '/programs/nursetalks', 'icon': '👩‍⚕️', 'color': '#0e415b'},
-            'pharmatalks': {'name': 'PharmaTALKS', 'url': '/programs/pharmatalks', 'icon': '💊', 'color': '#0e415b'}
-        }
-        
-        course['category_info'] = category_info.get(category, {
-            'name': 'Courses',
-            'url': '/courses',
-            'icon': '📚',
-            'color': '#0e415b'
-        })
+        course['category_info'] = get_category_info(category)
         
+        add_surrogate_keys(f"course:{course['id']}", f"category:{category}" if category else None)
         return render_template('course-detail.html', course=course)
     except Exception as e:
         print(f"Error fetching course detail: {e}")
@@ -283,31 +269,44 @@ def course_detail(course_id):
         return redirect(url_for('courses'))
 
 @app.route('/products/dr-meddy')
+@cache_policy(**STATIC_PAGE, keys=['static'])
+@early_hints('products/dr-meddy.html')
 def dr_meddy():
     return render_template('products/dr-meddy.html', **get_video_urls())
 
 @app.route('/products/mr-brown')
+@cache_policy(**STATIC_PAGE, keys=['static'])
+@early_hints('products/mr-brown.html')
 def mr_brown():
     return render_template('products/mr-brown.html', **get_video_urls())
 
 @app.route('/products/oet-agents')
+@cache_policy(**STATIC_PAGE, keys=['static'])
+@early_hints('products/oet-agents.html')
 def oet_agents():
     return render_template('products/oet-agents.html', **get_video_urls())
 
 @app.route('/products/coursebooks')
+@cache_policy(**STATIC_PAGE, keys=['static'])
+@early_hints('products/coursebooks.html')
 def coursebooks():
     return render_template('products/coursebooks.html', **get_video_urls())
 
 @app.route('/partnerships')
+@cache_policy(**STATIC_PAGE, keys=['static'])
+@early_hints('partnerships.html')
 def partnerships():
     return render_template('partnerships.html')
 
 @app.route('/partnership-application')
+@cache_policy(**FORM_PAGE)
+@early_hints('partnership-application.html')
 def partnership_application():
     turnstile_site_key = os.getenv('TURNSTILE_SITE_KEY', '')
     return render_template('partnership-application.html', turnstile_site_key=turnstile_site_key)
 
 @app.route('/api/newsletter/subscribe', methods=['POST'])
+@idempotent
 def newsletter_subscribe():
     try:
         data = request.get_json()
@@ -316,19 +315,17 @@ def newsletter_subscribe():
         if not email:
             return jsonify({'success': False, 'message': 'Email is required'}), 400
         
-        existing = db.collection('newsletter_subscribers').where('email', '==', email).limit(1).get()
-        
-        if len(list(existing)) > 0:
+        if storage.find_submission('newsletter_subscribers', 'email', email):
             return jsonify({'success': False, 'message': 'This email is already subscribed'}), 400
         
         subscriber_data = {
             'email': email,
-            'subscribed_at': firestore.SERVER_TIMESTAMP,
+            'subscribed_at': SERVER_TIMESTAMP,
             'status': 'active',
             'source': data.get('source', 'website')
         }
         
-        db.collection('newsletter_subscribers').add(subscriber_data)
+        save_submission('newsletter_subscribers', subscriber_data)
         
         return jsonify({'success': True, 'message': 'Successfully subscribed to newsletter!'}), 200
     except Exception as e:
@@ -336,90 +333,43 @@ def newsletter_subscribe():
         return jsonify({'success': False, 'message': 'An error occurred. Please try again.'}), 500
 
 @app.route('/blog')
+@cache_policy(**LISTING_PAGE, keys=['blogs'])
+@early_hints('blog.html')
 def blog():
     try:
         # Fetch published blogs from 'blogs' collection
-        blog_posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING).limit(20)
         posts = []
         
-        for doc in blog_posts_ref.stream():
-            post_data = doc.to_dict()
-            post_data['id'] = doc.id
-            
-            # Add slug if it doesn't exist
-            if 'slug' not in post_data:
-                post_data['slug'] = doc.id
-            
+        for post_data in get_recent_posts(20):
             # Use updatedByPhotoURL for author avatar
-            if 'updatedByPhotoURL' in post_data and post_data['updatedByPhotoURL']:
-                if 'author' not in post_data:
-                    post_data['author'] = {}
-                post_data['author']['avatar'] = post_data['updatedByPhotoURL']
+            blog_render.apply_author_avatar(post_data)
             
             posts.append(post_data)
         
         print(f"Fetched {len(posts)} blog posts from database")
+        add_surrogate_keys(*[f"blog:{post['id']}" for post in posts])
         return render_template('blog.html', posts=posts)
     except Exception as e:
         print(f"Error fetching blog posts: {e}")
+        mark_uncacheable()
         return render_template('blog.html', posts=[])
 
 @app.route('/blog/<slug>')
+@cache_policy(**CONTENT_PAGE)
+@early_hints('blog-post.html')
 def blog_post(slug):
     try:
-        # Try to find by slug first
-        blog_ref = db.collection('blogs').where('slug', '==', slug).limit(1)
-        docs = list(blog_ref.stream())
-        
-        # If not found by slug, try by document ID
-        if not docs:
-            doc_ref = db.collection('blogs').document(slug)
-            doc = doc_ref.get()
-            if doc.exists:
-                docs = [doc]
+        # Looked up by slug first, then by document ID
+        post = None
+        if is_valid_document_id(slug):
+            post = fetch_with_fallback(f'blog:{slug}', lambda: storage.get_blog(slug))
         
-        if docs:
-            post = docs[0].to_dict()
-            post['id'] = docs[0].id
-            
-            # Add slug if missing
-            if 'slug' not in post:
-                post['slug'] = docs[0].id
-            
-            # Transform data to match template expectations
-            if 'featuredImage' in post and 'url' in post['featuredImage']:
-                post['image'] = post['featuredImage']['url']
-            elif 'image' not in post:
-                post['image'] = 'https://images.unsplash.com/photo-1576091160399-112ba8d25d1d?w=1200&h=600&fit=crop'
-            
-            if 'createdAt' in post and post['createdAt']:
-                post['date'] = post['createdAt'].strftime('%b %d, %Y')
-            elif 'date' not in post:
-                post['date'] = 'Recent'
-            
-            if 'reading_time' not in post:
-                post['reading_time'] = '5 min read'
-            
-            if 'category' not in post:
-                post['category'] = 'Medical'
-            
-            # Ensure author data exists with updatedByPhotoURL
-            if 'author' not in post:
-                post['author'] = {
-                    'name': post.get('updatedByName') or post.get('createdByName', 'MedTalks Team'),
-                    'avatar': post.get('updatedByPhotoURL', 'https://images.unsplash.com/photo-1559839734-2b71ea197ec2?w=100&h=100&fit=crop'),
-                    'bio': 'Part of the MedTalks academic team'
-                }
-            else:
-                # If author exists but doesn't have avatar, use updatedByPhotoURL
-                if 'avatar' not in post['author'] and 'updatedByPhotoURL' in post:
-                    post['author']['avatar'] = post['updatedByPhotoURL']
-            
-            # Process expertSection if it exists
-            if 'expertSection' in post and post['expertSection']:
-                # expertSection is already in the correct format from Firebase
-                pass
+        if post:
+            # Image, date, reading time, author and sanitized HTML are
+            # precomputed once per document version
+            post = blog_render.get_post_artifact(post)
             
+            add_surrogate_keys(f"blog:{post['id']}")
             return render_template('blog-post.html', post=post, slug=slug)
         else:
             flash('Blog post not found', 'error')
@@ -431,6 +381,7 @@ def blog_post(slug):
         return redirect(url_for('blog'))
     
 @app.route('/api/course/enroll', methods=['POST'])
+@idempotent
 def course_enroll():
     try:
         data = request.get_json()
@@ -440,269 +391,28 @@ def course_enroll():
             'email': data.get('email'),
             'phone': data.get('phone'),
             'course': data.get('course'),
+            'course_id': data.get('course_id'),
             'program': data.get('program'),
-            'enrolled_at': firestore.SERVER_TIMESTAMP,
+            'enrolled_at': SERVER_TIMESTAMP,
             'status': 'pending'
         }
         
-        db.collection('course_enrollments').add(enrollment_data)
+        if enrollment_data['course_id']:
+            # Only real courses get counter shards and roll-ups
+            if not get_course_by_id(enrollment_data['course_id']):
+                return jsonify({'success': False, 'message': 'Unknown course.'}), 400
+            # Counted in a sharded counter, rolled up into enrolled_count
+            record_enrollment(storage, enrollment_data, enrollment_data['course_id'], doc_id=idempotent_document_id())
+        else:
+            save_submission('course_enrollments', enrollment_data)
         
         return jsonify({'success': True, 'message': 'Enrollment successful!'}), 200
     except Exception as e:
         print(f"Error enrolling in course: {e}")
         return jsonify({'success': False, 'message': 'An error occurred. Please try again.'}), 500
 
-# --- Partnership Application Schema ---
-PARTNERSHIP_SCHEMA = {
-    'allowed_job_titles': [
-        'Director / Founder', 'Academic Coordinator', 'Faculty / Trainer',
-        'Business Development', 'Consultant', 'Other'
-    ],
-    'allowed_countries': [
-        'India', 'United States', 'United Kingdom', 'Canada', 'Australia',
-        'New Zealand', 'Ireland', 'South Africa', 'Singapore', 'Philippines',
-        'Turkey', 'United Arab Emirates', 'Saudi Arabia', 'Germany', 'France',
-        'Japan', 'South Korea', 'Nepal', 'Sri Lanka', 'Bangladesh',
-        'Pakistan', 'Nigeria', 'Other'
-    ],
-    'allowed_org_types': [
-        'Medical College', 'Nursing College', 'Hospital', 'EdTech Company',
-        'Study Abroad Consultancy', 'Individual Trainer', 'Other'
-    ],
-    'allowed_student_volumes': ['0-100', '100-500', '500-1000', '1000+', 'Not Applicable'],
-    'allowed_partnership_types': [
-        'Authorized Training Partner', 'Campus Program Partner',
-        'Reseller / Referral Partner', 'Corporate Hospital Training Partner',
-        'Faculty Representative'
-    ],
-    'allowed_timelines': ['Immediately', '1-3 months', '3-6 months', 'Not sure yet'],
-    'allowed_target_segments': [
-        'MBBS Students', 'Nursing Students', 'Doctors / Clinicians',
-        'IELTS/OET Aspirants', 'International Placement'
-    ],
-}
-
-def validate_partnership_application(data):
-    """Validate all fields of the partnership application against the schema.
-    Returns (is_valid, errors_dict, sanitized_data)."""
-    errors = {}
-    clean = {}
-
-    # --- Step 1: Personal Information ---
-    # First Name
-    first_name = (data.get('firstName') or '').strip()
-    if not first_name:
-        errors['firstName'] = 'First name is required.'
-    elif len(first_name) < 2 or len(first_name) > 50:
-        errors['firstName'] = 'First name must be 2-50 characters.'
-    elif not re.match(r"^[A-Za-z\s\-'.]+$", first_name):
-        errors['firstName'] = 'First name contains invalid characters.'
-    else:
-        clean['first_name'] = first_name
-
-    # Last Name (optional)
-    last_name = (data.get('lastName') or '').strip()
-    if last_name:
-        if len(last_name) > 50:
-            errors['lastName'] = 'Last name must be at most 50 characters.'
-        elif not re.match(r"^[A-Za-z\s\-'.]+$", last_name):
-            errors['lastName'] = 'Last name contains invalid characters.'
-        else:
-            clean['last_name'] = last_name
-    else:
-        clean['last_name'] = ''
-
-    # Email
-    email = (data.get('email') or '').strip().lower()
-    email_regex = r'^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$'
-    if not email:
-        errors['email'] = 'Email address is required.'
-    elif not re.match(email_regex, email):
-        errors['email'] = 'Please enter a valid email address.'
-    else:
-        clean['email'] = email
-
-    # Country Code (accept any non-empty value since we have 50+ codes)
-    country_code = (data.get('countryCode') or '').strip()
-    if not country_code:
-        errors['countryCode'] = 'Country code is required.'
-    elif not re.match(r'^\+\d{1,4}(-[A-Z]{2})?$', country_code):
-        errors['countryCode'] = 'Invalid country code format.'
-    else:
-        clean['country_code'] = country_code
-
-    # Phone
-    phone = (data.get('phone') or '').strip()
-    phone_digits = re.sub(r'[\s\-()]+', '', phone)
-    if not phone:
-        errors['phone'] = 'Phone number is required.'
-    elif not re.match(r'^\d{7,15}$', phone_digits):
-        errors['phone'] = 'Phone must be 7-15 digits.'
-    else:
-        clean['phone'] = phone_digits
-
-    # isWhatsapp (optional boolean)
-    clean['is_whatsapp'] = bool(data.get('isWhatsapp', False))
-
-    # Job Title
-    job_title = (data.get('jobTitle') or '').strip()
-    if not job_title:
-        errors['jobTitle'] = 'Role in organization is required.'
-    elif job_title not in PARTNERSHIP_SCHEMA['allowed_job_titles']:
-        errors['jobTitle'] = 'Invalid role selected.'
-    else:
-        clean['job_title'] = job_title
-
-    # LinkedIn
-    linkedin = (data.get('linkedin') or '').strip()
-    if not linkedin:
-        errors['linkedin'] = 'LinkedIn profile URL is required.'
-    elif not re.match(r'^https?://(www\.)?linkedin\.com/in/.+', linkedin):
-        errors['linkedin'] = 'Please enter a valid LinkedIn profile URL (e.g. https://linkedin.com/in/your-profile).'
-    else:
-        clean['linkedin'] = linkedin
-
-    # --- Step 2: Institution Details ---
-    # Company
-    company = (data.get('company') or '').strip()
-    if not company:
-        errors['company'] = 'Institution/company name is required.'
-    elif len(company) < 2 or len(company) > 100:
-        errors['company'] = 'Institution name must be 2-100 characters.'
-    else:
-        clean['company'] = company
-
-    # Website (optional)
-    website = (data.get('website') or '').strip()
-    if website:
-        if not re.match(r'^https?://.+\..+', website):
-            errors['website'] = 'Please enter a valid URL starting with http:// or https://.'
-        else:
-            clean['website'] = website
-    else:
-        clean['website'] = ''
-
-    # Country
-    country = (data.get('country') or '').strip()
-    if not country:
-        errors['country'] = 'Country is required.'
-    elif country not in PARTNERSHIP_SCHEMA['allowed_countries']:
-        errors['country'] = 'Invalid country selected.'
-    else:
-        clean['country'] = country
-
-    # Organization Type
-    org_type = (data.get('orgType') or '').strip()
-    if not org_type:
-        errors['orgType'] = 'Organization type is required.'
-    elif org_type not in PARTNERSHIP_SCHEMA['allowed_org_types']:
-        errors['orgType'] = 'Invalid organization type selected.'
-    else:
-        clean['org_type'] = org_type
-
-    # Student Volume
-    student_volume = (data.get('studentVolume') or '').strip()
-    if not student_volume:
-        errors['studentVolume'] = 'Student volume is required.'
-    elif student_volume not in PARTNERSHIP_SCHEMA['allowed_student_volumes']:
-        errors['studentVolume'] = 'Invalid student volume selected.'
-    else:
-        clean['student_volume'] = student_volume
-
-    # Current English Training
-    current_training = (data.get('currentEnglishTraining') or '').strip()
-    if not current_training:
-        errors['currentEnglishTraining'] = 'Please indicate if you currently offer English training.'
-    elif current_training not in ['Yes', 'No']:
-        errors['currentEnglishTraining'] = 'Invalid selection.'
-    else:
-        clean['current_english_training'] = current_training
-
-    # --- Step 3: Partnership Details ---
-    # Partnership Type
-    partnership_type = (data.get('partnershipType') or '').strip()
-    if not partnership_type:
-        errors['partnershipType'] = 'Partnership type is required.'
-    elif partnership_type not in PARTNERSHIP_SCHEMA['allowed_partnership_types']:
-        errors['partnershipType'] = 'Invalid partnership type selected.'
-    else:
-        clean['partnership_type'] = partnership_type
-
-    # Expected Timeline
-    timeline = (data.get('expectedTimeline') or '').strip()
-    if not timeline:
-        errors['expectedTimeline'] = 'Expected timeline is required.'
-    elif timeline not in PARTNERSHIP_SCHEMA['allowed_timelines']:
-        errors['expectedTimeline'] = 'Invalid timeline selected.'
-    else:
-        clean['expected_timeline'] = timeline
-
-    # Target Segments (array, at least 1)
-    target_segments = data.get('targetSegments', [])
-    if not isinstance(target_segments, list):
-        target_segments = [target_segments] if target_segments else []
-    target_segments = [s.strip() for s in target_segments if isinstance(s, str) and s.strip()]
-    if not target_segments:
-        errors['targetSegments'] = 'Please select at least one target segment.'
-    else:
-        invalid_segments = [s for s in target_segments if s not in PARTNERSHIP_SCHEMA['allowed_target_segments']]
-        if invalid_segments:
-            errors['targetSegments'] = 'One or more selected segments are invalid.'
-        else:
-            clean['target_segments'] = target_segments
-
-    # --- Step 4: Business Experience ---
-    # Monthly Volume
-    monthly_volume = (data.get('monthlyVolume') or '').strip()
-    if not monthly_volume:
-        errors['monthlyVolume'] = 'Expected monthly volume is required.'
-    elif len(monthly_volume) < 2 or len(monthly_volume) > 100:
-        errors['monthlyVolume'] = 'Monthly volume must be 2-100 characters.'
-    else:
-        clean['monthly_volume'] = monthly_volume
-
-    # Why Partner
-    why_partner = (data.get('whyPartner') or '').strip()
-    if not why_partner:
-        errors['whyPartner'] = 'Please explain why you want to partner with us.'
-    elif len(why_partner) < 20:
-        errors['whyPartner'] = 'Please provide at least 20 characters.'
-    elif len(why_partner) > 2000:
-        errors['whyPartner'] = 'Please keep your response under 2000 characters.'
-    else:
-        clean['why_partner'] = why_partner
-
-    # --- Step 5: Agreement ---
-    # Additional Info (optional)
-    additional_info = (data.get('additionalInfo') or '').strip()
-    if additional_info and len(additional_info) > 2000:
-        errors['additionalInfo'] = 'Additional info must be under 2000 characters.'
-    else:
-        clean['additional_info'] = additional_info
-
-    # Agree to Terms
-    if not data.get('agreeToTerms'):
-        errors['agreeToTerms'] = 'You must agree to the terms and conditions.'
-    else:
-        clean['agree_to_terms'] = True
-
-    # Authority
-    if not data.get('authority'):
-        errors['authority'] = 'You must confirm you have authority for partnership discussions.'
-    else:
-        clean['authority_confirmed'] = True
-
-    # Demo Call
-    demo_call = (data.get('demoCall') or '').strip()
-    if demo_call not in ['Yes', 'No']:
-        errors['demoCall'] = 'Please indicate your demo call preference.'
-    else:
-        clean['demo_call'] = demo_call
-
-    return (len(errors) == 0, errors, clean)
-
-
 @app.route('/api/partnership-application', methods=['POST'])
+@idempotent
 @require_turnstile
 def submit_partnership_application():
     try:
@@ -719,60 +429,17 @@ def submit_partnership_application():
                 'errors': errors
             }), 400
 
-        # Build the document for Firestore
-        remote_ip = request.headers.get('X-Forwarded-For', request.remote_addr)
-        if remote_ip and ',' in remote_ip:
-            remote_ip = remote_ip.split(',')[0].strip()
-
-        # Generate a unique reference number: MT-YYYYMMDD-XXXXX
-        date_part = datetime.utcnow().strftime('%Y%m%d')
-        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
-        reference_number = f"MT-{date_part}-{random_part}"
-
-        application_doc = {
-            # Reference
-            'reference_number': reference_number,
-            # Personal Info
-            'first_name': clean_data['first_name'],
-            'last_name': clean_data['last_name'],
-            'full_name': f"{clean_data['first_name']} {clean_data['last_name']}".strip(),
-            'email': clean_data['email'],
-            'country_code': clean_data['country_code'],
-            'phone': clean_data['phone'],
-            'full_phone': f"{clean_data['country_code']}{clean_data['phone']}",
-            'is_whatsapp': clean_data['is_whatsapp'],
-            'job_title': clean_data['job_title'],
-            'linkedin': clean_data['linkedin'],
-            # Institution Details
-            'company': clean_data['company'],
-            'website': clean_data['website'],
-            'country': clean_data['country'],
-            'org_type': clean_data['org_type'],
-            'student_volume': clean_data['student_volume'],
-            'current_english_training': clean_data['current_english_training'],
-            # Partnership Details
-            'partnership_type': clean_data['partnership_type'],
-            'expected_timeline': clean_data['expected_timeline'],
-            'target_segments': clean_data['target_segments'],
-            # Business Experience
-            'monthly_volume': clean_data['monthly_volume'],
-            'why_partner': clean_data['why_partner'],
-            # Agreement
-            'additional_info': clean_data['additional_info'],
-            'agree_to_terms': clean_data['agree_to_terms'],
-            'authority_confirmed': clean_data['authority_confirmed'],
-            'demo_call': clean_data['demo_call'],
-            # Metadata
-            'submitted_at': firestore.SERVER_TIMESTAMP,
-            'status': 'new',
-            'ip_address': remote_ip,
-        }
+        # Build the document for storage
+        remote_ip = get_remote_ip(request.headers, request.remote_addr)
+        reference_number = generate_reference_number()
+        application_doc = build_partnership_document(clean_data, reference_number, remote_ip, SERVER_TIMESTAMP)
 
-        db.collection('partnership_applications').add(application_doc)
+        # A retry that raced the original gets the original's reference
+        stored = save_submission('partnership_applications', application_doc)
 
         return jsonify({
             'success': True,
-            'reference_number': reference_number,
+            'reference_number': stored['reference_number'],
             'message': 'Your partnership application has been submitted successfully!'
         }), 200
 
@@ -784,33 +451,184 @@ def submit_partnership_application():
             'errors': {}
         }), 500
 
+# Full-text search over blogs and courses (typeahead friendly)
+@app.route('/api/search')
+@cache_policy(max_age=60, s_maxage=300, stale_while_revalidate=600, keys=['search'])
+def api_search():
+    query = (request.args.get('q') or '').strip()[:200]
+    if not query:
+        return jsonify({'success': True, 'query': '', 'results': []}), 200
+
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), 50))
+    except ValueError:
+        limit = 10
+    kind = request.args.get('type')
+    if kind not in ('blog', 'course'):
+        kind = None
+
+    try:
+        catalog.ensure_fresh()
+        ensure_indexed(catalog)
+        results = search_index.search(query, limit=limit, kind=kind)
+        return jsonify({'success': True, 'query': query, 'results': results}), 200
+    except Exception as e:
+        print(f"Error in API search: {e}")
+        return jsonify({'success': False, 'message': 'Search is temporarily unavailable.'}), 500
+
+def _public_course(course):
+    """Copy of a course for the JSON API: only preview lessons carry a video link."""
+    course = dict(course)
+    if isinstance(course.get('sections'), list):
+        sections = []
+        for section in course['sections']:
+            section = dict(section)
+            lessons = []
+            for lesson in section.get('lessons', []):
+                lesson = dict(lesson)
+                lesson.pop('playback_url', None)
+                # Anyone can call this cacheable endpoint, so paid lessons get no link at all
+                if not lesson.get('is_preview'):
+                    lesson['video_url'] = ''
+                lessons.append(lesson)
+            section['lessons'] = lessons
+            sections.append(section)
+        course['sections'] = sections
+    return course
+
+# Several courses by ID for landing pages and partner widgets, in request order
+@app.route('/api/courses')
+@cache_policy(**LISTING_PAGE, keys=['courses'])
+def api_courses():
+    course_ids = [i for i in (request.args.get('ids') or '').split(',') if i.strip()]
+    course_ids = list(dict.fromkeys(i.strip() for i in course_ids))
+    if not course_ids:
+        return jsonify({'success': False, 'message': 'ids is required'}), 400
+    if len(course_ids) > COURSE_IDS_MAX:
+        return jsonify({'success': False, 'message': f'At most {COURSE_IDS_MAX} ids per request'}), 400
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        if not all(FIELD_PATH_RE.match(f) for f in fields):
+            return jsonify({'success': False, 'message': 'Invalid fields'}), 400
+
+    courses_found = get_courses_by_ids(course_ids, fields=fields)
+    if fields is None:
+        for course in courses_found:
+            add_display_fields(course)
+    found_ids = {course['id'] for course in courses_found}
+    add_surrogate_keys(*[f'course:{course_id}' for course_id in found_ids])
+    return jsonify({
+        'success': True,
+        'courses': [_public_course(course) for course in courses_found],
+        'missing': [course_id for course_id in course_ids if course_id not in found_ids],
+    }), 200
+
+def _site_url():
+    # Never the Host header outside local debugging: feeds and sitemaps are cached by the CDN
+    return SITE_URL or request.url_root.rstrip('/')
+
+def _conditional_xml(etag, body, mimetype):
+    """Answer If-None-Match with 304, otherwise send (or stream) the body."""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif isinstance(body, str):
+        response = Response(body, mimetype=mimetype)
+    else:
+        response = Response(stream_with_context(body), mimetype=mimetype)
+    response.set_etag(etag)
+    return response
+
+@app.route('/sitemap.xml')
+@cache_policy(max_age=3600, s_maxage=3600, stale_while_revalidate=86400, keys=['sitemap'])
+def sitemap():
+    try:
+        catalog.ensure_fresh()
+    except Exception as e:
+        print(f"Error refreshing catalog for sitemap: {e}")
+        abort(503)
+
+    base_url = _site_url()
+    pages = sitemap_page_count(catalog)
+    etag = feed_etag('sitemap', catalog, base_url)
+    if pages > 1:
+        return _conditional_xml(etag, iter_sitemap_index(catalog, base_url, pages), 'application/xml')
+    return _conditional_xml(etag, iter_urlset(catalog, base_url), 'application/xml')
+
+@app.route('/sitemap-<int:page>.xml')
+@cache_policy(max_age=3600, s_maxage=3600, stale_while_revalidate=86400, keys=['sitemap'])
+def sitemap_page(page):
+    try:
+        catalog.ensure_fresh()
+    except Exception as e:
+        print(f"Error refreshing catalog for sitemap: {e}")
+        abort(503)
+
+    if page < 1 or page > sitemap_page_count(catalog):
+        abort(404)
+    base_url = _site_url()
+    etag = feed_etag('sitemap', catalog, base_url, page=page)
+    return _conditional_xml(etag, iter_urlset(catalog, base_url, page=page), 'application/xml')
+
+@app.route('/feed.xml')
+@app.route('/atom.xml')
+@cache_policy(max_age=900, s_maxage=3600, stale_while_revalidate=86400, keys=['feed', 'blogs'])
+def blog_feed():
+    kind = 'atom' if request.path == '/atom.xml' else 'rss'
+    try:
+        catalog.ensure_fresh()
+    except Exception as e:
+        print(f"Error refreshing catalog for {kind} feed: {e}")
+        abort(503)
+
+    base_url = _site_url()
+    mimetype = 'application/atom+xml' if kind == 'atom' else 'application/rss+xml'
+    return _conditional_xml(feed_etag(kind, catalog, base_url), get_feed(kind, catalog, base_url), mimetype)
+
 # API endpoint to get all blogs (for external use or AJAX)
 @app.route('/api/blogs')
+@cache_policy(**LISTING_PAGE, keys=['blogs'])
 def api_blogs():
     try:
-        blog_posts_ref = db.collection('blogs').where('status', '==', 'published').order_by('createdAt', direction=firestore.Query.DESCENDING)
         posts = []
         
-        for doc in blog_posts_ref.stream():
-            post_data = doc.to_dict()
-            post_data['id'] = doc.id
-            
+        for post_data in fetch_with_fallback('blogs:published', lambda: storage.list_blogs()):
             # Use updatedByPhotoURL for author avatar
-            if 'updatedByPhotoURL' in post_data and post_data['updatedByPhotoURL']:
-                if 'author' not in post_data:
-                    post_data['author'] = {}
-                post_data['author']['avatar'] = post_data['updatedByPhotoURL']
-            
-            # Convert timestamps to strings
-            if 'createdAt' in post_data and post_data['createdAt']:
-                post_data['createdAt'] = post_data['createdAt'].isoformat() if hasattr(post_data['createdAt'], 'isoformat') else str(post_data['createdAt'])
+            blog_render.apply_author_avatar(post_data)
             
+            # Timestamps are encoded as ISO 8601 by FirestoreJSONProvider
             posts.append(post_data)
         
+        if len(posts) >= JSON_STREAM_MIN_ITEMS:
+            return app.json.stream_response({'success': True, 'posts': posts})
         return jsonify({'success': True, 'posts': posts}), 200
     except Exception as e:
         print(f"Error in API blogs: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# Staff export of form submissions, streamed page by page
+@app.route('/api/export/<collection>.<fmt>')
+@require_export_token
+def export_submissions(collection, fmt):
+    if collection not in EXPORT_COLUMNS or fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'Unknown export'}), 404
+    try:
+        start = parse_date(request.args.get('from'))
+        end = parse_date(request.args.get('to'), end=True)
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    rows = export_rows(storage, collection, start=start, end=end, after=after)
+    body = iter_csv(rows, collection) if fmt == 'csv' else iter_ndjson(rows, collection)
+    response = Response(stream_with_context(body), content_type=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={collection}.{fmt}'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+# Scan the templates' asset graphs once, before workers fork
+asset_hints.build(app)
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5050)
\ No newline at end of file
@@ -0,0 +1,493 @@
+"""
+Native asyncio (ASGI) variant of the site.
+
+Same templates, form validation, storage layer and course helpers as
+app.py: handlers run the blocking storage calls in the event loop's thread
+pool (ASGI_STORAGE_THREADS wide) and await an httpx client for Turnstile, so
+one worker can hold many slow backend/Turnstile calls in flight without
+one thread per request. IDs and slugs are validated, enrollments are counted
+in the sharded counters, and Idempotency-Key records are shared with app.py.
+
+Compared with app.py it does not (yet) have:
+    - /api/search, /api/courses, /sitemap.xml (and its pages), /feed.xml,
+      /atom.xml and /api/export/<collection>.<fmt>
+    - Cache-Control policies and surrogate keys (http_cache), early hints
+      and critical CSS
+    - the per-worker cache of idempotent responses (every retry reads the
+      shared record)
+
+Run with:
+    hypercorn asgi_app:app --workers 4 --bind 0.0.0.0:8000
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import httpx
+from quart import Quart, g, make_response, render_template, request, jsonify, redirect, url_for, flash, session
+
+import blog_render
+from catalog import catalog
+from content_store import fetch_with_fallback, store as last_known_good
+from courses import get_courses_by_category, get_course_by_id, add_display_fields, get_category_info, set_storage
+from enrollment_counters import record_enrollment, enrollment_rollup
+from form_security import AsyncTurnstileVerifier
+from fragment_cache import FragmentCacheExtension
+from idempotency import (IDEMPOTENCY_FIELD, IDEMPOTENCY_HEADER, KEY_RE, body_fingerprint, claim_key, key_conflict,
+                         key_document_id, response_record, save_key)
+from program_pages import PROGRAMS, PROGRAM_TEMPLATE
+from storage import create_storage, is_valid_document_id, SERVER_TIMESTAMP
+from validation import validate_partnership_application, build_partnership_document, generate_reference_number, get_remote_ip
+from video_config import get_video_urls
+from url_signing import sign_course_videos
+
+app = Quart(__name__)
+app.jinja_env.add_extension(FragmentCacheExtension)
+app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your_secret_key_here')
+
+# Storage calls that may run at once per worker
+ASGI_STORAGE_THREADS = int(os.getenv('ASGI_STORAGE_THREADS', '64'))
+
+storage = None
+http_client = None
+turnstile = None
+
+
+@app.before_serving
+async def startup():
+    global storage, http_client, turnstile
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=ASGI_STORAGE_THREADS))
+    storage = await asyncio.to_thread(create_storage)
+    set_storage(storage)
+    catalog.set_storage(storage)
+    enrollment_rollup.start(lambda: storage, lambda: list(catalog.courses))
+    last_known_good.start_snapshots()
+    http_client = httpx.AsyncClient()
+    turnstile = AsyncTurnstileVerifier(http_client)
+
+
+@app.after_serving
+async def shutdown():
+    if http_client is not None:
+        await http_client.aclose()
+    if storage is not None:
+        try:
+            await asyncio.to_thread(storage.close)
+        except Exception as e:
+            print(f"Error closing storage: {e}")
+
+
+def require_turnstile(f):
+    """Async twin of form_security.require_turnstile."""
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if request.method != 'POST':
+            return await f(*args, **kwargs)
+
+        if request.is_json:
+            token = ((await request.get_json(silent=True)) or {}).get('cf-turnstile-response')
+        else:
+            token = (await request.form).get('cf-turnstile-response')
+
+        remote_ip = get_remote_ip(request.headers, request.remote_addr)
+        verification = await turnstile.verify_token(token, remote_ip)
+
+        if not verification['success']:
+            error_message = 'Security verification failed. Please try again.'
+
+            if verification.get('error_codes'):
+                print(f"Turnstile verification failed: {verification['error_codes']}")
+            elif verification.get('error'):
+                print(f"Turnstile error: {verification['error']}")
+
+            if request.is_json:
+                return jsonify({
+                    'success': False,
+                    'message': error_message
+                }), 403
+            await flash(error_message, 'error')
+            return redirect(url_for(request.endpoint))
+
+        return await f(*args, **kwargs)
+
+    return decorated_function
+
+
+def idempotent(f):
+    """
+    Async twin of idempotency.idempotent, sharing its key records with app.py.
+
+    Every retry reads the shared record; there is no per-worker cache.
+    """
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if request.method != 'POST' or storage is None:
+            return await f(*args, **kwargs)
+        if request.is_json:
+            body = await request.get_json(silent=True)
+            field_key = body.get(IDEMPOTENCY_FIELD) if isinstance(body, dict) else None
+        else:
+            form = await request.form
+            body = {name: form.getlist(name) for name in form}
+            field_key = form.get(IDEMPOTENCY_FIELD)
+        client_key = request.headers.get(IDEMPOTENCY_HEADER) or field_key
+        if not client_key:
+            return await f(*args, **kwargs)
+        if not KEY_RE.match(client_key):
+            return jsonify({'success': False, 'message': 'Invalid idempotency key'}), 400
+
+        key = f'{request.endpoint}:{client_key}'
+        fingerprint = body_fingerprint(body)
+        try:
+            stored = await asyncio.to_thread(claim_key, storage, key, fingerprint)
+        except Exception as e:
+            print(f"Error claiming idempotency key: {e}")
+            stored = None
+        if stored is not None:
+            conflict = key_conflict(stored, fingerprint)
+            if conflict:
+                status, message = conflict
+                return jsonify({'success': False, 'message': message}), status
+            for category, message in stored['flashes']:
+                await flash(message, category)
+            replayed = stored['response']
+            response = await make_response(replayed['body'], replayed['status'])
+            for name, value in replayed['headers']:
+                response.headers[name] = value
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        g.idempotency_key = key
+        record = None
+        try:
+            flashed_before = len(session.get('_flashes', []))
+            response = await make_response(await f(*args, **kwargs))
+            flashes = session.get('_flashes', [])[flashed_before:]
+            failed = response.status_code >= 400 or any(category == 'error' for category, _ in flashes)
+            if not failed:
+                record = response_record(fingerprint, response.status_code, await response.get_data(as_text=True),
+                                         response.headers.items(), flashes)
+            return response
+        finally:
+            try:
+                await asyncio.to_thread(save_key, storage, key, fingerprint, record)
+            except Exception as e:
+                print(f"Error saving idempotency key: {e}")
+
+    return decorated_function
+
+
+def idempotent_document_id():
+    """Document ID for the current request's idempotency key, or None."""
+    key = g.get('idempotency_key')
+    return key_document_id(key) if key else None
+
+
+# --- Data access -------------------------------------------------------------
+
+async def get_recent_posts(limit=3):
+    return await asyncio.to_thread(fetch_with_fallback, f'blogs:recent:{limit}', lambda: storage.list_blogs(limit=limit))
+
+
+async def save_submission(collection, data):
+    """Async twin of app.save_submission: one document per idempotency key."""
+    doc_id = idempotent_document_id()
+    if doc_id:
+        return await asyncio.to_thread(storage.create_submission, collection, doc_id, data)
+    await asyncio.to_thread(storage.add_submission, collection, data)
+    return data
+
+
+# --- Pages -------------------------------------------------------------------
+
+@app.route('/')
+async def index():
+    try:
+        posts = await get_recent_posts(3)
+        return await render_template('index.html', recent_posts=posts, **get_video_urls())
+    except Exception as e:
+        print(f"Error fetching data for homepage: {e}")
+        return await render_template('index.html', recent_posts=[], **get_video_urls())
+
+
+@app.route('/about')
+async def about():
+    return await render_template('about.html')
+
+
+@app.route('/courses')
+async def courses():
+    try:
+        courses_list = await asyncio.to_thread(
+            fetch_with_fallback, 'courses:active', lambda: storage.list_courses(status='active'))
+        return await render_template('courses.html', courses=courses_list)
+    except Exception as e:
+        print(f"Error fetching courses: {e}")
+        return await render_template('courses.html', courses=[])
+
+
+@app.route('/contact', methods=['GET', 'POST'])
+@idempotent
+@require_turnstile
+async def contact():
+    if request.method == 'POST':
+        try:
+            form = await request.form
+            contact_data = {
+                'name': form.get('name'),
+                'email': form.get('email'),
+                'phone': form.get('phone'),
+                'subject': form.get('subject'),
+                'message': form.get('message'),
+                'timestamp': SERVER_TIMESTAMP,
+                'status': 'new'
+            }
+
+            await save_submission('contact_submissions', contact_data)
+
+            await flash('Thank you for contacting us! We will get back to you soon.', 'success')
+            return redirect(url_for('contact'))
+        except Exception as e:
+            await flash('An error occurred. Please try again later.', 'error')
+            print(f"Error saving contact form: {e}")
+
+    turnstile_site_key = os.getenv('TURNSTILE_SITE_KEY', '')
+    return await render_template('contact.html', turnstile_site_key=turnstile_site_key)
+
+
+@app.route('/team')
+async def team():
+    try:
+        team_members = await asyncio.to_thread(
+            fetch_with_fallback, 'team_members:active', lambda: storage.list_team_members(status='active'))
+        return await render_template('team.html', team_members=team_members)
+    except Exception as e:
+        print(f"Error fetching team members: {e}")
+        return await render_template('team.html', team_members=[])
+
+
+async def render_program(category):
+    program = PROGRAMS[category]
+    try:
+        courses = await asyncio.to_thread(get_courses_by_category, category)
+        for course in courses:
+            add_display_fields(course)
+
+        blog_posts = []
+        try:
+            blog_posts = await get_recent_posts(3)
+        except Exception as blog_err:
+            print(f"Error fetching blog posts for {category}: {blog_err}")
+
+        return await render_template(PROGRAM_TEMPLATE, program=program, courses=courses, blog_posts=blog_posts, **get_video_urls())
+    except Exception as e:
+        print(f"Error fetching {category} courses: {e}")
+        return await render_template(PROGRAM_TEMPLATE, program=program, courses=[], blog_posts=[], **get_video_urls())
+
+
+for category, program in PROGRAMS.items():
+    app.add_url_rule(program['url'], endpoint=category, defaults={'category': category}, view_func=render_program)
+
+
+@app.route('/course/<course_id>')
+async def course_detail(course_id):
+    try:
+        # Validates the ID and reads through the breaker, as in app.py
+        course = await asyncio.to_thread(get_course_by_id, course_id)
+
+        if not course:
+            await flash('Course not found.', 'error')
+            return redirect(url_for('courses'))
+
+        add_display_fields(course)
+        sign_course_videos(course)
+        course['category_info'] = get_category_info(course.get('category', ''))
+
+        return await render_template('course-detail.html', course=course)
+    except Exception as e:
+        print(f"Error fetching course detail: {e}")
+        await flash('An error occurred while loading the course.', 'error')
+        return redirect(url_for('courses'))
+
+
+@app.route('/products/dr-meddy')
+async def dr_meddy():
+    return await render_template('products/dr-meddy.html', **get_video_urls())
+
+
+@app.route('/products/mr-brown')
+async def mr_brown():
+    return await render_template('products/mr-brown.html', **get_video_urls())
+
+
+@app.route('/products/oet-agents')
+async def oet_agents():
+    return await render_template('products/oet-agents.html', **get_video_urls())
+
+
+@app.route('/products/coursebooks')
+async def coursebooks():
+    return await render_template('products/coursebooks.html', **get_video_urls())
+
+
+@app.route('/partnerships')
+async def partnerships():
+    return await render_template('partnerships.html')
+
+
+@app.route('/partnership-application')
+async def partnership_application():
+    turnstile_site_key = os.getenv('TURNSTILE_SITE_KEY', '')
+    return await render_template('partnership-application.html', turnstile_site_key=turnstile_site_key)
+
+
+@app.route('/blog')
+async def blog():
+    try:
+        posts = [blog_render.apply_author_avatar(post) for post in await get_recent_posts(20)]
+        return await render_template('blog.html', posts=posts)
+    except Exception as e:
+        print(f"Error fetching blog posts: {e}")
+        return await render_template('blog.html', posts=[])
+
+
+@app.route('/blog/<slug>')
+async def blog_post(slug):
+    try:
+        post = None
+        if is_valid_document_id(slug):
+            post = await asyncio.to_thread(fetch_with_fallback, f'blog:{slug}', lambda: storage.get_blog(slug))
+        if post:
+            post = blog_render.get_post_artifact(post)
+            return await render_template('blog-post.html', post=post, slug=slug)
+        await flash('Blog post not found', 'error')
+        return redirect(url_for('blog'))
+    except Exception as e:
+        print(f"Error fetching blog post: {e}")
+        await flash('An error occurred while loading the blog post', 'error')
+        return redirect(url_for('blog'))
+
+
+# --- JSON API ----------------------------------------------------------------
+
+@app.route('/api/newsletter/subscribe', methods=['POST'])
+@idempotent
+async def newsletter_subscribe():
+    try:
+        data = await request.get_json()
+        email = data.get('email')
+
+        if not email:
+            return jsonify({'success': False, 'message': 'Email is required'}), 400
+
+        if await asyncio.to_thread(storage.find_submission, 'newsletter_subscribers', 'email', email):
+            return jsonify({'success': False, 'message': 'This email is already subscribed'}), 400
+
+        await save_submission('newsletter_subscribers', {
+            'email': email,
+            'subscribed_at': SERVER_TIMESTAMP,
+            'status': 'active',
+            'source': data.get('source', 'website')
+        })
+
+        return jsonify({'success': True, 'message': 'Successfully subscribed to newsletter!'}), 200
+    except Exception as e:
+        print(f"Error subscribing to newsletter: {e}")
+        return jsonify({'success': False, 'message': 'An error occurred. Please try again.'}), 500
+
+
+@app.route('/api/course/enroll', methods=['POST'])
+@idempotent
+async def course_enroll():
+    try:
+        data = await request.get_json()
+
+        enrollment_data = {
+            'name': data.get('name'),
+            'email': data.get('email'),
+            'phone': data.get('phone'),
+            'course': data.get('course'),
+            'course_id': data.get('course_id'),
+            'program': data.get('program'),
+            'enrolled_at': SERVER_TIMESTAMP,
+            'status': 'pending'
+        }
+
+        if enrollment_data['course_id']:
+            # Only real courses get counter shards and roll-ups
+            if not await asyncio.to_thread(get_course_by_id, enrollment_data['course_id']):
+                return jsonify({'success': False, 'message': 'Unknown course.'}), 400
+            await asyncio.to_thread(record_enrollment, storage, enrollment_data, enrollment_data['course_id'],
+                                    doc_id=idempotent_document_id())
+        else:
+            await save_submission('course_enrollments', enrollment_data)
+
+        return jsonify({'success': True, 'message': 'Enrollment successful!'}), 200
+    except Exception as e:
+        print(f"Error enrolling in course: {e}")
+        return jsonify({'success': False, 'message': 'An error occurred. Please try again.'}), 500
+
+
+@app.route('/api/partnership-application', methods=['POST'])
+@idempotent
+@require_turnstile
+async def submit_partnership_application():
+    try:
+        data = await request.get_json(silent=True)
+        if not data:
+            return jsonify({'success': False, 'message': 'Invalid request body.', 'errors': {}}), 400
+
+        is_valid, errors, clean_data = validate_partnership_application(data)
+
+        if not is_valid:
+            return jsonify({
+                'success': False,
+                'message': 'Please fix the highlighted errors and try again.',
+                'errors': errors
+            }), 400
+
+        remote_ip = get_remote_ip(request.headers, request.remote_addr)
+        reference_number = generate_reference_number()
+        application_doc = build_partnership_document(clean_data, reference_number, remote_ip, SERVER_TIMESTAMP)
+
+        # A retry that raced the original gets the original's reference
+        stored = await save_submission('partnership_applications', application_doc)
+
+        return jsonify({
+            'success': True,
+            'reference_number': stored['reference_number'],
+            'message': 'Your partnership application has been submitted successfully!'
+        }), 200
+
+    except Exception as e:
+        print(f"Error submitting partnership application: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'An unexpected error occurred. Please try again later.',
+            'errors': {}
+        }), 500
+
+
+@app.route('/api/blogs')
+async def api_blogs():
+    try:
+        posts = []
+        for post_data in await asyncio.to_thread(fetch_with_fallback, 'blogs:published', lambda: storage.list_blogs()):
+            blog_render.apply_author_avatar(post_data)
+            if post_data.get('createdAt'):
+                post_data['createdAt'] = post_data['createdAt'].isoformat() if hasattr(post_data['createdAt'], 'isoformat') else str(post_data['createdAt'])
+            posts.append(post_data)
+        return jsonify({'success': True, 'posts': posts}), 200
+    except Exception as e:
+        print(f"Error in API blogs: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+if __name__ == '__main__':
+    app.run(debug=True, host='0.0.0.0', port=5050)
@@ -0,0 +1,104 @@
+"""
+Sync (WSGI, gunicorn sync workers) vs native asyncio (ASGI) under a slow backend.
+
+Both apps serve /blog through FirestoreStorage on a Firestore stand-in that
+takes --delay-ms per query. The sync deployment is modelled as --workers
+threads each handling one request at a time (what gunicorn sync workers
+do); the ASGI deployment is a single event loop running storage calls in
+its thread pool (ASGI_STORAGE_THREADS). Reports requests per second,
+latency and the peak number of backend calls held open at once.
+
+Usage:
+    python benchmarks/async_vs_sync.py [--clients 64] [--workers 4] [--delay-ms 200] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slow_backend import SlowFirestore
+from synthetic import make_blog
+
+
+def report(name, latencies, seconds, peak):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    print(f"{name:6} {len(latencies) / seconds:8.1f} req/s  "
+          f"median {statistics.median(latencies) * 1000 if latencies else 0:7.1f} ms  "
+          f"p95 {p95 * 1000:7.1f} ms  peak backend calls held {peak}")
+
+
+def run_sync(args, docs):
+    import app as flask_app
+    from storage import FirestoreStorage
+
+    backend = SlowFirestore(docs, args.delay_ms / 1000)
+    flask_app.storage = FirestoreStorage(backend)
+    workers = threading.Semaphore(args.workers)
+    latencies = []
+    deadline = time.monotonic() + args.seconds
+
+    def client_loop():
+        client = flask_app.app.test_client()
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            # A request waits for a free worker, then occupies it end to end
+            with workers:
+                client.get('/blog')
+            latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(args.clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    report('sync', latencies, args.seconds, backend.tracker.peak)
+
+
+async def run_async(args, docs):
+    import asgi_app
+    from storage import FirestoreStorage
+
+    backend = SlowFirestore(docs, args.delay_ms / 1000)
+    latencies = []
+
+    async with asgi_app.app.test_app() as test_app:
+        asgi_app.storage = FirestoreStorage(backend)
+        deadline = time.monotonic() + args.seconds
+
+        async def client_loop():
+            client = test_app.test_client()
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                await client.get('/blog')
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client_loop() for _ in range(args.clients)))
+    report('async', latencies, args.seconds, backend.tracker.peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=4, help='sync worker count')
+    parser.add_argument('--delay-ms', type=int, default=200, help='backend latency per query')
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    # Keep benchmark runs from writing a content snapshot to disk
+    os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+    os.environ.setdefault('SITE_URL', 'http://localhost:5050')
+    docs = [make_blog(i) for i in range(20)]
+
+    run_sync(args, docs)
+    asyncio.run(run_async(args, docs))
+
+
+if __name__ == '__main__':
+    main()
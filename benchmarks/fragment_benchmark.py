@@ -0,0 +1,81 @@
+"""
+Program and blog pages rendered with and without {% cache %} fragments.
+
+Seeds the in-memory storage backend with synthetic courses and posts,
+renders each page `--repeat` times with the fragment cache off and on, and
+prints the request times plus the per-fragment hit rates and render time
+saved reported by fragment_cache.stats().
+
+Usage:
+    python benchmarks/fragment_benchmark.py [--courses 24] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('ENROLLMENT_ROLLUP_SECONDS', '0')
+os.environ.setdefault('SITE_URL', 'http://localhost:5050')
+os.environ.setdefault('EARLY_HINTS', '0')
+
+import app as medtalks
+from fragment_cache import fragment_cache
+from synthetic import CATEGORIES, make_blog, make_course
+
+
+ROUTES = ['/programs/doctalks', '/programs/denttalks', '/programs/nursetalks', '/programs/pharmatalks', '/blog', '/about']
+
+
+def seed(storage, courses, posts):
+    for i in range(courses):
+        course = make_course(i)
+        course['category'] = CATEGORIES[i % len(CATEGORIES)]
+        storage.put('courses', course.pop('id'), course)
+    for i in range(posts):
+        post = make_blog(i)
+        storage.put('blogs', post.pop('id'), post)
+
+
+def run(client, repeat):
+    timings = {}
+    for route in ROUTES:
+        client.get(route)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            response = client.get(route)
+            assert response.status_code == 200, (route, response.status_code)
+        timings[route] = (time.perf_counter() - started) / repeat * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--courses', type=int, default=24)
+    parser.add_argument('--posts', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    seed(medtalks.storage, args.courses, args.posts)
+    client = medtalks.app.test_client()
+
+    fragment_cache.enabled = False
+    uncached = run(client, args.repeat)
+    fragment_cache.enabled = True
+    fragment_cache.clear()
+    cached = run(client, args.repeat)
+
+    print(f"{'route':<24} {'uncached ms':>12} {'cached ms':>10}")
+    for route in ROUTES:
+        print(f"{route:<24} {uncached[route]:>12.2f} {cached[route]:>10.2f}")
+    print()
+    print(f"{'fragment':<36} {'hit rate':>9} {'avg ms':>8} {'saved ms':>9}")
+    for fragment, stats in fragment_cache.stats().items():
+        print(f"{fragment:<36} {stats['hit_rate']:>9.1%} {stats['avg_render_ms']:>8.3f} {stats['saved_ms']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+/api/blogs serialization: the previous stdlib path against FirestoreJSONProvider.
+
+The baseline is what the endpoint used to do: convert createdAt by hand, then
+jsonify through Flask's DefaultJSONProvider. Each post also carries a
+Firestore-style timestamp subclass in updatedAt, which the baseline sends
+through the default() hook as an HTTP date.
+
+Usage:
+    python benchmarks/json_benchmark.py [--posts 2000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import FirestoreJSONProvider, orjson
+from synthetic import make_blog
+
+
+class DatetimeWithNanoseconds(datetime):
+    """Stand-in for google.api_core.datetime_helpers.DatetimeWithNanoseconds."""
+
+
+def make_posts(n):
+    posts = []
+    for i in range(n):
+        post = make_blog(i)
+        post['updatedAt'] = DatetimeWithNanoseconds.fromtimestamp(1700000000 + i) + timedelta(microseconds=i)
+        post['author'] = {'name': 'MedTalks Team', 'avatar': post['updatedByPhotoURL']}
+        posts.append(post)
+    return posts
+
+
+def baseline(app, posts):
+    converted = []
+    for post in posts:
+        post = dict(post)
+        post['createdAt'] = post['createdAt'].isoformat()
+        converted.append(post)
+    return app.json.response({'success': True, 'posts': converted}).get_data()
+
+
+def provider(app, posts):
+    return app.json.response({'success': True, 'posts': posts}).get_data()
+
+
+def streamed(app, posts):
+    chunks = app.json.iter_encode({'success': True, 'posts': posts})
+    first = next(chunks)
+    return first + b''.join(chunks)
+
+
+def time_it(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+
+    base_app = Flask('baseline')
+    base_app.json = DefaultJSONProvider(base_app)
+    stdlib_app = Flask('stdlib')
+    stdlib_app.json = FirestoreJSONProvider(stdlib_app, fast_path=False)
+    fast_app = Flask('fast')
+    fast_app.json = FirestoreJSONProvider(fast_app, fast_path=True)
+
+    cases = [
+        ('baseline (DefaultJSONProvider)', lambda: baseline(base_app, posts)),
+        ('provider, stdlib json', lambda: provider(stdlib_app, posts)),
+        ('provider, stdlib, chunked', lambda: streamed(stdlib_app, posts)),
+    ]
+    if orjson is not None:
+        cases += [
+            ('provider, orjson', lambda: provider(fast_app, posts)),
+            ('provider, orjson, chunked', lambda: streamed(fast_app, posts)),
+        ]
+    else:
+        print("orjson not installed; skipping fast path")
+
+    print(f"{args.posts} posts, best of {args.repeat}")
+    baseline_time = None
+    for name, fn in cases:
+        seconds, size = time_it(fn, args.repeat)
+        baseline_time = baseline_time or seconds
+        print(f"{name:32} {seconds * 1000:8.2f} ms  {size / 1024:8.0f} KiB  x{baseline_time / seconds:.2f}")
+
+
+if __name__ == '__main__':
+    main()
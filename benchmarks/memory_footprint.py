@@ -0,0 +1,242 @@
+"""
+Per-route memory footprint regression check with tracemalloc.
+
+Seeds the in-memory storage backend with synthetic catalogs of increasing
+size (posts and courses, and up to 500 lessons on the course whose detail
+page is requested) and drives each route through the Flask test client.
+For every route and size it records:
+
+    peak      highest traced allocation during the first request after seeding
+    retained  bytes still allocated once that response is released (caches)
+    leaked    bytes retained per request by REPEAT further identical requests
+
+The run fails (exit status 1) when a route's peak or retained memory grows
+faster than the catalog between two sizes (log-log slope above
+1 + --tolerance, ignoring values under --floor), when repeated requests
+leave more than --leak-limit bytes each allocated, or when a value exceeds
+the recorded baseline by more than --tolerance plus --slack bytes. Templates are compiled and module caches
+warmed on a small catalog first, so only the per-request cost is counted.
+
+Numbers are for the memory backend, which deep-copies documents out of
+storage the way the Firestore client materializes them; storage-side
+filtering (limit, get_all) makes some routes flatter on Firestore.
+
+Usage:
+    python benchmarks/memory_footprint.py [--sizes 10,100,1000,10000]
+    python benchmarks/memory_footprint.py --update-baseline
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('ENROLLMENT_ROLLUP_SECONDS', '0')
+os.environ.setdefault('SITE_URL', 'http://localhost:5050')
+# No on-disk last-known-good snapshot: results from earlier runs would be loaded
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+import app as medtalks
+import content_store
+import courses as courses_module
+from catalog import catalog
+from fragment_cache import fragment_cache
+from storage import MemoryStorage
+from synthetic import CATEGORIES, make_blog, make_course
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memory_baseline.json')
+MAX_LESSONS = 500
+REPEAT = 5
+DETAIL_COURSE = 'course-0'
+
+# Route -> catalog dimension its footprint is expected to follow
+ROUTES = {
+    '/api/blogs': 'posts',
+    '/blog': 'posts',
+    '/blog/post-0': 'posts',
+    '/feed.xml': 'posts',
+    '/sitemap.xml': 'posts',
+    '/api/search?q=cardiology': 'posts',
+    '/programs/doctalks': 'courses',
+    f'/course/{DETAIL_COURSE}': 'lessons',
+    '/api/courses?ids=' + ','.join(f'course-{i}' for i in range(0, 100, 2)): 'courses',
+}
+METRICS = ('peak', 'retained', 'leaked')
+
+
+def dimensions(size):
+    return {'posts': size, 'courses': size, 'lessons': min(size, MAX_LESSONS)}
+
+
+def seed(size):
+    """Fresh storage holding `size` posts and courses, with every cache reset."""
+    storage = MemoryStorage()
+    for i in range(size):
+        post = make_blog(i)
+        storage.put('blogs', post.pop('id'), post)
+    for i in range(size):
+        course = make_course(i, lessons=dimensions(size)['lessons'] if i == 0 else 20)
+        course['category'] = CATEGORIES[i % len(CATEGORIES)]
+        storage.put('courses', course.pop('id'), course)
+
+    medtalks.storage = storage
+    courses_module.set_storage(storage)
+    catalog.set_storage(storage)
+    content_store.store = content_store.LastKnownGoodStore()
+    courses_module.course_cache.clear()
+    fragment_cache.clear()
+    catalog.refresh()
+    gc.collect()
+    return storage
+
+
+def _request(client, route):
+    response = client.get(route)
+    assert response.status_code == 200, (route, response.status_code)
+    response.get_data()
+    response.close()
+
+
+def measure(client, route, devnull):
+    """(peak, retained, leaked) bytes for one route on the current catalog."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with redirect_stdout(devnull):
+            _request(client, route)
+            gc.collect()
+            retained, peak = tracemalloc.get_traced_memory()
+            for _ in range(REPEAT):
+                _request(client, route)
+            gc.collect()
+            after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak': peak, 'retained': retained, 'leaked': max(0, after - retained) // REPEAT}
+
+
+def run(sizes, devnull):
+    client = medtalks.app.test_client()
+    with redirect_stdout(devnull):
+        seed(min(sizes))
+        for route in ROUTES:
+            for _ in range(2):
+                _request(client, route)
+
+    results = {route: {} for route in ROUTES}
+    for size in sizes:
+        started = time.perf_counter()
+        with redirect_stdout(devnull):
+            seed(size)
+        for route in ROUTES:
+            results[route][str(size)] = measure(client, route, devnull)
+        print(f"size {size}: measured {len(ROUTES)} routes in {time.perf_counter() - started:.1f}s")
+    return results
+
+
+def growth_failures(results, sizes, tolerance, floor, leak_limit):
+    """Routes growing faster than their catalog dimension or leaking per request."""
+    failures = []
+    for route, dimension in ROUTES.items():
+        for small, large in zip(sizes, sizes[1:]):
+            x_small, x_large = dimensions(small)[dimension], dimensions(large)[dimension]
+            for metric in ('peak', 'retained'):
+                y_small = results[route][str(small)][metric]
+                y_large = results[route][str(large)][metric]
+                if y_large < floor or y_small <= 0:
+                    continue
+                if x_large == x_small:
+                    slope = math.inf if y_large > y_small * (1 + tolerance) else 0.0
+                else:
+                    slope = math.log(y_large / y_small) / math.log(x_large / x_small)
+                if slope > 1 + tolerance:
+                    failures.append(f"{route}: {metric} grows super-linearly from {small} to {large} "
+                                    f"({y_small:,} -> {y_large:,} bytes, slope {slope:.2f})")
+        for size in sizes:
+            leaked = results[route][str(size)]['leaked']
+            if leaked > leak_limit:
+                failures.append(f"{route}: {leaked:,} bytes retained per repeated request at size {size}")
+    return failures
+
+
+def baseline_failures(results, baseline, tolerance, slack):
+    """Measurements exceeding the recorded baseline."""
+    failures = []
+    for route, by_size in results.items():
+        for size, values in by_size.items():
+            recorded = baseline.get(route, {}).get(size)
+            if not recorded:
+                continue
+            for metric in METRICS:
+                limit = recorded.get(metric, 0) * (1 + tolerance) + slack
+                if values[metric] > limit:
+                    failures.append(f"{route}: {metric} at size {size} is {values[metric]:,} bytes, "
+                                    f"baseline {recorded.get(metric, 0):,}")
+    return failures
+
+
+def report(results, sizes):
+    print()
+    print(f"{'route':<40} {'size':>6} {'peak KB':>10} {'retained KB':>12} {'leaked B':>9}")
+    for route, by_size in results.items():
+        label = route if len(route) <= 40 else route[:37] + '...'
+        for size in sizes:
+            values = by_size[str(size)]
+            print(f"{label:<40} {size:>6} {values['peak'] / 1024:>10.1f} "
+                  f"{values['retained'] / 1024:>12.1f} {values['leaked']:>9}")
+            label = ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10,100,1000,10000',
+                        help='Comma-separated catalog sizes, smallest first')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Record this run as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed growth over the baseline and over linear scaling')
+    parser.add_argument('--slack', type=int, default=64 * 1024,
+                        help='Bytes allowed over the baseline regardless of tolerance')
+    parser.add_argument('--leak-limit', type=int, default=4096,
+                        help='Bytes a repeated request may leave allocated')
+    parser.add_argument('--floor', type=int, default=256 * 1024,
+                        help='Values below this many bytes are not checked for growth')
+    args = parser.parse_args()
+
+    sizes = sorted({int(size) for size in args.sizes.split(',') if size.strip()})
+    with open(os.devnull, 'w') as devnull:
+        results = run(sizes, devnull)
+    report(results, sizes)
+
+    failures = growth_failures(results, sizes, args.tolerance, args.floor, args.leak_limit)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        print(f"\nWrote baseline for {len(results)} routes to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as fh:
+            failures += baseline_failures(results, json.load(fh), args.tolerance, args.slack)
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+
+    if failures:
+        print(f"\n{len(failures)} memory regression(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nNo memory regressions")
+
+
+if __name__ == '__main__':
+    main()
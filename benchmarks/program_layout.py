@@ -0,0 +1,151 @@
+"""
+Program pages from the shared layout versus one template per program.
+
+Measures, for the data-driven layout (program_pages + programs/program.html)
+and optionally for the four per-program templates it replaced:
+
+    compile   time for Jinja to load and compile the page templates
+    memory    bytes the compiled templates keep allocated in a worker
+    render    time to render each program page with synthetic courses/posts
+
+The old templates are read from git (`--legacy-ref`, e.g. the commit before
+the layout landed) and rendered with the same context, minus `program`.
+base.html is compiled before measuring, so only the page templates count.
+
+Usage:
+    python benchmarks/program_layout.py [--repeat 200]
+    python benchmarks/program_layout.py --legacy-ref <commit>
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('ENROLLMENT_ROLLUP_SECONDS', '0')
+os.environ.setdefault('SITE_URL', 'http://localhost:5050')
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+with open(os.devnull, 'w') as _devnull, redirect_stdout(_devnull):
+    import app as medtalks
+
+from flask import render_template
+from jinja2 import ChoiceLoader, DictLoader
+
+import courses as courses_module
+from fragment_cache import fragment_cache
+from program_pages import PROGRAMS, PROGRAM_TEMPLATE
+from synthetic import make_blog, make_course
+from video_config import get_video_urls
+
+
+LEGACY_PREFIX = 'legacy/'
+
+
+def load_legacy(ref):
+    """{template name: source} of the per-program templates at git revision `ref`."""
+    sources = {}
+    for category in PROGRAMS:
+        sources[f'{LEGACY_PREFIX}{category}.html'] = subprocess.run(
+            ['git', 'show', f'{ref}:templates/programs/{category}.html'],
+            cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+    return sources
+
+
+def context(count):
+    courses = [courses_module.add_display_fields(courses_module._process_course_data(make_course(i)))
+               for i in range(count)]
+    return {'courses': courses, 'blog_posts': [make_blog(i) for i in range(3)], **get_video_urls()}
+
+
+def compile_templates(env, names, repeat):
+    """(median seconds to compile `names`, bytes they keep allocated)."""
+    env.get_template('base.html')
+    timings = []
+    for _ in range(repeat):
+        _evict(env, names)
+        started = time.perf_counter()
+        for name in names:
+            env.get_template(name)
+        timings.append(time.perf_counter() - started)
+
+    _evict(env, names)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        templates = [env.get_template(name) for name in names]
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del templates
+    return statistics.median(timings), after - before
+
+
+def _evict(env, names):
+    # Jinja keys its template cache by (weakref to the loader, name)
+    for key in list(env.cache.keys()):
+        if key[1] in names:
+            del env.cache[key]
+
+
+def render_times(pages, ctx, repeat):
+    """{category: median ms per render} for (category, template, extra context) pages."""
+    app = medtalks.app
+    results = {}
+    for category, template, extra in pages:
+        with app.test_request_context(PROGRAMS[category]['url']):
+            render_template(template, **extra, **ctx)
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                render_template(template, **extra, **ctx)
+                timings.append(time.perf_counter() - started)
+        results[category] = statistics.median(timings) * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--legacy-ref', help='Git revision holding templates/programs/<category>.html')
+    parser.add_argument('--courses', type=int, default=6, help='Courses rendered on each page')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--compile-repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    env = medtalks.app.jinja_env
+    setups = {'layout': ([PROGRAM_TEMPLATE], [(category, PROGRAM_TEMPLATE, {'program': program})
+                                              for category, program in PROGRAMS.items()])}
+    sources = {'layout': os.path.getsize(os.path.join(ROOT, 'templates', PROGRAM_TEMPLATE))}
+    if args.legacy_ref:
+        legacy = load_legacy(args.legacy_ref)
+        env.loader = ChoiceLoader([env.loader, DictLoader(legacy)])
+        setups['templates'] = (sorted(legacy), [(category, f'{LEGACY_PREFIX}{category}.html', {})
+                                                for category in PROGRAMS])
+        sources['templates'] = sum(len(source.encode('utf-8')) for source in legacy.values())
+
+    ctx = context(args.courses)
+    print(f"{'setup':<10} {'source KB':>10} {'compile ms':>11} {'compiled KB':>12} {'render ms (per program)':>26}")
+    for setup, (names, pages) in setups.items():
+        compile_seconds, compiled_bytes = compile_templates(env, names, args.compile_repeat)
+        fragment_cache.clear()
+        renders = render_times(pages, ctx, args.repeat)
+        per_program = ' '.join(f'{ms:.2f}' for ms in renders.values())
+        print(f"{setup:<10} {sources[setup] / 1024:>10.1f} {compile_seconds * 1000:>11.1f} "
+              f"{compiled_bytes / 1024:>12.1f}   {per_program}")
+    print(f"\nrender columns: {', '.join(PROGRAMS)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Search index build time and query latency against synthetic corpora.
+
+Usage:
+    python benchmarks/search_benchmark.py [--docs 10000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from courses import _process_course_data
+from search_index import SearchIndex, blog_document, course_document
+from synthetic import WORDS, make_blog, make_course
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=10000, help='blogs and courses each')
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    documents = [blog_document(make_blog(i)) for i in range(args.docs)]
+    documents += [course_document(_process_course_data(make_course(i))) for i in range(args.docs)]
+
+    index = SearchIndex()
+    build = index.build(documents)
+    print(f"Built index over {len(index)} documents in {build * 1000:.1f} ms")
+
+    rng = random.Random(0)
+    for i in range(args.queries):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        # Every other query is a typeahead prefix of its last word
+        if i % 2:
+            words[-1] = words[-1][:rng.randint(2, len(words[-1]))]
+        index.search(' '.join(words))
+
+    started = time.perf_counter()
+    for i in range(100):
+        index.add(*blog_document(make_blog(args.docs + i)))
+        index.remove(f'blog:post-{i}')
+    incremental = (time.perf_counter() - started) / 200
+
+    stats = index.stats()
+    print(f"{stats['queries']} queries: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms")
+    print(f"{stats['terms']} terms; incremental add/remove {incremental * 1000:.3f} ms each")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Minimal Firestore stand-in that answers blog queries after a fixed delay.
+
+Only the query chain used by get_recent_posts() is implemented:
+db.collection(name).where(...).order_by(...).limit(n).stream(timeout=...).
+"""
+
+import threading
+import time
+
+
+class _Doc:
+    def __init__(self, data):
+        self.id = data['id']
+        self._data = data
+        self.exists = True
+        self.update_time = None
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _Tracker:
+    """Counts backend calls currently in flight (i.e. connections held)."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+class _Query:
+    def __init__(self, backend, limit=None):
+        self._backend = backend
+        self._limit = limit
+
+    def where(self, *args, **kwargs):
+        return self
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def limit(self, n):
+        return type(self)(self._backend, n)
+
+    def _docs(self):
+        return [_Doc(d) for d in self._backend.docs[:self._limit]]
+
+
+class _SyncQuery(_Query):
+    def stream(self, timeout=None):
+        self._backend.tracker.enter()
+        try:
+            time.sleep(self._backend.delay)
+        finally:
+            self._backend.tracker.exit()
+        return iter(self._docs())
+
+
+class SlowFirestore:
+    """Sync client whose every query blocks for `delay` seconds."""
+
+    query_class = _SyncQuery
+
+    def __init__(self, docs, delay):
+        self.docs = docs
+        self.delay = delay
+        self.tracker = _Tracker()
+
+    def collection(self, name):
+        return self.query_class(self)
+
+    def close(self):
+        pass
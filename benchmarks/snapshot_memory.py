@@ -0,0 +1,100 @@
+"""
+Per-worker memory of a per-process catalog vs the shared mmap snapshot.
+
+Forks N workers that each load the same synthetic catalog, either as
+private dicts or by mapping one snapshot file, touch every record the way
+the sitemap does, and report their private (unshared) and proportional
+(PSS) memory from /proc/self/smaps_rollup. Linux only.
+
+Usage:
+    python benchmarks/snapshot_memory.py [--docs 5000] [--workers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import BLOG, COURSE, ContentCatalog
+from content_store import _decode_value, _encode_value
+from courses import _process_course_data
+from synthetic import make_blog, make_course
+
+
+def smaps_kb():
+    """(private, pss) memory of this process in KiB."""
+    fields = {}
+    with open('/proc/self/smaps_rollup', 'r') as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0), fields.get('Pss', 0)
+
+
+def dict_worker(json_path, results):
+    base = smaps_kb()[0]
+    with open(json_path, 'r', encoding='utf-8') as fh:
+        docs = json.load(fh, object_hook=_decode_value)
+    touched = sum(len(doc.get('title', '')) for kind in docs.values() for doc in kind.values())
+    private, pss = smaps_kb()
+    results.put((private - base, pss, touched))
+
+
+def snapshot_worker(snapshot_path, results):
+    base = smaps_kb()[0]
+    catalog = ContentCatalog(snapshot_path=snapshot_path)
+    catalog.snapshot.open_latest()
+    view = catalog.snapshot.view
+    docs = {BLOG: view.docs(BLOG), COURSE: view.docs(COURSE)}
+    touched = sum(len(doc.get('title', '')) for kind in docs.values() for doc in kind.values())
+    private, pss = smaps_kb()
+    results.put((private - base, pss, touched))
+
+
+def run(target, path, workers):
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=target, args=(path, results)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    samples = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    private = sum(s[0] for s in samples) / len(samples)
+    pss = sum(s[1] for s in samples) / len(samples)
+    print(f"{target.__name__:16} {workers} workers: {private / 1024:7.1f} MiB private/worker, "
+          f"{pss / 1024:7.1f} MiB PSS/worker")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=5000, help='blogs and courses each')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    blogs = [make_blog(i) for i in range(args.docs)]
+    courses = [_process_course_data(make_course(i)) for i in range(args.docs)]
+    for doc in blogs + courses:
+        doc['update_time'] = '2024-01-01T00:00:00+00:00'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'catalog.json')
+        with open(json_path, 'w', encoding='utf-8') as fh:
+            json.dump({BLOG: {d['id']: d for d in blogs}, COURSE: {d['id']: d for d in courses}}, fh, default=_encode_value)
+
+        snapshot_path = os.path.join(tmp, 'catalog.snap')
+        ContentCatalog(snapshot_path=snapshot_path).snapshot.write({BLOG: blogs, COURSE: courses})
+        print(f"Snapshot: {os.path.getsize(snapshot_path) / 1024 / 1024:.1f} MiB for {2 * args.docs} documents")
+        del blogs, courses
+
+        for workers in sorted({1, args.workers}):
+            run(dict_worker, json_path, workers)
+            run(snapshot_worker, snapshot_path, workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Synthetic blog and course documents shaped like the Firestore collections.
+
+Shared by the benchmark scripts so they run without cloud credentials.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+
+WORDS = """
+patient clinical diagnosis treatment cardiology nursing pharmacy dental
+handover communication english exam oet ielts consultation hospital ward
+medication dosage surgery infection anatomy referral letter speaking
+listening reading writing empathy history examination prescription care
+emergency pediatrics geriatrics radiology pathology therapy assessment
+""".split()
+
+CATEGORIES = ['doctalks', 'denttalks', 'nursetalks', 'pharmatalks']
+
+# Long tail of pseudo-words so the vocabulary grows like real prose
+_SYLLABLES = ['car', 'dio', 'neu', 'ro', 'gas', 'tro', 'en', 'ter', 'ol', 'ogy', 'path', 'ic', 'al', 'ma']
+VOCABULARY = WORDS + sorted({
+    a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES
+})
+
+
+def _sentence(rng, n):
+    # Mostly common words, with a Zipf-ish tail from the wider vocabulary
+    words = [
+        rng.choice(WORDS) if rng.random() < 0.6 else VOCABULARY[int(rng.paretovariate(1.2)) % len(VOCABULARY)]
+        for _ in range(n)
+    ]
+    return ' '.join(words).capitalize() + '.'
+
+
+def make_blog(i, rng=None, paragraphs=6):
+    """A published blog post dict with HTML content."""
+    rng = rng or random.Random(i)
+    body = ''.join(f'<h2>{_sentence(rng, 4)}</h2><p>{_sentence(rng, 60)}</p>' for _ in range(paragraphs))
+    return {
+        'id': f'post-{i}',
+        'slug': f'post-{i}',
+        'title': _sentence(rng, 6),
+        'excerpt': _sentence(rng, 20),
+        'content': body,
+        'status': 'published',
+        'category': rng.choice(CATEGORIES),
+        'createdAt': datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i),
+        'updatedByName': 'MedTalks Team',
+        'updatedByPhotoURL': f'https://example.com/avatars/{i % 50}.png',
+        'update_time': f'2024-01-01T00:00:{i % 60:02d}+00:00',
+    }
+
+
+def make_course(i, lessons=20, rng=None, section_size=10):
+    """A published course dict with `lessons` lessons split into sections."""
+    rng = rng or random.Random(i)
+    sections = []
+    for s in range(0, lessons, section_size):
+        sections.append({
+            'title': _sentence(rng, 3),
+            'lessons': [
+                {
+                    'title': _sentence(rng, 5),
+                    'duration': str(rng.randint(5, 45)),
+                    'is_preview': l == 0,
+                    'video_url': f'https://cdn.example.com/courses/{i}/lesson-{s + l}.mp4',
+                }
+                for l in range(min(section_size, lessons - s))
+            ],
+        })
+    return {
+        'id': f'course-{i}',
+        'title': _sentence(rng, 5),
+        'description': f'<p>{_sentence(rng, 40)}</p>',
+        'category': rng.choice(CATEGORIES),
+        'status': 'published',
+        'sections': sections,
+        'actual_price': 499,
+        'discounted_price': 299,
+        'duration_hours': 12,
+        'update_time': f'2024-01-01T00:00:{i % 60:02d}+00:00',
+    }
@@ -0,0 +1,269 @@
+"""
+Precomputed, versioned render artifacts for blog posts.
+
+Everything blog_post() used to work out per request (image fallback, date,
+reading time, category, author) plus HTML post-processing (sanitizing,
+heading anchors and a table of contents, lazy-loading images) runs once per
+document version. The result is cached, so the request path only renders
+the template.
+
+Usage in app.py:
+    from blog_render import get_post_artifact
+
+    post = get_post_artifact(raw_post)
+    return render_template('blog-post.html', post=post)
+"""
+
+import os
+import re
+from html import escape
+from html.parser import HTMLParser
+
+from content_store import BoundedCache
+
+
+# Bump when the pipeline output changes so cached artifacts are rebuilt
+RENDERER_VERSION = '2'
+
+WORDS_PER_MINUTE = 200
+
+DEFAULT_IMAGE = 'https://images.unsplash.com/photo-1576091160399-112ba8d25d1d?w=1200&h=600&fit=crop'
+DEFAULT_AVATAR = 'https://images.unsplash.com/photo-1559839734-2b71ea197ec2?w=100&h=100&fit=crop'
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'code', 'del', 'div', 'em',
+    'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'iframe',
+    'img', 'ins', 'li', 'mark', 'ol', 'p', 'pre', 's', 'small', 'span', 'strong',
+    'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Content of these is dropped entirely, not just the tags
+DROP_CONTENT_TAGS = {'script', 'style', 'noscript', 'template', 'object'}
+# Void elements dropped outright; they have no content or end tag to wait for
+DROP_VOID_TAGS = {'embed'}
+
+GLOBAL_ATTRS = {'class', 'id', 'title'}
+ALLOWED_ATTRS = {
+    'a': {'href', 'target', 'rel'},
+    'img': {'src', 'alt', 'width', 'height', 'srcset', 'sizes'},
+    'iframe': {'src', 'width', 'height', 'allow', 'allowfullscreen', 'frameborder'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start'},
+}
+URL_ATTRS = {'href', 'src'}
+SAFE_URL_RE = re.compile(r'^(https?:|mailto:|tel:|/|#)', re.IGNORECASE)
+EMBED_HOSTS_RE = re.compile(r'^https://(www\.)?(youtube\.com|youtube-nocookie\.com|player\.vimeo\.com)/', re.IGNORECASE)
+
+TOC_LEVELS = {'h2', 'h3'}
+WORD_RE = re.compile(r"\w+(?:['’]\w+)?")
+
+
+def slugify(text):
+    slug = re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+    return slug or 'section'
+
+
+class _PostProcessor(HTMLParser):
+    """Single pass sanitizer that also collects words and headings."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.words = 0
+        self.toc = []
+        self._open = []
+        self._drop_depth = 0
+        self._heading = None
+        self._anchors = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_VOID_TAGS:
+            return
+        if tag in DROP_CONTENT_TAGS:
+            self._drop_depth += 1
+            return
+        if self._drop_depth or tag not in ALLOWED_TAGS:
+            return
+
+        clean = {}
+        allowed = GLOBAL_ATTRS | ALLOWED_ATTRS.get(tag, set())
+        for name, value in attrs:
+            if name not in allowed:
+                continue
+            value = value or ''
+            if name in URL_ATTRS and not SAFE_URL_RE.match(value.strip()):
+                continue
+            clean[name] = value
+
+        if tag == 'iframe' and not EMBED_HOSTS_RE.match(clean.get('src', '')):
+            return
+        if tag == 'img':
+            if 'src' not in clean:
+                return
+            clean['loading'] = 'lazy'
+            clean['decoding'] = 'async'
+        if tag == 'iframe':
+            clean['loading'] = 'lazy'
+        if tag == 'a' and clean.get('target') == '_blank':
+            clean['rel'] = 'noopener noreferrer'
+
+        if tag in TOC_LEVELS:
+            # Defer writing the tag until the heading text (and anchor) is known
+            self._heading = {'tag': tag, 'attrs': clean, 'start': len(self.out), 'text': []}
+            self.out.append(None)
+        else:
+            self.out.append(self._format_tag(tag, clean))
+
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # A self-closed <script/> or <embed/> has no content to drop
+        if tag in DROP_VOID_TAGS or tag in DROP_CONTENT_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self._open and self._open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self._drop_depth = max(0, self._drop_depth - 1)
+            return
+        if self._drop_depth or tag not in self._open:
+            return
+        # Close anything left open inside this element
+        while self._open:
+            current = self._open.pop()
+            if self._heading and current == self._heading['tag']:
+                self._finish_heading()
+            self.out.append(f'</{current}>')
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if self._drop_depth:
+            return
+        self.words += len(WORD_RE.findall(data))
+        if self._heading is not None:
+            self._heading['text'].append(data)
+        self.out.append(escape(data, quote=False))
+
+    def _finish_heading(self):
+        heading, self._heading = self._heading, None
+        text = ' '.join(''.join(heading['text']).split())
+        anchor = heading['attrs'].get('id') or slugify(text)
+        base, n = anchor, 2
+        while anchor in self._anchors:
+            anchor, n = f'{base}-{n}', n + 1
+        self._anchors.add(anchor)
+        heading['attrs']['id'] = anchor
+        self.out[heading['start']] = self._format_tag(heading['tag'], heading['attrs'])
+        if text:
+            self.toc.append({'level': int(heading['tag'][1]), 'text': text, 'anchor': anchor})
+
+    @staticmethod
+    def _format_tag(tag, attrs):
+        rendered = ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+        return f'<{tag}{rendered}>'
+
+    def result(self):
+        self.close()
+        while self._open:
+            self.handle_endtag(self._open[-1])
+        return ''.join(part for part in self.out if part is not None)
+
+
+def process_html(content):
+    """
+    Sanitize and normalize post HTML.
+
+    Returns:
+        (html, word_count, toc) where toc is a list of
+        {'level', 'text', 'anchor'} dicts for h2/h3 headings
+    """
+    parser = _PostProcessor()
+    parser.feed(content or '')
+    html = parser.result()
+    return html, parser.words, parser.toc
+
+
+def format_reading_time(words):
+    minutes = max(1, round(words / WORDS_PER_MINUTE))
+    return f'{minutes} min read'
+
+
+def resolve_author(post):
+    """Author block with the precedence the template used to apply inline."""
+    author = post.get('author') if isinstance(post.get('author'), dict) else {}
+    return {
+        'name': post.get('updatedByName') or author.get('name') or post.get('createdByName') or 'MedTalks Team',
+        'avatar': post.get('updatedByPhotoURL') or author.get('avatar') or DEFAULT_AVATAR,
+        'bio': author.get('bio') or 'Part of the MedTalks academic team',
+    }
+
+
+def apply_author_avatar(post):
+    """Listing helper: use updatedByPhotoURL as the author avatar when set."""
+    if post.get('updatedByPhotoURL'):
+        if 'author' not in post:
+            post['author'] = {}
+        post['author']['avatar'] = post['updatedByPhotoURL']
+    return post
+
+
+def build_post_artifact(post):
+    """Compute the template-ready post dict from a raw Firestore blog post."""
+    artifact = dict(post)
+
+    featured = post.get('featuredImage')
+    if isinstance(featured, dict) and featured.get('url'):
+        artifact['image'] = featured['url']
+    elif not post.get('image'):
+        artifact['image'] = DEFAULT_IMAGE
+
+    created = post.get('createdAt')
+    if created and hasattr(created, 'strftime'):
+        artifact['date'] = created.strftime('%b %d, %Y')
+    elif 'date' not in post:
+        artifact['date'] = 'Recent'
+
+    html, words, toc = process_html(post.get('content', ''))
+    artifact['content'] = html
+    artifact['word_count'] = words
+    artifact['toc'] = toc
+    if not post.get('reading_time'):
+        artifact['reading_time'] = format_reading_time(words)
+
+    artifact.setdefault('category', 'Medical')
+    artifact['author'] = resolve_author(post)
+    return artifact
+
+
+artifact_cache = BoundedCache(max_entries=int(os.getenv('BLOG_ARTIFACT_CACHE_SIZE', '500')))
+
+
+def get_post_artifact(post):
+    """
+    Cached artifact for a post, rebuilt only when its version changes.
+
+    The version is the document update_time; posts without one (e.g. stale
+    snapshot entries from older code) are processed on every call.
+    """
+    version = post.get('update_time')
+    if not version:
+        return build_post_artifact(post)
+
+    key = f"blog:{post['id']}:{version}:{RENDERER_VERSION}"
+    artifact = artifact_cache.get(key)
+    if artifact is None:
+        artifact = build_post_artifact(post)
+        artifact_cache.delete_prefix(f"blog:{post['id']}:")
+        artifact_cache.set(key, artifact)
+    return artifact
+
+
+def handle_catalog_change(kind, doc_id, doc):
+    """Catalog listener dropping artifacts of changed or removed posts."""
+    if kind == 'blog':
+        artifact_cache.delete_prefix(f'blog:{doc_id}:')
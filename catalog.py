@@ -0,0 +1,272 @@
+"""
+Content catalog: an in-process view of every published blog post and course.
+
+The catalog is refreshed from storage at most once per refresh interval.
+Each refresh compares document update times with the previous refresh and
+notifies subscribers about changed and removed documents, so derived
+structures (search index, feeds, caches) can update incrementally instead
+of re-reading whole collections per request.
+
+With a snapshot path configured, whichever worker first finds the snapshot
+older than the refresh interval reads storage and publishes a new
+memory-mapped generation (catalog_snapshot.py); every worker maps it instead
+of holding its own copy of the catalog. Only a successful storage read is
+published: during an outage the old generation stays current and the
+publish is retried after `publish_retry` seconds.
+
+A process's first load is not reported to listeners document by document
+(that would decode every snapshot record in every worker); refresh hooks
+get `initial=True` instead.
+
+Usage in app.py:
+    from catalog import catalog
+
+    catalog.set_storage(storage)
+    catalog.subscribe(lambda kind, doc_id, doc: ...)
+    catalog.ensure_fresh()
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from catalog_snapshot import CatalogSnapshot
+from content_store import breaker, fetch_with_fallback
+
+
+BLOG = 'blog'
+COURSE = 'course'
+
+
+class ContentCatalog:
+    """
+    Published blogs and courses keyed by document ID.
+
+    Every stored document carries an `update_time` key holding its version,
+    and `generation` increases whenever any document is added, changed or
+    removed.
+
+    Args:
+        refresh_interval: Seconds between reads of storage
+        snapshot_path: Shared snapshot file; when set, documents are served
+            from the mapped snapshot and storage is read only to publish it
+        snapshot_poll: Seconds between checks for a new snapshot generation
+        publish_retry: Seconds before this process retries a publish whose
+            storage read failed
+    """
+
+    def __init__(self, refresh_interval=300, snapshot_path=None, snapshot_poll=5, publish_retry=30):
+        self.refresh_interval = refresh_interval
+        self.snapshot = CatalogSnapshot(snapshot_path) if snapshot_path else None
+        self.snapshot_poll = snapshot_poll
+        self.publish_retry = publish_retry
+        self.generation = 0
+        self._storage = None
+        self._docs = {BLOG: {}, COURSE: {}}
+        self._listeners = []
+        self._refresh_hooks = []
+        self._last_refresh = 0.0
+        self._last_storage_read = 0.0
+        self._next_publish = 0.0
+        self._loaded = False
+        self._refresh_lock = threading.Lock()
+        self._fingerprint = (None, '')
+
+    def set_storage(self, storage):
+        """Set the storage backend (see storage.py)."""
+        self._storage = storage
+
+    def subscribe(self, listener):
+        """
+        Register a change listener.
+
+        Args:
+            listener: Callable taking (kind, doc_id, doc); doc is None when
+                the document was removed or unpublished. Not called for
+                the documents of the first load (see after_refresh).
+        """
+        self._listeners.append(listener)
+
+    def after_refresh(self, hook):
+        """
+        Register a hook run after a refresh that changed anything.
+
+        Args:
+            hook: Callable taking `initial`, True for the first load of this
+                process, whose documents listeners were not told about.
+        """
+        self._refresh_hooks.append(hook)
+
+    @property
+    def blogs(self):
+        return self._docs[BLOG]
+
+    @property
+    def courses(self):
+        return self._docs[COURSE]
+
+    def get(self, kind, doc_id):
+        return self._docs[kind].get(doc_id)
+
+    def version(self, kind, doc_id):
+        """Return the update_time version of a document, or '' if unknown."""
+        return _doc_version(self._docs[kind], doc_id)
+
+    def fingerprint(self):
+        """
+        Content digest over every document version.
+
+        Unlike `generation` it is identical across processes holding the
+        same content, so it is safe to use in ETags.
+        """
+        generation, digest = self._fingerprint
+        if generation != self.generation:
+            sha = hashlib.sha1()
+            for kind in (BLOG, COURSE):
+                for doc_id in sorted(self._docs[kind]):
+                    sha.update(f"{kind}:{doc_id}:{_doc_version(self._docs[kind], doc_id)}\n".encode('utf-8'))
+            digest = sha.hexdigest()
+            self._fingerprint = (self.generation, digest)
+        return digest
+
+    def ensure_fresh(self):
+        """
+        Refresh if the catalog is older than the refresh interval.
+
+        Only the first load blocks concurrent callers; later refreshes are
+        done by whichever request gets the lock while the rest keep serving
+        the current catalog.
+        """
+        interval = self.snapshot_poll if self.snapshot else self.refresh_interval
+        if self._loaded and time.monotonic() - self._last_refresh < interval:
+            return
+        if not self._refresh_lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            if not self._loaded or time.monotonic() - self._last_refresh >= interval:
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self):
+        """Re-read both collections and notify listeners of the differences."""
+        fresh = self._read_snapshot() if self.snapshot else None
+        if fresh is None and self.snapshot and self._loaded and \
+                time.monotonic() - self._last_storage_read < self.refresh_interval:
+            # No snapshot published yet; keep the direct read until it is due
+            fresh = self._docs
+        if fresh is None:
+            self._last_storage_read = time.monotonic()
+            fresh = {
+                BLOG: _by_id(fetch_with_fallback('catalog:blogs', self._load_blogs)),
+                COURSE: _by_id(fetch_with_fallback('catalog:courses', self._load_courses)),
+            }
+        elif fresh is self._docs:
+            self._last_refresh = time.monotonic()
+            return 0
+        initial = not self._loaded
+        changed = self._apply(BLOG, fresh[BLOG], notify=not initial) + \
+            self._apply(COURSE, fresh[COURSE], notify=not initial)
+        if changed:
+            self.generation += 1
+        self._last_refresh = time.monotonic()
+        self._loaded = True
+        if changed:
+            for hook in self._refresh_hooks:
+                try:
+                    hook(initial)
+                except Exception as e:
+                    print(f"Error in catalog refresh hook: {e}")
+        return changed
+
+    def _read_snapshot(self):
+        """
+        Documents from the shared snapshot, publishing a new generation
+        first if the snapshot is due and no other process is publishing.
+
+        Returns:
+            {kind: docs} for a new generation, self._docs if the mapped
+            generation is unchanged, or None if there is no snapshot yet.
+        """
+        snapshot = self.snapshot
+        previous = snapshot.view
+        snapshot.open_latest()
+        if snapshot.age() >= self.refresh_interval and time.monotonic() >= self._next_publish \
+                and breaker.state != breaker.OPEN and snapshot.try_acquire_producer():
+            try:
+                # Another worker may have published since the file was mapped
+                snapshot.open_latest()
+                if snapshot.age() >= self.refresh_interval:
+                    # Straight from storage: last-known-good data published
+                    # with a fresh timestamp would pass for current everywhere
+                    snapshot.write({BLOG: self._load_blogs(), COURSE: self._load_courses()})
+                    snapshot.open_latest()
+            except Exception as e:
+                print(f"Error publishing catalog snapshot, keeping the current generation: {e}")
+                self._next_publish = time.monotonic() + self.publish_retry
+            finally:
+                snapshot.release_producer()
+
+        view = snapshot.view
+        if view is None:
+            return None
+        if view is previous and self._loaded:
+            return self._docs
+        return {BLOG: view.docs(BLOG), COURSE: view.docs(COURSE)}
+
+    def _load_blogs(self):
+        return self._storage.list_blogs(status='published', newest_first=False)
+
+    def _load_courses(self):
+        from courses import _process_course_data
+
+        return [_process_course_data(course) for course in self._storage.list_courses(status='published')]
+
+    def _apply(self, kind, fresh, notify=True):
+        """Swap in a fresh {doc_id: doc} mapping, returning the number of changes."""
+        current = self._docs[kind]
+        changes = []
+
+        # Compare versions only, so unchanged snapshot records stay undecoded
+        for doc_id in fresh:
+            version = _doc_version(fresh, doc_id)
+            if doc_id not in current or _doc_version(current, doc_id) != version or not version:
+                changes.append(doc_id)
+        removed = [doc_id for doc_id in current if doc_id not in fresh]
+
+        self._docs[kind] = fresh
+        if not notify:
+            return len(changes) + len(removed)
+        for doc_id in changes:
+            self._notify(kind, doc_id, fresh[doc_id])
+        for doc_id in removed:
+            self._notify(kind, doc_id, None)
+        return len(changes) + len(removed)
+
+    def _notify(self, kind, doc_id, doc):
+        for listener in self._listeners:
+            try:
+                listener(kind, doc_id, doc)
+            except Exception as e:
+                print(f"Error in catalog listener for {kind} '{doc_id}': {e}")
+
+
+def _by_id(docs):
+    return {doc['id']: doc for doc in docs}
+
+
+def _doc_version(docs, doc_id):
+    """Version of docs[doc_id] for a plain dict or a SnapshotDocs mapping."""
+    if hasattr(docs, 'version'):
+        return docs.version(doc_id)
+    doc = docs.get(doc_id)
+    return doc.get('update_time', '') if doc else ''
+
+
+catalog = ContentCatalog(
+    refresh_interval=float(os.getenv('CATALOG_REFRESH_SECONDS', '300')),
+    snapshot_path=os.getenv('CATALOG_SNAPSHOT_PATH'),
+    snapshot_poll=float(os.getenv('CATALOG_SNAPSHOT_POLL_SECONDS', '5')),
+    publish_retry=float(os.getenv('CATALOG_PUBLISH_RETRY_SECONDS', '30')),
+)
@@ -0,0 +1,218 @@
+"""
+Memory-mapped catalog snapshot shared by every worker on a host.
+
+Whichever worker finds the snapshot due takes a non-blocking producer lock,
+loads the published catalog from storage and writes it to a compact binary
+file; every worker
+maps that file read-only, so the page cache holds one copy of the catalog
+no matter how many workers there are. Records are decoded lazily, one
+document at a time, and a new generation is published by atomically
+replacing the file, which readers pick up on their next poll.
+
+File layout (little endian):
+    header   magic 'MTCS', format version (H), reserved (H), generation (Q),
+             written_at (d), record count (I)
+    index    per record: kind (B), id length (H), version length (H),
+             offset (I), length (I), id bytes, version bytes
+    records  compact JSON documents at the offsets given in the index
+
+Usage (see ContentCatalog):
+    snapshot = CatalogSnapshot('/tmp/medtalks_catalog.snap')
+    snapshot.open_latest()
+    if snapshot.age() > 300 and snapshot.try_acquire_producer():
+        try:
+            snapshot.write({'blog': blogs, 'course': courses})
+            snapshot.open_latest()
+        finally:
+            snapshot.release_producer()
+    blogs = snapshot.view.docs('blog')
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Mapping
+
+from content_store import BoundedCache, _decode_value, _encode_value
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    fcntl = None
+
+
+MAGIC = b'MTCS'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHQdI')
+INDEX_ENTRY = struct.Struct('<BHHII')
+
+# Kind codes in the index
+KINDS = ('blog', 'course')
+
+
+class SnapshotFormatError(Exception):
+    """Raised when a snapshot file is truncated or from another format."""
+
+
+def encode_snapshot(docs_by_kind, generation):
+    """Serialize {kind: [doc, ...]} into snapshot bytes."""
+    index = []
+    records = []
+    offset = 0
+    for code, kind in enumerate(KINDS):
+        for doc in docs_by_kind.get(kind, []):
+            body = json.dumps(doc, default=_encode_value, separators=(',', ':')).encode('utf-8')
+            doc_id = str(doc['id']).encode('utf-8')
+            version = str(doc.get('update_time') or '').encode('utf-8')
+            index.append(INDEX_ENTRY.pack(code, len(doc_id), len(version), offset, len(body)) + doc_id + version)
+            records.append(body)
+            offset += len(body)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, generation, time.time(), len(index))
+    return b''.join([header] + index + records)
+
+
+class SnapshotDocs(Mapping):
+    """Read-only {doc_id: doc} view of one kind, decoding documents on access."""
+
+    def __init__(self, view, entries):
+        self._view = view
+        self._entries = entries
+
+    def __getitem__(self, doc_id):
+        offset, length, _ = self._entries[doc_id]
+        return self._view.decode(offset, length)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def version(self, doc_id):
+        """update_time of a document without decoding it."""
+        entry = self._entries.get(doc_id)
+        return entry[2] if entry else ''
+
+
+class SnapshotView:
+    """One mapped snapshot generation."""
+
+    def __init__(self, fh, cache_size=256):
+        self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            raise SnapshotFormatError('snapshot truncated')
+        magic, fmt, _, self.generation, self.written_at, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise SnapshotFormatError(f'unsupported snapshot format {magic!r} v{fmt}')
+
+        self._docs = {kind: {} for kind in KINDS}
+        pos = HEADER.size
+        for _ in range(count):
+            code, id_len, ver_len, offset, length = INDEX_ENTRY.unpack_from(self._mmap, pos)
+            pos += INDEX_ENTRY.size
+            doc_id = self._mmap[pos:pos + id_len].decode('utf-8')
+            pos += id_len
+            version = self._mmap[pos:pos + ver_len].decode('utf-8')
+            pos += ver_len
+            self._docs[KINDS[code]][doc_id] = (offset, length, version)
+        self._records_start = pos
+        self._cache = BoundedCache(max_entries=cache_size)
+
+    def decode(self, offset, length):
+        doc = self._cache.get(offset)
+        if doc is None:
+            start = self._records_start + offset
+            doc = json.loads(self._mmap[start:start + length], object_hook=_decode_value)
+            self._cache.set(offset, doc)
+        return doc
+
+    def docs(self, kind):
+        return SnapshotDocs(self, self._docs[kind])
+
+
+class CatalogSnapshot:
+    """
+    Producer and reader side of a snapshot file.
+
+    Args:
+        path: Snapshot file; a sibling '<path>.lock' elects the producer
+        cache_size: Decoded documents kept per mapped generation
+    """
+
+    def __init__(self, path, cache_size=256):
+        self.path = path
+        self.cache_size = cache_size
+        self._lock_fh = None
+        self._file_id = None
+        self.view = None
+
+    def try_acquire_producer(self):
+        """
+        Take the producer lock without waiting.
+
+        Held only around a write (release with release_producer()), so any
+        worker can publish once the snapshot is due; False while another
+        process is writing.
+        """
+        if self._lock_fh is not None:
+            return True
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fh = open(f'{self.path}.lock', 'a+')
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self._lock_fh = fh
+        return True
+
+    def release_producer(self):
+        if self._lock_fh is not None:
+            # Closing the file releases the flock
+            self._lock_fh.close()
+            self._lock_fh = None
+
+    def age(self):
+        """Seconds since the mapped generation was written (inf if none)."""
+        return time.time() - self.view.written_at if self.view else float('inf')
+
+    def write(self, docs_by_kind):
+        """Publish a new generation; returns its number."""
+        generation = (self.view.generation if self.view else 0) + 1
+        data = encode_snapshot(docs_by_kind, generation)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp_path, self.path)
+        return generation
+
+    def open_latest(self):
+        """
+        Map the current file if it changed since the last call.
+
+        Returns:
+            The new SnapshotView, or None if the file is missing or unchanged.
+            The previous view stays valid for callers still holding it.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        file_id = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if file_id == self._file_id:
+            return None
+        try:
+            with open(self.path, 'rb') as fh:
+                view = SnapshotView(fh, self.cache_size)
+        except (OSError, ValueError, struct.error, SnapshotFormatError) as e:
+            print(f"Error opening catalog snapshot: {e}")
+            return None
+        self._file_id = file_id
+        self.view = view
+        return view
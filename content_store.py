@@ -0,0 +1,331 @@
+"""
+Last-known-good content store for riding out Firestore outages.
+
+Every successful content read is recorded here (in memory, with an on-disk
+snapshot that survives restarts, saved by a background thread). When
+Firestore raises, handlers serve the recorded value instead of blanking the
+page, and a circuit breaker stops hammering the backend while it is failing.
+
+Usage in app.py:
+    from content_store import fetch_with_fallback, store
+
+    store.start_snapshots()
+    posts = fetch_with_fallback('blogs:recent:3', load_recent_posts)
+"""
+
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    google_exceptions = None
+
+
+# Seconds a single Firestore read may take before it counts as a failure
+FIRESTORE_READ_TIMEOUT = float(os.getenv('FIRESTORE_READ_TIMEOUT', '5'))
+
+
+class CircuitOpenError(Exception):
+    """Raised when the breaker is open and no stale value is available."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused for `reset_timeout` seconds. The first request after
+    that is let through as a trial; success closes the circuit, failure
+    re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let exactly one trial request through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def cancel_trial(self):
+        """Hand the half-open trial to the next request; this one said nothing about the backend."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"Firestore circuit opened after {self.failures} failure(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def is_backend_failure(error):
+    """
+    Whether a read error means the backend is unhealthy.
+
+    Errors caused by the request itself (an ID Firestore rejects, a bad
+    argument) are not: counting them would let any client open the circuit
+    for the whole site. Rate limiting is, since it means the backend is
+    overloaded.
+    """
+    if isinstance(error, (ValueError, TypeError, KeyError)):
+        return False
+    if google_exceptions is not None and isinstance(error, google_exceptions.ClientError):
+        return isinstance(error, google_exceptions.TooManyRequests)
+    return True
+
+
+def _encode_value(value):
+    """json.dumps default hook: keep datetimes round-trippable."""
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    return str(value)
+
+
+def _decode_value(obj):
+    """json.loads object hook matching _encode_value."""
+    if len(obj) == 1 and '__datetime__' in obj:
+        try:
+            return datetime.fromisoformat(obj['__datetime__'])
+        except ValueError:
+            return obj['__datetime__']
+    return obj
+
+
+class BoundedCache:
+    """
+    Thread-safe LRU with optional per-entry TTL and hit/miss counters.
+
+    The general-purpose bounded store for derived data (render artifacts,
+    fragments); unlike LastKnownGoodStore it never touches disk.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_entries=1000, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is not self._MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        """Drop every entry whose (string) key starts with prefix."""
+        with self._lock:
+            for key in [k for k in self._entries if isinstance(k, str) and k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LastKnownGoodStore:
+    """
+    Bounded LRU of the last successful result per content key.
+
+    Values are deep-copied in and out so handlers can keep decorating the
+    dicts they get back without corrupting the stored copy.
+    """
+
+    def __init__(self, snapshot_path=None, max_entries=1000, snapshot_interval=30):
+        self.snapshot_path = snapshot_path
+        self.max_entries = max_entries
+        self.snapshot_interval = snapshot_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._thread = None
+
+    def get(self, key):
+        """Return (found, value) for a key."""
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, copy.deepcopy(self._entries[key]['value'])
+
+    def put(self, key, value):
+        entry = {'value': copy.deepcopy(value), 'stored_at': time.time()}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def start_snapshots(self):
+        """
+        Save the snapshot every snapshot_interval seconds from a daemon
+        thread, and once more at exit, so requests never write it.
+
+        Call once per process (after fork under gunicorn).
+        """
+        if not self.snapshot_path or not self.snapshot_interval or (self._thread and self._thread.is_alive()):
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.snapshot_interval)
+                self.save_snapshot()
+
+        self._thread = threading.Thread(target=loop, name='content-snapshot', daemon=True)
+        self._thread.start()
+        atexit.register(self.save_snapshot)
+
+    def load_snapshot(self):
+        """Populate the store from the on-disk snapshot, if one exists."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh, object_hook=_decode_value)
+        except (OSError, ValueError) as e:
+            print(f"Error loading content snapshot: {e}")
+            return 0
+
+        with self._lock:
+            for key, entry in data.get('entries', {}).items():
+                self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return len(data.get('entries', {}))
+
+    def save_snapshot(self, force=False):
+        """Atomically write the store to disk if it changed since the last save."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            if not (self._dirty or force):
+                return
+            payload = json.dumps({'entries': self._entries}, default=_encode_value)
+            self._dirty = False
+
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                fh.write(payload)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Error saving content snapshot: {e}")
+
+
+_default_snapshot = os.path.join(tempfile.gettempdir(), 'medtalks_content_snapshot.json')
+
+store = LastKnownGoodStore(
+    snapshot_path=os.getenv('CONTENT_SNAPSHOT_PATH', _default_snapshot),
+    max_entries=int(os.getenv('CONTENT_STORE_MAX_ENTRIES', '1000')),
+    snapshot_interval=float(os.getenv('CONTENT_SNAPSHOT_INTERVAL', '30')),
+)
+store.load_snapshot()
+
+breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv('FIRESTORE_BREAKER_THRESHOLD', '3')),
+    reset_timeout=float(os.getenv('FIRESTORE_BREAKER_RESET', '30')),
+)
+
+
+def fetch_with_fallback(key, loader):
+    """
+    Run a Firestore read through the circuit breaker.
+
+    Args:
+        key: Stable cache key describing the read (e.g. 'course:<id>')
+        loader: Zero-argument callable performing the actual read
+
+    Returns:
+        The fresh result, or the last known good result if the read fails
+        or the circuit is open. None results are returned but not stored.
+
+    Raises:
+        The original exception (or CircuitOpenError) when nothing is stored;
+        errors that are not backend failures (see is_backend_failure) are
+        re-raised without touching the breaker or the store.
+    """
+    if not breaker.allow_request():
+        found, value = store.get(key)
+        if found:
+            return value
+        raise CircuitOpenError(f"Firestore circuit open and no stored value for '{key}'")
+
+    try:
+        value = loader()
+    except Exception as e:
+        if not is_backend_failure(e):
+            breaker.cancel_trial()
+            raise
+        breaker.record_failure()
+        found, stale = store.get(key)
+        if found:
+            print(f"Serving last known good content for '{key}': {e}")
+            return stale
+        raise
+
+    breaker.record_success()
+    # Not-found results would only push real pages out of the store
+    if value is not None:
+        store.put(key, value)
+    return value
+
@@ -1,19 +1,31 @@
 """
-Courses module for fetching and managing course data from Firebase Firestore.
+Courses module for fetching and managing course data from the storage backend.
 """
 
-_db = None
+import os
 
+from content_store import BoundedCache, breaker, fetch_with_fallback
+from program_pages import PROGRAMS
+from storage import is_valid_document_id
 
-def set_db(client):
-    """Set the Firestore database client."""
-    global _db
-    _db = client
+_storage = None
 
+# Courses served by get_courses_by_ids, keyed '<course_id>|<fields>'
+course_cache = BoundedCache(
+    max_entries=int(os.getenv('COURSE_CACHE_MAX_ENTRIES', '2000')),
+    ttl=float(os.getenv('COURSE_CACHE_TTL', '60')),
+)
 
-def get_db():
-    """Get Firestore database client."""
-    return _db
+
+def set_storage(storage):
+    """Set the storage backend (see storage.py)."""
+    global _storage
+    _storage = storage
+
+
+def get_storage():
+    """Get the storage backend."""
+    return _storage
 
 
 def get_all_courses(status='published'):
@@ -26,20 +38,12 @@ def get_all_courses(status='published'):
     Returns:
         List of course dictionaries with all course data including sections and lessons
     """
+    def load():
+        # Process sections and lessons
+        return [_process_course_data(course) for course in get_storage().list_courses(status=status)]
+
     try:
-        db = get_db()
-        courses_ref = db.collection('courses').where('status', '==', status)
-        courses = []
-        
-        for doc in courses_ref.stream():
-            course_data = doc.to_dict()
-            course_data['id'] = doc.id
-            
-            # Process sections and lessons
-            course_data = _process_course_data(course_data)
-            courses.append(course_data)
-        
-        return courses
+        return fetch_with_fallback(f'courses:all:{status}', load)
     except Exception as e:
         print(f"Error fetching all courses: {e}")
         return []
@@ -56,23 +60,13 @@ def get_courses_by_category(category, status='published'):
     Returns:
         List of course dictionaries matching the category
     """
+    def load():
+        courses = get_storage().list_courses(status=status, category=category)
+        # Process sections and lessons
+        return [_process_course_data(course) for course in courses]
+
     try:
-        db = get_db()
-        courses_ref = db.collection('courses')\
-            .where('category', '==', category)\
-            .where('status', '==', status)
-        
-        courses = []
-        
-        for doc in courses_ref.stream():
-            course_data = doc.to_dict()
-            course_data['id'] = doc.id
-            
-            # Process sections and lessons
-            course_data = _process_course_data(course_data)
-            courses.append(course_data)
-        
-        return courses
+        return fetch_with_fallback(f'courses:category:{category}:{status}', load)
     except Exception as e:
         print(f"Error fetching courses by category '{category}': {e}")
         return []
@@ -86,30 +80,89 @@ def get_course_by_id(course_id):
         course_id: The document ID of the course
     
     Returns:
-        Course dictionary or None if not found
+        Course dictionary or None if not found or the ID is invalid
     """
-    try:
-        db = get_db()
-        doc = db.collection('courses').document(course_id).get()
-        
-        if doc.exists:
-            course_data = doc.to_dict()
-            course_data['id'] = doc.id
-            course_data = _process_course_data(course_data)
-            return course_data
-        
+    if not is_valid_document_id(course_id):
         return None
+
+    def load():
+        course_data = get_storage().get_course(course_id)
+        return _process_course_data(course_data) if course_data else None
+
+    try:
+        return fetch_with_fallback(f'course:{course_id}', load)
     except Exception as e:
         print(f"Error fetching course by ID '{course_id}': {e}")
         return None
 
 
+def get_courses_by_ids(course_ids, fields=None, status='published'):
+    """
+    Fetch several courses at once, in the order requested.
+
+    Cached courses are served from course_cache; the rest are read in one
+    batched storage call (Firestore get_all), restricted to `fields` when
+    given.
+
+    Args:
+        course_ids: Document IDs; duplicates are returned once
+        fields: Field paths to return (all when None); without a projection
+            the courses are processed as by get_course_by_id
+        status: Only courses with this status are returned
+
+    Returns:
+        List of course dictionaries, skipping IDs that are invalid, do not
+        exist or have another status
+    """
+    course_ids = list(dict.fromkeys(course_ids))
+    fields = sorted(set(fields)) if fields is not None else None
+    # Status is needed for the filter even when it was not asked for
+    read_fields = sorted(set(fields) | {'status'}) if fields is not None else None
+    fields_key = ','.join(fields) if fields is not None else '*'
+
+    found = {}
+    misses = []
+    for course_id in filter(is_valid_document_id, course_ids):
+        course = course_cache.get(f'{course_id}|{fields_key}')
+        if course is None:
+            misses.append(course_id)
+        else:
+            found[course_id] = course
+
+    # Client-supplied ID lists are read outside the breaker and the last-known-good
+    # store (one entry per ID combination would evict the real fallbacks); while
+    # the circuit is open only cached courses are served
+    if misses and breaker.state != breaker.OPEN:
+        try:
+            fetched = get_storage().get_courses(misses, fields=read_fields)
+        except Exception as e:
+            print(f"Error fetching courses by IDs: {e}")
+            fetched = {}
+        for course_id, course in fetched.items():
+            if course.get('status') != status:
+                continue
+            if fields is None:
+                course = _process_course_data(course)
+            elif 'status' not in fields:
+                course = {k: v for k, v in course.items() if k != 'status'}
+            course_cache.set(f'{course_id}|{fields_key}', course)
+            found[course_id] = course
+
+    return [found[course_id] for course_id in course_ids if course_id in found]
+
+
+def handle_catalog_change(kind, doc_id, doc):
+    """Catalog listener dropping cached copies of changed or removed courses."""
+    if kind == 'course':
+        course_cache.delete_prefix(f'{doc_id}|')
+
+
 def _process_course_data(course_data):
     """
     Process course data to ensure consistent structure and calculate derived values.
     
     Args:
-        course_data: Raw course dictionary from Firestore
+        course_data: Raw course dictionary from storage
     
     Returns:
         Processed course dictionary
@@ -212,6 +265,40 @@ def get_course_stats(course_data):
     }
 
 
+CATEGORY_INFO = {
+    category: {field: program[field] for field in ('name', 'url', 'icon', 'color')}
+    for category, program in PROGRAMS.items()
+}
+
+DEFAULT_CATEGORY_INFO = {
+    'name': 'Courses',
+    'url': '/courses',
+    'icon': '📚',
+    'color': '#0e415b'
+}
+
+
+def get_category_info(category):
+    """Breadcrumb and styling info for a course category."""
+    return CATEGORY_INFO.get(category, DEFAULT_CATEGORY_INFO)
+
+
+def add_display_fields(course):
+    """
+    Attach formatted stats and prices used by course cards and detail pages.
+    
+    Args:
+        course: Processed course dictionary (modified in place)
+    
+    Returns:
+        The same course dictionary
+    """
+    course['stats'] = get_course_stats(course)
+    course['formatted_actual_price'] = format_price(course.get('actual_price', 0))
+    course['formatted_discounted_price'] = format_price(course.get('discounted_price', 0))
+    return course
+
+
 def format_price(price):
     """
     Format price for display in USD.
@@ -0,0 +1,547 @@
+"""
+Build-time critical CSS: inline the above-the-fold subset, load the rest async.
+
+`flask critical-css` renders each page route through the test client (use
+STORAGE_BACKEND=memory with STORAGE_FIXTURES for sample data), takes the
+elements above the fold (everything before <main>, i.e. the page loader and
+header, plus the first <section> of the page), and keeps the rules of the
+page's head stylesheets whose selectors match one of those elements, along
+with the @media blocks, @font-face rules and @keyframes they need. The
+result is written to build/critical-css.json with a per-route report.
+
+At request time HTML responses of those endpoints get the subset inlined as
+a <style> in the head and their stylesheet links turned into
+rel=preload links that switch to stylesheets on load (with a <noscript>
+fallback), so first paint no longer waits for ~20 blocking sheets.
+
+Usage in app.py:
+    from critical_css import critical_css, register_critical_css_command
+
+    app.after_request(critical_css.inline)
+    register_critical_css_command(app)
+
+    flask --app app critical-css [--build-dir build] [--sections 1]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from html import escape
+from html.parser import HTMLParser
+
+
+CRITICAL_CSS_PATH = os.getenv('CRITICAL_CSS_PATH', os.path.join('build', 'critical-css.json'))
+
+# Page routes measured by the build; one blog post and one course are added
+# from the catalog when it has any
+CRITICAL_ROUTES = [
+    '/', '/about', '/courses', '/team', '/contact', '/blog',
+    '/programs/doctalks', '/programs/denttalks', '/programs/nursetalks', '/programs/pharmatalks',
+    '/products/dr-meddy', '/products/mr-brown', '/products/oet-agents', '/products/coursebooks',
+    '/partnerships', '/partnership-application',
+]
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+             'param', 'source', 'track', 'wbr'}
+
+# Pseudo-classes that only apply after user interaction
+INTERACTIVE_PSEUDOS = {'hover', 'focus', 'active', 'visited', 'focus-visible', 'focus-within', 'target'}
+
+STYLESHEET_RE = re.compile(r'<link\b[^>]*\brel=["\']stylesheet["\'][^>]*>', re.I)
+HREF_RE = re.compile(r'\bhref=["\']([^"\']+)["\']', re.I)
+COMPOUND_PART_RE = re.compile(
+    r'(\*|[a-zA-Z][\w-]*)|#([\w-]+)|\.([\w-]+)|\[([\w-]+)[^\]]*\]|(::?)([\w-]+)(\((?:[^()]|\([^()]*\))*\))?'
+)
+KEYFRAMES_NAME_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)', re.I)
+DECLARATION_COLON_RE = re.compile(r'\s*:\s*')
+
+
+class _Element:
+    __slots__ = ('tag', 'id', 'classes', 'attrs', 'parent')
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        attrs = dict(attrs)
+        self.id = attrs.get('id')
+        self.classes = set((attrs.get('class') or '').split())
+        self.attrs = set(attrs)
+        self.parent = parent
+
+
+class AboveFoldParser(HTMLParser):
+    """
+    Collect the elements rendered before the fold.
+
+    Args:
+        sections: <section>s inside <main> treated as above the fold
+    """
+
+    def __init__(self, sections=1):
+        super().__init__(convert_charrefs=True)
+        self.sections = sections
+        self.elements = []
+        self.stylesheets = []
+        self._stack = []
+        self._main_depth = None
+        self._section_depth = None
+        self._seen_sections = 0
+        self._done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'link' and not self._in_body():
+            values = dict(attrs)
+            if (values.get('rel') or '').lower() == 'stylesheet' and values.get('href'):
+                self.stylesheets.append(values['href'])
+        if self._done:
+            return
+        if tag == 'section' and self._main_depth is not None:
+            if self._section_depth is None:
+                self._section_depth = len(self._stack)
+            if len(self._stack) <= self._section_depth:
+                self._seen_sections += 1
+                if self._seen_sections > self.sections:
+                    self._done = True
+                    return
+        element = _Element(tag, attrs, self._stack[-1] if self._stack else None)
+        self.elements.append(element)
+        if tag == 'main' and self._main_depth is None:
+            self._main_depth = len(self._stack)
+        if tag not in VOID_TAGS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self._stack and self._stack[-1].tag == tag:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        if self._done:
+            return
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                break
+        if tag == 'main' and self._main_depth is not None:
+            self._done = True
+
+    def _in_body(self):
+        return any(element.tag == 'body' for element in self._stack)
+
+
+# ---------------------------------------------------------------------------
+# Selector matching
+# ---------------------------------------------------------------------------
+
+def _split_selector(selector):
+    """[(combinator, compound), ...] from left to right; the first combinator is ''."""
+    parts = []
+    current = []
+    combinator = ''
+    depth = 0
+    for ch in selector.strip():
+        if ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        if depth == 0 and (ch.isspace() or ch in '>+~'):
+            if current:
+                parts.append((combinator, ''.join(current)))
+                current = []
+                combinator = ' '
+            if ch in '>+~':
+                combinator = ch
+            continue
+        current.append(ch)
+    if current:
+        parts.append((combinator, ''.join(current)))
+    return parts
+
+
+def _parse_compound(compound):
+    """
+    Returns:
+        (tag, id, classes, attrs) with None for 'matches anything', or False
+        when the compound needs user interaction to match
+    """
+    tag = element_id = None
+    classes = set()
+    attrs = set()
+    pos = 0
+    for m in COMPOUND_PART_RE.finditer(compound):
+        if m.start() != pos:
+            # Syntax we do not model: match conservatively
+            return None, None, set(), set()
+        pos = m.end()
+        name, id_, cls, attr, colons, pseudo, _ = m.groups()
+        if name:
+            tag = None if name == '*' else name.lower()
+        elif id_:
+            element_id = id_
+        elif cls:
+            classes.add(cls)
+        elif attr:
+            attrs.add(attr.lower())
+        elif colons == ':' and pseudo.lower() in INTERACTIVE_PSEUDOS:
+            return False
+        elif colons == ':' and pseudo.lower() == 'root':
+            tag = 'html'
+        # Other pseudo-classes and pseudo-elements: matched as their element
+    if pos != len(compound):
+        return None, None, set(), set()
+    return tag, element_id, classes, attrs
+
+
+def _matches(element, compound):
+    tag, element_id, classes, attrs = compound
+    return ((tag is None or element.tag == tag)
+            and (element_id is None or element.id == element_id)
+            and classes <= element.classes
+            and attrs <= element.attrs)
+
+
+class ElementIndex:
+    """Above-the-fold elements indexed by id, class and tag."""
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.by_id = {}
+        self.by_class = {}
+        self.by_tag = {}
+        for element in elements:
+            if element.id:
+                self.by_id.setdefault(element.id, []).append(element)
+            for cls in element.classes:
+                self.by_class.setdefault(cls, []).append(element)
+            self.by_tag.setdefault(element.tag, []).append(element)
+
+    def _candidates(self, compound):
+        tag, element_id, classes, _ = compound
+        if element_id is not None:
+            return self.by_id.get(element_id, [])
+        if classes:
+            return min((self.by_class.get(c, []) for c in classes), key=len)
+        if tag is not None:
+            return self.by_tag.get(tag, [])
+        return self.elements
+
+    def matches(self, selector):
+        parts = _split_selector(selector)
+        if not parts:
+            return False
+        compounds = []
+        for combinator, text in parts:
+            compound = _parse_compound(text)
+            if compound is False:
+                return False
+            compounds.append((combinator, compound))
+
+        _, key = compounds[-1]
+        # Ancestor compounds, nearest first; sibling combinators are not
+        # modeled, so the compounds before them are skipped
+        ancestors = []
+        for i in range(len(compounds) - 1, 0, -1):
+            if compounds[i][0] in '+~':
+                break
+            ancestors.append(compounds[i - 1][1])
+
+        for element in self._candidates(key):
+            if not _matches(element, key):
+                continue
+            node = element.parent
+            for compound in ancestors:
+                while node is not None and not _matches(node, compound):
+                    node = node.parent
+                if node is None:
+                    break
+                node = node.parent
+            else:
+                return True
+        return False
+
+
+# ---------------------------------------------------------------------------
+# CSS parsing
+# ---------------------------------------------------------------------------
+
+def _strip_comments(css):
+    return re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+
+
+def _block_end(css, start):
+    """Index of the '}' closing the block whose '{' is at start."""
+    depth = 0
+    quote = None
+    for i in range(start, len(css)):
+        ch = css[i]
+        if quote:
+            if ch == quote and css[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css) - 1
+
+
+def parse_css(css):
+    """
+    Parse a stylesheet into a list of nodes:
+        ('rule', selectors, body)
+        ('group', prelude, children)  - @media / @supports
+        ('at', prelude, text)         - @font-face, @keyframes, @import, ...
+    """
+    nodes = []
+    pos = 0
+    while pos < len(css):
+        brace = css.find('{', pos)
+        semi = css.find(';', pos)
+        prelude_end = brace if brace != -1 else len(css)
+        prelude = css[pos:prelude_end].strip()
+        if prelude.startswith('@') and semi != -1 and (brace == -1 or semi < brace):
+            nodes.append(('at', css[pos:semi].strip(), css[pos:semi + 1].strip()))
+            pos = semi + 1
+            continue
+        if brace == -1:
+            break
+        end = _block_end(css, brace)
+        body = css[brace + 1:end]
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            nodes.append(('group', prelude, parse_css(body)))
+        elif prelude.startswith('@'):
+            nodes.append(('at', prelude, css[pos:end + 1].strip()))
+        elif prelude:
+            nodes.append(('rule', [s.strip() for s in prelude.split(',') if s.strip()], body.strip()))
+        pos = end + 1
+    return nodes
+
+
+def _minify(css):
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def extract_critical(nodes, index):
+    """
+    Returns:
+        Critical CSS text for the given parsed nodes
+    """
+    kept = []
+
+    def select(nodes):
+        out = []
+        for kind, head, body in nodes:
+            if kind == 'rule':
+                selectors = [s for s in head if index.matches(s)]
+                if selectors:
+                    body = DECLARATION_COLON_RE.sub(':', body)
+                    out.append(f"{','.join(selectors)}{{{body}}}")
+            elif kind == 'group':
+                inner = select(body)
+                if inner:
+                    out.append(f"{head}{{{''.join(inner)}}}")
+            elif head.lower().startswith(('@font-face', '@import', '@charset')):
+                out.append(body)
+            elif KEYFRAMES_NAME_RE.match(head):
+                kept.append((KEYFRAMES_NAME_RE.match(head).group(1), body))
+        return out
+
+    css = ''.join(select(nodes))
+    # Only the animations the kept rules use
+    keyframes = ''.join(body for name, body in kept if re.search(rf'(?<![\w-]){re.escape(name)}(?![\w-])', css))
+    return _minify(css + keyframes)
+
+
+# ---------------------------------------------------------------------------
+# Build and request-time inlining
+# ---------------------------------------------------------------------------
+
+def _static_path(app, href):
+    """Filesystem path of a /static/ href, or None for other URLs."""
+    path = href.split('?', 1)[0].split('#', 1)[0]
+    prefix = app.static_url_path.rstrip('/') + '/'
+    if not path.startswith(prefix):
+        return None
+    full = os.path.normpath(os.path.join(app.static_folder, path[len(prefix):]))
+    return full if full.startswith(os.path.normpath(app.static_folder)) else None
+
+
+def _routes():
+    routes = list(CRITICAL_ROUTES)
+    try:
+        from catalog import catalog
+
+        catalog.ensure_fresh()
+        for doc_id, post in sorted(catalog.blogs.items())[:1]:
+            routes.append(f"/blog/{post.get('slug') or doc_id}")
+        for doc_id in sorted(catalog.courses)[:1]:
+            routes.append(f'/course/{doc_id}')
+    except Exception as e:
+        print(f"Skipping content pages for critical CSS: {e}")
+    return routes
+
+
+class CriticalCSS:
+    """
+    Per-endpoint critical CSS manifest.
+
+    Args:
+        path: JSON manifest written by build()
+    """
+
+    def __init__(self, path=CRITICAL_CSS_PATH):
+        self.path = path
+        self.pages = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                self.pages = json.load(fh).get('pages', {})
+        except FileNotFoundError:
+            self.pages = {}
+        except Exception as e:
+            print(f"Error loading critical CSS manifest: {e}")
+            self.pages = {}
+        return self.pages
+
+    def fingerprint(self):
+        """Digest of the loaded manifest (part of frozen pages' inputs)."""
+        raw = json.dumps(self.pages, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(raw).hexdigest()[:16]
+
+    def build(self, app, sections=1):
+        """
+        Render every route and compute its critical CSS.
+
+        Returns:
+            {route: report} with blocking/critical byte counts
+        """
+        client = app.test_client()
+        sheet_cache = {}
+        pages = {}
+        report = {}
+        # Measure the pages as they are without inlining
+        previous, self.pages = self.pages, {}
+        try:
+            for route in _routes():
+                endpoint = app.url_map.bind('localhost').match(route)[0]
+                response = client.get(route)
+                if response.status_code != 200:
+                    print(f"Skipping {route}: status {response.status_code}")
+                    continue
+                parser = AboveFoldParser(sections)
+                parser.feed(response.get_data(as_text=True))
+                index = ElementIndex(parser.elements)
+
+                critical = []
+                sheets = []
+                blocking = blocking_gz = 0
+                for href in parser.stylesheets:
+                    path = _static_path(app, href)
+                    if not path or not os.path.exists(path):
+                        continue
+                    if path not in sheet_cache:
+                        with open(path, 'r', encoding='utf-8') as fh:
+                            text = fh.read()
+                        sheet_cache[path] = (parse_css(_strip_comments(text)), len(text.encode('utf-8')),
+                                             len(gzip.compress(text.encode('utf-8'))))
+                    nodes, size, size_gz = sheet_cache[path]
+                    critical.append(extract_critical(nodes, index))
+                    sheets.append(href)
+                    blocking += size
+                    blocking_gz += size_gz
+
+                css = ''.join(critical)
+                css_bytes = css.encode('utf-8')
+                page = {
+                    'route': route,
+                    'css': css,
+                    'sheets': sheets,
+                    'blocking_bytes': blocking,
+                    'critical_bytes': len(css_bytes),
+                    'blocking_gzip_bytes': blocking_gz,
+                    'critical_gzip_bytes': len(gzip.compress(css_bytes)),
+                }
+                # Routes sharing an endpoint (blog posts, courses) share one subset
+                pages.setdefault(endpoint, page)
+                report[route] = {k: v for k, v in page.items() if k not in ('css', 'route')}
+        finally:
+            self.pages = previous
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump({
+                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'sections': sections,
+                'pages': pages,
+            }, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.pages = pages
+        return report
+
+    def inline(self, response):
+        """after_request hook inlining the endpoint's critical CSS."""
+        from flask import request
+
+        page = self.pages.get(request.endpoint) if self.pages else None
+        if (page is None or not page['css'] or response.status_code != 200 or response.mimetype != 'text/html'
+                or response.is_streamed or response.direct_passthrough):
+            return response
+
+        html = response.get_data(as_text=True)
+        head_end = html.find('</head>')
+        if head_end == -1:
+            return response
+        sheets = set(page['sheets'])
+        inserted = []
+
+        def defer(m):
+            href = HREF_RE.search(m.group(0))
+            if not href or href.group(1) not in sheets:
+                return m.group(0)
+            url = escape(href.group(1))
+            link = (f'<link rel="preload" href="{url}" as="style" '
+                    f'onload="this.onload=null;this.rel=\'stylesheet\'">'
+                    f'<noscript><link rel="stylesheet" href="{url}"></noscript>')
+            if not inserted:
+                inserted.append(True)
+                link = f'<style data-critical>{page["css"]}</style>' + link
+            return link
+
+        head = STYLESHEET_RE.sub(defer, html[:head_end])
+        if inserted:
+            response.set_data(head + html[head_end:])
+        return response
+
+
+critical_css = CriticalCSS()
+
+
+def register_critical_css_command(app):
+    """Attach `flask critical-css` to the app's CLI."""
+    import click
+
+    @app.cli.command('critical-css')
+    @click.option('--build-dir', default=None, help='Output directory (default: that of CRITICAL_CSS_PATH).')
+    @click.option('--sections', default=1, show_default=True, help='<section>s of <main> above the fold.')
+    def critical_css_command(build_dir, sections):
+        """Compute per-page critical CSS and report the bytes saved."""
+        if build_dir:
+            critical_css.path = os.path.join(build_dir, os.path.basename(critical_css.path))
+        report = critical_css.build(app, sections=sections)
+        click.echo(f"{'route':<36} {'blocking':>10} {'critical':>10} {'saved':>10} {'saved gz':>10}")
+        for route, row in report.items():
+            saved = row['blocking_bytes'] - row['critical_bytes']
+            saved_gz = row['blocking_gzip_bytes'] - row['critical_gzip_bytes']
+            click.echo(f"{route:<36} {row['blocking_bytes']:>10} {row['critical_bytes']:>10} "
+                       f"{saved:>10} {saved_gz:>10}")
+        click.echo(f"Wrote {critical_css.path}")
@@ -0,0 +1,240 @@
+"""
+Preload Link headers and 103 Early Hints built from the template asset graph.
+
+Every page template pulls in stylesheets and scripts through base.html and
+its own {% block extra_css %} / {% block extra_js %}, which the browser only
+discovers after parsing the HTML. The asset graph is found by scanning the
+template source: its {% extends %} chain (keeping only the block overrides
+that actually render) and {% include %}s, collecting every
+url_for('static', filename=...) that points at a .css or .js file. The scan
+runs once per template when the app is loaded (in the gunicorn master, with
+preload_app), so requests only format the cached list. Assets whose filename
+is only known at render time (a data-driven layout's stylesheet) are passed
+to the decorator instead.
+
+A decorated view announces its assets before it runs, as a 103 Early Hints
+response when the WSGI server provides a `wsgi.early_hints` callable, so the
+browser downloads them while the view waits on storage. The final response
+also carries the same `Link: <...>; rel=preload` header, which CDNs with
+early-hints support (e.g. Cloudflare) cache and replay as a 103.
+
+Usage in app.py:
+    from early_hints import early_hints, asset_hints
+
+    @app.route('/about')
+    @early_hints('about.html')
+    def about():
+        ...
+
+    early_hints(PROGRAM_TEMPLATE, assets=program_assets(program))(view)
+
+    asset_hints.build(app)
+"""
+
+import os
+from functools import wraps
+
+from flask import current_app, make_response, request, url_for
+from jinja2 import nodes
+
+
+EARLY_HINTS_ENABLED = os.getenv('EARLY_HINTS', '1') == '1'
+
+# Preload destination per file extension, in the order they are announced
+# (render-blocking stylesheets first); anything else is not preloaded
+PRELOAD_TYPES = {
+    '.css': 'style',
+    '.woff2': 'font',
+    '.js': 'script',
+}
+_PRIORITY = {ext: i for i, ext in enumerate(PRELOAD_TYPES)}
+
+
+def _static_asset(call):
+    """(filename, ((kwarg, value), ...)) for url_for('static', filename='...') calls with constant args."""
+    if not (isinstance(call.node, nodes.Name) and call.node.name == 'url_for'):
+        return None
+    if not (call.args and isinstance(call.args[0], nodes.Const) and call.args[0].value == 'static'):
+        return None
+    filename = None
+    params = []
+    for keyword in call.kwargs:
+        if not isinstance(keyword.value, nodes.Const):
+            return None
+        if keyword.key == 'filename':
+            filename = keyword.value.value
+        else:
+            params.append((keyword.key, keyword.value.value))
+    if not filename or os.path.splitext(filename)[1] not in PRELOAD_TYPES:
+        return None
+    return filename, tuple(sorted(params))
+
+
+def _scan(env, name):
+    """
+    Parse one template.
+
+    Returns:
+        (parent template or None, top-level refs, {block name: refs}), where
+        refs are ('asset', spec) and ('include', template) in source order
+    """
+    source, _, _ = env.loader.get_source(env, name)
+    parent = None
+    top = []
+    blocks = {}
+
+    def walk(node, refs):
+        nonlocal parent
+        for child in node.iter_child_nodes():
+            if isinstance(child, nodes.Extends) and isinstance(child.template, nodes.Const):
+                parent = child.template.value
+            elif isinstance(child, nodes.Block):
+                blocks[child.name] = []
+                walk(child, blocks[child.name])
+                continue
+            elif isinstance(child, nodes.Include) and isinstance(child.template, nodes.Const):
+                refs.append(('include', child.template.value))
+            elif isinstance(child, nodes.Call):
+                spec = _static_asset(child)
+                if spec:
+                    refs.append(('asset', spec))
+            walk(child, refs)
+
+    walk(env.parse(source), top)
+    return parent, top, blocks
+
+
+def template_assets(env, name, seen=None):
+    """
+    Static css/js assets a template renders, in document order.
+
+    Returns:
+        List of (filename, url_for kwargs) tuples
+    """
+    seen = set() if seen is None else seen
+    if name in seen:
+        return []
+    seen.add(name)
+
+    chain = []
+    current = name
+    while current and current not in (n for n, _, _ in chain):
+        parent, top, blocks = _scan(env, current)
+        chain.append((current, top, blocks))
+        current = parent
+
+    # The most derived definition of each block is the one that renders; only
+    # the root template's content outside blocks is output
+    effective = {}
+    for _, _, blocks in chain:
+        for block, refs in blocks.items():
+            effective.setdefault(block, refs)
+    refs = list(chain[-1][1])
+    for block_refs in effective.values():
+        refs.extend(block_refs)
+
+    assets = []
+    for kind, value in refs:
+        found = template_assets(env, value, seen) if kind == 'include' else [value]
+        assets.extend(a for a in found if a not in assets)
+    return assets
+
+
+class AssetHints:
+    """
+    Per-template preload lists.
+
+    Templates are registered by the early_hints() decorator; build() scans
+    them all up front, any other template is scanned on first use.
+    """
+
+    def __init__(self):
+        self.templates = set()
+        self._assets = {}
+        self._links = {}
+
+    def build(self, app):
+        """Scan every registered template; returns {template: [filename, ...]}."""
+        for name in sorted(self.templates):
+            try:
+                self._assets[name] = template_assets(app.jinja_env, name)
+            except Exception as e:
+                print(f"Error scanning assets of '{name}': {e}")
+                self._assets[name] = []
+        return {name: [filename for filename, _ in assets] for name, assets in self._assets.items()}
+
+    def links(self, name, extra=()):
+        """
+        Link header values for a template (needs an app context).
+
+        Args:
+            name: Template name
+            extra: Static filenames the template renders that the scan cannot see
+        """
+        cache_key = (name, tuple(extra))
+        links = self._links.get(cache_key)
+        if links is None:
+            assets = self._assets.get(name)
+            if assets is None:
+                assets = self._assets[name] = template_assets(current_app.jinja_env, name)
+            assets = list(assets)
+            for filename in extra:
+                asset = (filename, ())
+                if os.path.splitext(filename)[1] in PRELOAD_TYPES and asset not in assets:
+                    assets.append(asset)
+            links = []
+            for filename, params in sorted(assets, key=lambda a: _PRIORITY[os.path.splitext(a[0])[1]]):
+                as_type = PRELOAD_TYPES[os.path.splitext(filename)[1]]
+                link = f"<{url_for('static', filename=filename, **dict(params))}>; rel=preload; as={as_type}"
+                if as_type == 'font':
+                    link += '; crossorigin'
+                links.append(link)
+            self._links[cache_key] = links
+        return links
+
+
+asset_hints = AssetHints()
+
+
+def _send_early_hints(links):
+    send = request.environ.get('wsgi.early_hints')
+    if not callable(send):
+        return
+    try:
+        send([('Link', link) for link in links])
+    except Exception as e:
+        print(f"Error sending early hints: {e}")
+
+
+def early_hints(template, assets=()):
+    """
+    Preload the assets of `template` for this view's GET responses.
+
+    Args:
+        template: Template the view renders
+        assets: Extra static filenames to preload, for ones the template
+            picks at render time
+    """
+    assets = tuple(assets)
+    asset_hints.templates.add(template)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not EARLY_HINTS_ENABLED or request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+            try:
+                links = asset_hints.links(template, assets)
+            except Exception as e:
+                print(f"Error building preload links for '{template}': {e}")
+                return f(*args, **kwargs)
+            # Before the view, so the assets download while it waits on storage
+            _send_early_hints(links)
+            response = make_response(f(*args, **kwargs))
+            if links and response.mimetype == 'text/html' and 'Link' not in response.headers:
+                response.headers['Link'] = ', '.join(links)
+            return response
+
+        return decorated_function
+
+    return decorator
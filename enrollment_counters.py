@@ -0,0 +1,150 @@
+"""
+Sharded enrollment counters rolled up into course documents.
+
+Each enrollment adds one to a randomly chosen shard of its course's counter,
+atomically with the enrollment record, so a launch spike spreads its writes
+over ENROLLMENT_SHARDS documents instead of hammering the course document.
+A background roll-up periodically sums the shards and writes the total into
+the course's `enrolled_count`, which the course pages display; the shown
+count is eventually consistent, lagging by at most a few roll-up intervals.
+
+Each roll-up pass reads at most `batch_size` counters: courses enrolled into
+by this process since the last pass first, then a rotating slice of all
+known courses so enrollments taken by other (or since restarted) workers
+are picked up too. Every worker runs a roll-up, so a total is compared with
+the `enrolled_count` already stored and only written when it differs: a
+deploy's fresh workers, or several workers covering one course, do not
+rewrite unchanged counts (and purge the pages showing them).
+
+Usage in app.py:
+    from enrollment_counters import record_enrollment, enrollment_rollup
+
+    record_enrollment(storage, enrollment_data, course_id)
+    enrollment_rollup.start(lambda: storage, course_ids)
+"""
+
+import os
+import random
+import threading
+
+
+ENROLLMENT_SHARDS = int(os.getenv('ENROLLMENT_SHARDS', '10'))
+
+
+def record_enrollment(storage, data, course_id, doc_id=None, num_shards=ENROLLMENT_SHARDS):
+    """
+    Store an enrollment and count it against its course.
+
+    Args:
+        doc_id: Enrollment document ID; an existing one is neither
+            rewritten nor counted again
+
+    Returns:
+        The enrollment document ID
+    """
+    doc_id = storage.add_enrollment(data, course_id, random.randrange(num_shards), doc_id=doc_id)
+    enrollment_rollup.mark_dirty(course_id)
+    return doc_id
+
+
+class EnrollmentRollup:
+    """
+    Background worker copying shard totals into course documents.
+
+    Args:
+        interval: Seconds between passes (0 disables the thread)
+        batch_size: Maximum counters read per pass
+    """
+
+    def __init__(self, interval=60, batch_size=50):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._dirty = set()
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def mark_dirty(self, course_id):
+        with self._lock:
+            self._dirty.add(course_id)
+
+    def _next_batch(self, all_ids):
+        with self._lock:
+            batch = list(self._dirty)[:self.batch_size]
+            self._dirty.difference_update(batch)
+        # Fill the rest of the pass from a rotating window over every course
+        all_ids = sorted(all_ids)
+        room = self.batch_size - len(batch)
+        if all_ids and room > 0:
+            start = self._cursor % len(all_ids)
+            window = (all_ids[start:] + all_ids[:start])[:room]
+            self._cursor = start + len(window)
+            batch.extend(course_id for course_id in window if course_id not in batch)
+        return batch
+
+    def run_once(self, storage, all_ids=()):
+        """
+        Roll up one batch of counters.
+
+        Returns:
+            {course_id: count} for the courses whose enrolled_count was written
+        """
+        batch = self._next_batch(all_ids)
+        if not batch:
+            return {}
+        try:
+            stored = storage.get_courses(batch, fields=['enrolled_count'])
+        except Exception as e:
+            print(f"Error reading stored enrollment counts: {e}")
+            return {}
+        written = {}
+        for course_id in batch:
+            if course_id not in stored:
+                continue
+            try:
+                count = storage.read_enrollment_count(course_id)
+                # Skip the write (and the cache purge it triggers) when nothing changed
+                if count == stored[course_id].get('enrolled_count', 0):
+                    continue
+                storage.set_enrolled_count(course_id, count)
+                written[course_id] = count
+            except Exception as e:
+                print(f"Error rolling up enrollments for course '{course_id}': {e}")
+        return written
+
+    def start(self, get_storage, get_course_ids):
+        """
+        Start the daemon thread.
+
+        Args:
+            get_storage: Callable returning the current Storage
+            get_course_ids: Callable returning every known course ID
+        """
+        if not self.interval or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                storage = get_storage()
+                if storage is None:
+                    continue
+                try:
+                    course_ids = list(get_course_ids())
+                except Exception as e:
+                    print(f"Error listing courses for enrollment roll-up: {e}")
+                    course_ids = []
+                self.run_once(storage, course_ids)
+
+        self._thread = threading.Thread(target=loop, name='enrollment-rollup', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+enrollment_rollup = EnrollmentRollup(
+    interval=float(os.getenv('ENROLLMENT_ROLLUP_SECONDS', '60')),
+    batch_size=int(os.getenv('ENROLLMENT_ROLLUP_BATCH', '50')),
+)
@@ -0,0 +1,155 @@
+"""
+Streaming CSV / NDJSON export of form submission collections.
+
+Rows are read page by page with a (date, document ID) cursor and written to
+the response as they arrive, so memory use does not grow with the
+collection. Every row carries an opaque cursor token; passing the token of
+the last row received as ?cursor= resumes an interrupted download right
+after that row.
+
+Usage in app.py:
+    from exports import require_export_token, export_rows
+
+    @app.route('/api/export/<collection>.<fmt>')
+    @require_export_token
+    def export_submissions(collection, fmt):
+        ...
+"""
+
+import base64
+import csv
+import hmac
+import io
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import jsonify, request
+
+from json_provider import encode_default
+from storage import SUBMISSION_DATE_FIELDS
+
+
+EXPORT_API_TOKEN = os.getenv('EXPORT_API_TOKEN', '')
+EXPORT_PAGE_SIZE = int(os.getenv('EXPORT_PAGE_SIZE', '500'))
+
+# CSV columns per collection ('id' is always first and 'cursor' last)
+EXPORT_COLUMNS = {
+    'contact_submissions': ['name', 'email', 'phone', 'subject', 'message', 'timestamp', 'status'],
+    'newsletter_subscribers': ['email', 'subscribed_at', 'status', 'source'],
+    'course_enrollments': ['name', 'email', 'phone', 'course', 'course_id', 'program', 'enrolled_at', 'status'],
+    'partnership_applications': [
+        'reference_number', 'submitted_at', 'status', 'first_name', 'last_name', 'email',
+        'country_code', 'phone', 'is_whatsapp', 'job_title', 'linkedin', 'company', 'website',
+        'country', 'org_type', 'student_volume', 'current_english_training', 'partnership_type',
+        'expected_timeline', 'target_segments', 'monthly_volume', 'why_partner', 'additional_info',
+        'agree_to_terms', 'authority_confirmed', 'demo_call', 'ip_address',
+    ],
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Leading characters Excel and Sheets treat as the start of a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def require_export_token(f):
+    """Allow the request only with 'Authorization: Bearer <EXPORT_API_TOKEN>'."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not EXPORT_API_TOKEN:
+            return jsonify({'success': False, 'message': 'Export is not configured'}), 403
+        header = request.headers.get('Authorization', '')
+        token = header[7:] if header.startswith('Bearer ') else ''
+        if not hmac.compare_digest(token.encode('utf-8'), EXPORT_API_TOKEN.encode('utf-8')):
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def encode_cursor(doc, collection):
+    value = doc.get(SUBMISSION_DATE_FIELDS[collection])
+    value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    raw = json.dumps([value, doc['id']], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Returns:
+        (datetime, doc_id) to resume after
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        value, doc_id = json.loads(raw)
+        return datetime.fromisoformat(value), str(doc_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f'Invalid cursor: {e}')
+
+
+def parse_date(value, end=False):
+    """
+    Parse a from/to query parameter (YYYY-MM-DD or ISO 8601) as UTC.
+
+    A bare date used as the end of a range includes that whole day.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def export_rows(storage, collection, start=None, end=None, after=None, page_size=EXPORT_PAGE_SIZE):
+    """Yield submissions in date order, one page in memory at a time."""
+    while True:
+        page = storage.page_submissions(collection, start=start, end=end, after=after, limit=page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+        after = (last[SUBMISSION_DATE_FIELDS[collection]], last['id'])
+
+
+def _cell(value):
+    """CSV cell for a field; text a spreadsheet would run as a formula is quoted with '."""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=encode_default)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(rows, collection):
+    columns = ['id'] + EXPORT_COLUMNS[collection] + ['cursor']
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for doc in rows:
+        writer.writerow([_cell(doc.get(c)) for c in columns[:-1]] + [encode_cursor(doc, collection)])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows, collection):
+    for doc in rows:
+        doc.pop('update_time', None)
+        doc['cursor'] = encode_cursor(doc, collection)
+        yield json.dumps(doc, default=encode_default, ensure_ascii=False) + '\n'
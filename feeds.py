@@ -0,0 +1,202 @@
+"""
+sitemap.xml and RSS/Atom feeds generated from the content catalog.
+
+Sitemaps are produced by generators that walk the catalog lazily, so memory
+stays flat however many URLs there are, and are split into a sitemap index
+once they exceed SITEMAP_MAX_URLS. Feeds only contain the latest posts and
+are rendered once per catalog fingerprint. ETags derive from the catalog
+fingerprint, so every worker agrees on them and output changes only when
+content does.
+
+Usage in app.py:
+    from feeds import iter_urlset, feed_etag
+
+    etag = feed_etag('sitemap', catalog, base_url)
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from content_store import BoundedCache
+
+
+SITEMAP_MAX_URLS = int(os.getenv('SITEMAP_MAX_URLS', '50000'))
+FEED_MAX_ITEMS = int(os.getenv('FEED_MAX_ITEMS', '50'))
+
+SITE_TITLE = 'MedTalks Blog'
+SITE_DESCRIPTION = 'Medical English insights from the MedTalks academic team'
+
+# Routes that render without per-document data: (path, changefreq, priority)
+STATIC_ROUTES = [
+    ('/', 'daily', '1.0'),
+    ('/about', 'monthly', '0.6'),
+    ('/courses', 'weekly', '0.8'),
+    ('/contact', 'yearly', '0.4'),
+    ('/team', 'monthly', '0.5'),
+    ('/blog', 'daily', '0.8'),
+    ('/programs/doctalks', 'weekly', '0.9'),
+    ('/programs/denttalks', 'weekly', '0.9'),
+    ('/programs/nursetalks', 'weekly', '0.9'),
+    ('/programs/pharmatalks', 'weekly', '0.9'),
+    ('/products/dr-meddy', 'monthly', '0.7'),
+    ('/products/mr-brown', 'monthly', '0.7'),
+    ('/products/oet-agents', 'monthly', '0.7'),
+    ('/products/coursebooks', 'monthly', '0.7'),
+    ('/partnerships', 'monthly', '0.6'),
+    ('/partnership-application', 'yearly', '0.4'),
+]
+
+
+def _as_datetime(value):
+    """Coerce Firestore timestamps, datetimes and ISO strings to aware datetimes."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _lastmod(doc):
+    value = _as_datetime(doc.get('update_time')) or _as_datetime(doc.get('createdAt'))
+    return value.strftime('%Y-%m-%d') if value else None
+
+
+def feed_etag(name, catalog, base_url, page=None):
+    """Strong ETag for a generated document, stable across workers."""
+    raw = f'{name}:{page}:{base_url}:{catalog.fingerprint()}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def iter_sitemap_entries(catalog):
+    """Yield (path, lastmod, changefreq, priority) for every public URL."""
+    for path, changefreq, priority in STATIC_ROUTES:
+        yield path, None, changefreq, priority
+    blogs = catalog.blogs
+    for doc_id in sorted(blogs):
+        post = blogs[doc_id]
+        yield f"/blog/{post.get('slug') or doc_id}", _lastmod(post), 'monthly', '0.7'
+    courses = catalog.courses
+    for doc_id in sorted(courses):
+        yield f'/course/{doc_id}', _lastmod(courses[doc_id]), 'weekly', '0.8'
+
+
+def sitemap_url_count(catalog):
+    return len(STATIC_ROUTES) + len(catalog.blogs) + len(catalog.courses)
+
+
+def sitemap_page_count(catalog, max_urls=None):
+    max_urls = max_urls or SITEMAP_MAX_URLS
+    return max(1, -(-sitemap_url_count(catalog) // max_urls))
+
+
+def iter_urlset(catalog, base_url, page=1, max_urls=None):
+    """Stream one <urlset> sitemap page (1-based) as text chunks."""
+    max_urls = max_urls or SITEMAP_MAX_URLS
+    start = (page - 1) * max_urls
+    base_url = base_url.rstrip('/')
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path, lastmod, changefreq, priority in islice(iter_sitemap_entries(catalog), start, start + max_urls):
+        chunk = f'  <url><loc>{escape(base_url + path)}</loc>'
+        if lastmod:
+            chunk += f'<lastmod>{lastmod}</lastmod>'
+        yield chunk + f'<changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>\n'
+    yield '</urlset>\n'
+
+
+def iter_sitemap_index(catalog, base_url, pages):
+    """Stream a <sitemapindex> pointing at /sitemap-<n>.xml pages."""
+    base_url = base_url.rstrip('/')
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for page in range(1, pages + 1):
+        yield f'  <sitemap><loc>{escape(base_url)}/sitemap-{page}.xml</loc></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def latest_posts(catalog, limit=None):
+    """Published posts newest first, capped at FEED_MAX_ITEMS."""
+    epoch = datetime.min.replace(tzinfo=timezone.utc)
+    posts = sorted(
+        catalog.blogs.values(),
+        key=lambda post: _as_datetime(post.get('createdAt')) or epoch,
+        reverse=True,
+    )
+    return posts[:limit or FEED_MAX_ITEMS]
+
+
+def render_rss(posts, base_url):
+    base_url = base_url.rstrip('/')
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>\n',
+        f'<title>{escape(SITE_TITLE)}</title><link>{escape(base_url)}/blog</link>',
+        f'<description>{escape(SITE_DESCRIPTION)}</description>',
+        f'<atom:link href="{escape(base_url)}/feed.xml" rel="self" type="application/rss+xml"/>\n',
+    ]
+    for post in posts:
+        link = f"{base_url}/blog/{post.get('slug') or post['id']}"
+        created = _as_datetime(post.get('createdAt'))
+        parts.append(f"<item><title>{escape(post.get('title') or '')}</title><link>{escape(link)}</link>")
+        parts.append(f'<guid isPermaLink="true">{escape(link)}</guid>')
+        if created:
+            parts.append(f'<pubDate>{format_datetime(created)}</pubDate>')
+        if post.get('category'):
+            parts.append(f"<category>{escape(str(post['category']))}</category>")
+        parts.append(f"<description>{escape(post.get('excerpt') or '')}</description></item>\n")
+    parts.append('</channel></rss>\n')
+    return ''.join(parts)
+
+
+def render_atom(posts, base_url):
+    base_url = base_url.rstrip('/')
+    dates = [d for d in (_as_datetime(p.get('update_time')) or _as_datetime(p.get('createdAt')) for p in posts) if d]
+    updated = max(dates) if dates else datetime.now(timezone.utc)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n',
+        f'<title>{escape(SITE_TITLE)}</title><subtitle>{escape(SITE_DESCRIPTION)}</subtitle>',
+        f'<link href="{escape(base_url)}/atom.xml" rel="self"/><link href="{escape(base_url)}/blog"/>',
+        f'<id>{escape(base_url)}/blog</id><updated>{updated.isoformat()}</updated>\n',
+    ]
+    for post in posts:
+        link = f"{base_url}/blog/{post.get('slug') or post['id']}"
+        created = _as_datetime(post.get('createdAt')) or updated
+        modified = _as_datetime(post.get('update_time')) or created
+        author = post.get('updatedByName') or post.get('createdByName') or 'MedTalks Team'
+        parts.append(f"<entry><title>{escape(post.get('title') or '')}</title>")
+        parts.append(f'<link href="{escape(link)}"/><id>{escape(link)}</id>')
+        parts.append(f'<published>{created.isoformat()}</published><updated>{modified.isoformat()}</updated>')
+        parts.append(f'<author><name>{escape(author)}</name></author>')
+        parts.append(f"<summary>{escape(post.get('excerpt') or '')}</summary></entry>\n")
+    parts.append('</feed>\n')
+    return ''.join(parts)
+
+
+_FEED_RENDERERS = {'rss': render_rss, 'atom': render_atom}
+_feed_cache = BoundedCache(max_entries=16)
+
+
+def get_feed(kind, catalog, base_url):
+    """Return the rendered feed, re-rendering only when the catalog changed."""
+    prefix = f'{kind}|{base_url}|'
+    key = prefix + catalog.fingerprint()
+    cached = _feed_cache.get(key)
+    if cached is not None:
+        return cached
+
+    body = _FEED_RENDERERS[kind](latest_posts(catalog), base_url)
+    # Drop renders for older fingerprints of this feed
+    _feed_cache.delete_prefix(prefix)
+    _feed_cache.set(key, body)
+    return body
@@ -0,0 +1,102 @@
+"""
+Firestore client construction for the storage layer (storage.py).
+
+Credentials come from the FIREBASE_* environment variables. gRPC channel
+keepalive and subchannel-pool options are configurable through FIRESTORE_*
+variables (see channel_options()).
+
+gRPC channels must not cross a fork: create clients inside each worker
+(gunicorn.conf.py does this in post_fork), never in a preloading master.
+"""
+
+import json
+import os
+
+from google.cloud import firestore
+from google.oauth2 import service_account
+
+
+def get_credentials():
+    """Service account credentials built from environment variables."""
+    cred_dict = {
+        "type": "service_account",
+        "project_id": os.getenv('FIREBASE_PROJECT_ID'),
+        "private_key_id": os.getenv('FIREBASE_PRIVATE_KEY_ID'),
+        "private_key": os.getenv('FIREBASE_PRIVATE_KEY').replace('\\n', '\n'),
+        "client_email": os.getenv('FIREBASE_CLIENT_EMAIL'),
+        "client_id": os.getenv('FIREBASE_CLIENT_ID'),
+        "auth_uri": os.getenv('FIREBASE_AUTH_URI'),
+        "token_uri": os.getenv('FIREBASE_TOKEN_URI'),
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+        "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('FIREBASE_CLIENT_EMAIL')}"
+    }
+    return service_account.Credentials.from_service_account_info(cred_dict)
+
+
+def channel_options():
+    """
+    gRPC channel options for the Firestore connection.
+
+    Environment:
+        FIRESTORE_KEEPALIVE_TIME_MS: Ping interval on idle connections (default 30000)
+        FIRESTORE_KEEPALIVE_TIMEOUT_MS: Ping ack timeout before reconnecting (default 10000)
+        FIRESTORE_LOCAL_SUBCHANNEL_POOL: 1 to give each client its own subchannel
+            pool instead of the process-global one (default 1)
+        FIRESTORE_CHANNEL_OPTIONS: JSON object of extra raw gRPC options
+    """
+    options = {
+        'grpc.keepalive_time_ms': int(os.getenv('FIRESTORE_KEEPALIVE_TIME_MS', '30000')),
+        'grpc.keepalive_timeout_ms': int(os.getenv('FIRESTORE_KEEPALIVE_TIMEOUT_MS', '10000')),
+        'grpc.keepalive_permit_without_calls': 1,
+        'grpc.http2.max_pings_without_data': 0,
+        'grpc.use_local_subchannel_pool': int(os.getenv('FIRESTORE_LOCAL_SUBCHANNEL_POOL', '1')),
+    }
+    extra = os.getenv('FIRESTORE_CHANNEL_OPTIONS')
+    if extra:
+        try:
+            options.update(json.loads(extra))
+        except ValueError as e:
+            print(f"Ignoring invalid FIRESTORE_CHANNEL_OPTIONS: {e}")
+    return list(options.items())
+
+
+# google-cloud-firestore has no public way to pass gRPC channel options, so
+# TunedClient overrides this private method (written against the version
+# pinned in requirements.txt). When a release renames or reshapes it, the
+# client falls back to the library's default channel instead of failing.
+_PRIVATE_HOOK = '_firestore_api_helper'
+
+
+class _ChannelOptionsMixin:
+    """Builds the GAPIC transport on a channel using channel_options()."""
+
+    def _firestore_api_helper(self, transport, client_class, client_module):
+        try:
+            if self._firestore_api_internal is None and self._emulator_host is None:
+                channel = transport.create_channel(
+                    self._target,
+                    credentials=self._credentials,
+                    options=channel_options(),
+                )
+                self._transport = transport(host=self._target, channel=channel)
+                self._firestore_api_internal = client_class(
+                    transport=self._transport, client_options=self._client_options
+                )
+                client_module._client_info = self._client_info
+        except (AttributeError, TypeError) as e:
+            print(f"Firestore channel options not applied, using the default channel: {e}")
+            self._firestore_api_internal = None
+        return super()._firestore_api_helper(transport, client_class, client_module)
+
+
+class TunedClient(_ChannelOptionsMixin, firestore.Client):
+    pass
+
+
+def create_client():
+    """Synchronous Firestore client, with channel_options() when the library allows it."""
+    client_class = TunedClient
+    if not callable(getattr(firestore.Client, _PRIVATE_HOOK, None)):
+        print(f"firestore.Client has no {_PRIVATE_HOOK}(); using the default channel")
+        client_class = firestore.Client
+    return client_class(credentials=get_credentials(), project=os.getenv('FIREBASE_PROJECT_ID'))
@@ -8,7 +8,7 @@ class TurnstileVerifier:
         self.secret_key = secret_key or os.getenv('TURNSTILE_SECRET_KEY')
         self.verify_url = 'https://challenges.cloudflare.com/turnstile/v0/siteverify'
     
-    def verify_token(self, token, remote_ip=None):
+    def _precheck(self, token):
         if not token:
             return {
                 'success': False,
@@ -21,6 +21,9 @@ class TurnstileVerifier:
                 'error': 'Turnstile secret key not configured'
             }
         
+        return None
+    
+    def _build_payload(self, token, remote_ip):
         payload = {
             'secret': self.secret_key,
             'response': token
@@ -29,6 +32,26 @@ class TurnstileVerifier:
         if remote_ip:
             payload['remoteip'] = remote_ip
         
+        return payload
+    
+    @staticmethod
+    def _parse_result(result):
+        return {
+            'success': result.get('success', False),
+            'challenge_ts': result.get('challenge_ts'),
+            'hostname': result.get('hostname'),
+            'error_codes': result.get('error-codes', []),
+            'action': result.get('action'),
+            'cdata': result.get('cdata')
+        }
+    
+    def verify_token(self, token, remote_ip=None):
+        failure = self._precheck(token)
+        if failure:
+            return failure
+        
+        payload = self._build_payload(token, remote_ip)
+        
         try:
             response = requests.post(
                 self.verify_url,
@@ -36,18 +59,46 @@ class TurnstileVerifier:
                 timeout=10
             )
             
-            result = response.json()
+            return self._parse_result(response.json())
             
+        except requests.exceptions.RequestException as e:
             return {
-                'success': result.get('success', False),
-                'challenge_ts': result.get('challenge_ts'),
-                'hostname': result.get('hostname'),
-                'error_codes': result.get('error-codes', []),
-                'action': result.get('action'),
-                'cdata': result.get('cdata')
+                'success': False,
+                'error': f'Verification request failed: {str(e)}'
             }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Unexpected error: {str(e)}'
+            }
+
+class AsyncTurnstileVerifier(TurnstileVerifier):
+    """Non-blocking verifier for the ASGI app, backed by a shared httpx client."""
+    
+    def __init__(self, client, secret_key=None):
+        super().__init__(secret_key)
+        self.client = client
+    
+    async def verify_token(self, token, remote_ip=None):
+        # Only the ASGI app needs httpx; the Flask app must not depend on it
+        import httpx
+
+        failure = self._precheck(token)
+        if failure:
+            return failure
+        
+        payload = self._build_payload(token, remote_ip)
+        
+        try:
+            response = await self.client.post(
+                self.verify_url,
+                data=payload,
+                timeout=10
+            )
             
-        except requests.exceptions.RequestException as e:
+            return self._parse_result(response.json())
+            
+        except httpx.HTTPError as e:
             return {
                 'success': False,
                 'error': f'Verification request failed: {str(e)}'
@@ -0,0 +1,164 @@
+"""
+{% cache %} template tag: render a block once per key and data version.
+
+    {% cache 'doctalks:courses', 600, courses %} ... {% endcache %}
+    {% cache 'header:' ~ request.endpoint %} ... {% endcache %}
+
+The first argument is the key; an optional second is the TTL in seconds
+(default FRAGMENT_CACHE_TTL, 0 disables expiry), and any further
+arguments are documents or lists of documents whose id and update_time are
+folded into the key, so a block renders once per content version and an
+edit is visible on the next request. Anything else the block depends on
+(request.endpoint for the header's active link, ...) must be part of the key.
+
+Fragments live in a BoundedCache. Hits, misses, render time and the render
+time saved are counted per {% cache %} tag (template:line).
+
+Usage in app.py:
+    from fragment_cache import FragmentCacheExtension, fragment_cache
+
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    fragment_cache.stats()
+
+The Quart app registers the same extension; there caller() is awaited.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from content_store import BoundedCache
+
+
+FRAGMENT_CACHE_ENABLED = os.getenv('FRAGMENT_CACHE', '1') == '1'
+FRAGMENT_CACHE_TTL = float(os.getenv('FRAGMENT_CACHE_TTL', '3600'))
+
+
+def fragment_version(sources):
+    """Digest of the id and update_time of every document in sources."""
+    sha = hashlib.sha1()
+    for source in sources:
+        docs = source if isinstance(source, (list, tuple)) else [source]
+        for doc in docs:
+            if isinstance(doc, dict):
+                sha.update(f"{doc.get('id', '')}@{doc.get('update_time', '')};".encode('utf-8'))
+            else:
+                sha.update(f'{doc!r};'.encode('utf-8'))
+    return sha.hexdigest()[:16]
+
+
+class FragmentCache:
+    """
+    Rendered fragments plus per-tag counters.
+
+    Args:
+        max_entries: Fragments kept across all tags
+        ttl: Default lifetime in seconds
+        enabled: False renders every block on every request
+    """
+
+    def __init__(self, max_entries=2000, ttl=FRAGMENT_CACHE_TTL, enabled=FRAGMENT_CACHE_ENABLED):
+        self.ttl = ttl
+        self.enabled = enabled
+        self.cache = BoundedCache(max_entries=max_entries, ttl=ttl)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _record(self, fragment, hit, seconds=0.0):
+        with self._lock:
+            stats = self._stats.setdefault(fragment, {'hits': 0, 'misses': 0, 'render_seconds': 0.0})
+            if hit:
+                stats['hits'] += 1
+            else:
+                stats['misses'] += 1
+                stats['render_seconds'] += seconds
+
+    def _lookup(self, fragment, key, sources):
+        cache_key = (fragment, str(key), fragment_version(sources))
+        value = self.cache.get(cache_key)
+        if value is not None:
+            self._record(fragment, hit=True)
+        return cache_key, value
+
+    def _store(self, fragment, cache_key, value, ttl, started):
+        self._record(fragment, hit=False, seconds=time.perf_counter() - started)
+        self.cache.set(cache_key, value, ttl=self.ttl if ttl is None else ttl)
+        return value
+
+    def render(self, fragment, key, ttl, sources, caller):
+        if not self.enabled:
+            return Markup(caller())
+        cache_key, value = self._lookup(fragment, key, sources)
+        if value is not None:
+            return value
+        started = time.perf_counter()
+        return self._store(fragment, cache_key, Markup(caller()), ttl, started)
+
+    async def render_async(self, fragment, key, ttl, sources, caller):
+        """render() for async environments (Quart), where caller() is a coroutine."""
+        if not self.enabled:
+            return Markup(await caller())
+        cache_key, value = self._lookup(fragment, key, sources)
+        if value is not None:
+            return value
+        started = time.perf_counter()
+        return self._store(fragment, cache_key, Markup(await caller()), ttl, started)
+
+    def stats(self):
+        """
+        Returns:
+            {fragment: {'hits', 'misses', 'hit_rate', 'avg_render_ms', 'saved_ms'}};
+            saved_ms estimates hits x average render time
+        """
+        with self._lock:
+            snapshot = {name: dict(stats) for name, stats in self._stats.items()}
+        report = {}
+        for name, stats in sorted(snapshot.items()):
+            lookups = stats['hits'] + stats['misses']
+            avg = stats['render_seconds'] / stats['misses'] if stats['misses'] else 0.0
+            report[name] = {
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0.0,
+                'avg_render_ms': round(avg * 1000, 3),
+                'saved_ms': round(stats['hits'] * avg * 1000, 1),
+            }
+        return report
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self._stats.clear()
+
+
+fragment_cache = FragmentCache(max_entries=int(os.getenv('FRAGMENT_CACHE_MAX_ENTRIES', '2000')))
+
+
+class FragmentCacheExtension(Extension):
+    """Jinja extension adding {% cache key[, ttl[, doc, ...]] %}...{% endcache %}."""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = parser.parse_expression()
+        ttl = nodes.Const(None)
+        sources = []
+        if parser.stream.skip_if('comma'):
+            ttl = parser.parse_expression()
+            while parser.stream.skip_if('comma'):
+                sources.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        fragment = nodes.Const(f'{parser.name}:{lineno}')
+        call = self.call_method('_render', [fragment, key, ttl, nodes.List(sources)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, fragment, key, ttl, sources, caller):
+        if self.environment.is_async:
+            return fragment_cache.render_async(fragment, key, ttl, sources, caller)
+        return fragment_cache.render(fragment, key, ttl, sources, caller)
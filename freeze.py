@@ -0,0 +1,196 @@
+"""
+Static pre-render ("freeze") of routes that need no per-request data.
+
+Renders each route through the Flask test client into
+<build_dir>/<route>/index.html and records it in <build_dir>/manifest.json
+together with a digest of its inputs: the template files it extends or
+includes, the env-derived context (unsigned video URLs, Turnstile site key) and, for
+blog posts and courses, the document version. Pages whose inputs digest is
+unchanged are not re-rendered.
+
+Usage:
+    flask --app app freeze [--content] [--build-dir build] [--force]
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from jinja2 import meta
+
+
+MANIFEST_NAME = 'manifest.json'
+
+# (route, template) pairs rendered with env-derived context only
+STATIC_PAGES = [
+    ('/about', 'about.html'),
+    ('/partnerships', 'partnerships.html'),
+    ('/partnership-application', 'partnership-application.html'),
+    ('/contact', 'contact.html'),
+    ('/products/dr-meddy', 'products/dr-meddy.html'),
+    ('/products/mr-brown', 'products/mr-brown.html'),
+    ('/products/oet-agents', 'products/oet-agents.html'),
+    ('/products/coursebooks', 'products/coursebooks.html'),
+]
+
+
+def template_sources(env, name, seen=None):
+    """
+    Return every template name reachable from `name` through
+    {% extends %}, {% include %} and {% import %}, including itself.
+    """
+    seen = set() if seen is None else seen
+    if name in seen:
+        return seen
+    seen.add(name)
+    source, _, _ = env.loader.get_source(env, name)
+    for ref in meta.find_referenced_templates(env.parse(source)):
+        if ref:
+            template_sources(env, ref, seen)
+    return seen
+
+
+def _inputs_digest(env, template, context, version=''):
+    sha = hashlib.sha256()
+    for name in sorted(template_sources(env, template)):
+        source, _, _ = env.loader.get_source(env, name)
+        sha.update(name.encode('utf-8'))
+        sha.update(source.encode('utf-8'))
+    sha.update(json.dumps(context, sort_keys=True).encode('utf-8'))
+    sha.update(version.encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _output_path(route):
+    return os.path.join(route.strip('/'), 'index.html')
+
+
+def _env_context():
+    from video_config import get_video_urls
+
+    # Frozen pages are rendered unsigned (see freeze()), so the digest must not
+    # change with every signing bucket
+    context = dict(get_video_urls(signed=False))
+    context['turnstile_site_key'] = os.getenv('TURNSTILE_SITE_KEY', '')
+    # Frozen pages carry the inlined critical CSS
+    from critical_css import critical_css
+    context['critical_css'] = critical_css.fingerprint()
+    return context
+
+
+def collect_pages(include_content=False):
+    """List (route, template, version) tuples to freeze."""
+    pages = [(route, template, '') for route, template in STATIC_PAGES]
+    if include_content:
+        from catalog import catalog
+
+        catalog.ensure_fresh()
+        for doc_id, post in sorted(catalog.blogs.items()):
+            pages.append((f"/blog/{post.get('slug') or doc_id}", 'blog-post.html', post.get('update_time', '')))
+        for doc_id, course in sorted(catalog.courses.items()):
+            pages.append((f'/course/{doc_id}', 'course-detail.html', course.get('update_time', '')))
+    return pages
+
+
+def freeze(app, build_dir='build', include_content=False, force=False):
+    """
+    Render pages into `build_dir`, skipping those whose inputs are unchanged.
+
+    Returns:
+        Dict with lists of 'rendered', 'unchanged', 'removed' and 'failed' routes
+    """
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as fh:
+            previous = json.load(fh).get('routes', {})
+
+    env = app.jinja_env
+    context = _env_context()
+    client = app.test_client()
+    routes = {}
+    report = {'rendered': [], 'unchanged': [], 'removed': [], 'failed': []}
+
+    # A frozen page is served until the next freeze, longer than any signed
+    # link stays valid, so hero videos are rendered unsigned
+    import video_config
+    sign_hero = video_config.SIGN_HERO_VIDEOS
+    video_config.SIGN_HERO_VIDEOS = False
+    try:
+        for route, template, version in collect_pages(include_content):
+            digest = _inputs_digest(env, template, context, version)
+            rel_path = _output_path(route)
+            out_path = os.path.join(build_dir, rel_path)
+            entry = previous.get(route)
+
+            if not force and entry and entry.get('inputs') == digest and os.path.exists(out_path):
+                routes[route] = entry
+                report['unchanged'].append(route)
+                continue
+
+            response = client.get(route)
+            if response.status_code != 200:
+                print(f"Skipping {route}: status {response.status_code}")
+                report['failed'].append(route)
+                if entry:
+                    # Keep serving the last good render rather than a hole
+                    routes[route] = entry
+                continue
+
+            body = response.get_data()
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            tmp_path = f'{out_path}.tmp'
+            with open(tmp_path, 'wb') as fh:
+                fh.write(body)
+            os.replace(tmp_path, out_path)
+
+            routes[route] = {
+                'file': rel_path.replace(os.sep, '/'),
+                'template': template,
+                'inputs': digest,
+                'sha256': hashlib.sha256(body).hexdigest(),
+                'bytes': len(body),
+                'content': bool(version),
+            }
+            report['rendered'].append(route)
+    finally:
+        video_config.SIGN_HERO_VIDEOS = sign_hero
+
+    # Pages for deleted or unpublished content must not linger in the build
+    for route, entry in previous.items():
+        if route in routes:
+            continue
+        if entry.get('content') and not include_content:
+            # Content pages were not part of this run; leave them alone
+            routes[route] = entry
+        else:
+            stale_path = os.path.join(build_dir, entry['file'])
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+            report['removed'].append(route)
+
+    os.makedirs(build_dir, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as fh:
+        json.dump({
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'routes': routes,
+        }, fh, indent=2, sort_keys=True)
+    return report
+
+
+def register_freeze_command(app):
+    """Attach `flask freeze` to the app's CLI."""
+    import click
+
+    @app.cli.command('freeze')
+    @click.option('--build-dir', default='build', show_default=True, help='Output directory.')
+    @click.option('--content', is_flag=True, help='Also freeze every blog post and course page.')
+    @click.option('--force', is_flag=True, help='Re-render pages even if their inputs are unchanged.')
+    def freeze_command(build_dir, content, force):
+        """Pre-render static routes into HTML files."""
+        report = freeze(app, build_dir=build_dir, include_content=content, force=force)
+        for key in ('rendered', 'unchanged', 'removed', 'failed'):
+            click.echo(f"{key}: {len(report[key])}")
+            for route in report[key] if key != 'unchanged' else []:
+                click.echo(f"  {route}")
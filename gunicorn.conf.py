@@ -0,0 +1,48 @@
+"""
+gunicorn settings for running the Flask app with a preloaded master.
+
+The app module is imported once in the master (preload_app) so templates and
+modules are shared copy-on-write, but the Firestore client is created per
+worker in post_fork: gRPC channels do not survive fork().
+
+Usage:
+    gunicorn app:app
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+# Must be set before the master imports app.py
+os.environ.setdefault('FIRESTORE_DEFER_INIT', '1')
+# Workers share one memory-mapped catalog published by a single worker
+os.environ.setdefault('CATALOG_SNAPSHOT_PATH', os.path.join(tempfile.gettempdir(), 'medtalks_catalog.snap'))
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5050')}")
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Create this worker's storage client and warm it before it accepts requests."""
+    import app
+
+    app.init_worker(warm=os.getenv('FIRESTORE_WARMUP', '1') == '1')
+    server.log.info(f"Worker {worker.pid}: storage ready")
+
+
+def worker_exit(server, worker):
+    import app
+    from fragment_cache import fragment_cache
+
+    for fragment, stats in fragment_cache.stats().items():
+        server.log.info(f"Worker {worker.pid}: fragment {fragment}: hit rate {stats['hit_rate']:.1%}, "
+                        f"{stats['saved_ms']:.0f}ms render time saved")
+
+    if app.storage is not None:
+        try:
+            app.storage.close()
+        except Exception as e:
+            server.log.warning(f"Error closing storage: {e}")
@@ -0,0 +1,186 @@
+"""
+Per-route HTTP caching policy, surrogate keys and CDN purge hook.
+
+Views declare their policy with a decorator; responses get Cache-Control
+and a surrogate key header listing the content they were built from, so
+the CDN can drop exactly the affected pages when content changes.
+
+Usage in app.py:
+    from http_cache import cache_policy, add_surrogate_keys
+
+    @app.route('/blog/<slug>')
+    @cache_policy(max_age=60, s_maxage=600, stale_while_revalidate=3600)
+    def blog_post(slug):
+        ...
+        add_surrogate_keys(f"blog:{post['id']}")
+"""
+
+import json
+import os
+import threading
+from functools import wraps
+
+import requests
+from flask import g, make_response, request
+
+
+SURROGATE_KEY_HEADER = os.getenv('SURROGATE_KEY_HEADER', 'Surrogate-Key')
+
+# Named policies for cache_policy(**POLICY)
+STATIC_PAGE = dict(max_age=300, s_maxage=86400, stale_while_revalidate=86400, stale_if_error=604800)
+CONTENT_PAGE = dict(max_age=60, s_maxage=3600, stale_while_revalidate=3600, stale_if_error=86400)
+LISTING_PAGE = dict(max_age=60, s_maxage=300, stale_while_revalidate=600, stale_if_error=86400)
+FORM_PAGE = dict(private=True)
+
+
+def shared_lifetime(policy):
+    """Longest a shared cache may serve a response under `policy`, in seconds."""
+    if policy.get('private'):
+        return 0
+    fresh = policy.get('s_maxage') or policy.get('max_age') or 0
+    return fresh + (policy.get('stale_while_revalidate') or 0) + (policy.get('stale_if_error') or 0)
+
+
+def add_surrogate_keys(*keys):
+    """Tag the current response with extra surrogate keys."""
+    if 'surrogate_keys' not in g:
+        g.surrogate_keys = []
+    g.surrogate_keys.extend(k for k in keys if k)
+
+
+def mark_uncacheable():
+    """Keep the current response out of shared caches (e.g. error fallbacks)."""
+    g.uncacheable = True
+
+
+def _cache_control(max_age, s_maxage, stale_while_revalidate, stale_if_error, private):
+    if private:
+        return f'private, max-age={max_age}, must-revalidate' if max_age else 'private, no-cache'
+    parts = ['public', f'max-age={max_age}']
+    if s_maxage is not None:
+        parts.append(f's-maxage={s_maxage}')
+    if stale_while_revalidate:
+        parts.append(f'stale-while-revalidate={stale_while_revalidate}')
+    if stale_if_error:
+        parts.append(f'stale-if-error={stale_if_error}')
+    return ', '.join(parts)
+
+
+def cache_policy(max_age=0, s_maxage=None, stale_while_revalidate=None,
+                 stale_if_error=None, private=False, keys=()):
+    """
+    Declare how a view's successful GET responses may be cached.
+
+    Args:
+        max_age: Browser cache lifetime in seconds
+        s_maxage: Shared (CDN) cache lifetime in seconds
+        stale_while_revalidate: Seconds the CDN may serve stale while refetching
+        stale_if_error: Seconds the CDN may serve stale when we error
+        private: Keep out of shared caches (form pages, per-user output)
+        keys: Static surrogate keys always attached to this route
+    """
+    header = _cache_control(max_age, s_maxage, stale_while_revalidate, stale_if_error, private)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+                return response
+            if 'Cache-Control' in response.headers:
+                return response
+
+            if g.get('uncacheable'):
+                response.headers['Cache-Control'] = 'no-store'
+                return response
+
+            response.headers['Cache-Control'] = header
+            if not private:
+                tags = list(keys) + g.get('surrogate_keys', [])
+                if tags:
+                    response.headers[SURROGATE_KEY_HEADER] = ' '.join(dict.fromkeys(tags))
+            return response
+        return decorated_function
+    return decorator
+
+
+def keys_for_change(kind, doc_id, doc):
+    """Surrogate keys invalidated by a catalog change."""
+    keys = [f'{kind}:{doc_id}', 'sitemap', 'search']
+    if kind == 'blog':
+        keys += ['blogs', 'feed']
+    elif kind == 'course':
+        keys.append('courses')
+    if doc and doc.get('category'):
+        keys.append(f"category:{doc['category']}")
+    return keys
+
+
+class PurgeHook:
+    """
+    Collects invalidated surrogate keys and sends them to a purge endpoint.
+
+    The endpoint receives a JSON POST {"surrogate_keys": [...]}. With no URL
+    configured, purges are only logged.
+    """
+
+    def __init__(self, purge_url=None, token=None, batch_size=256, timeout=5):
+        self.purge_url = purge_url
+        self.token = token
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def handle_catalog_change(self, kind, doc_id, doc):
+        with self._lock:
+            self._pending.update(keys_for_change(kind, doc_id, doc))
+
+    def after_refresh(self, initial):
+        """Catalog refresh hook: purge in the background, but not on first load."""
+        if initial:
+            # A worker's first load reports everything as changed; nothing
+            # the CDN holds is actually stale.
+            with self._lock:
+                self._pending.clear()
+            return
+        threading.Thread(target=self.flush, daemon=True).start()
+
+    def flush(self):
+        """Send all pending keys; keys from failed batches are kept for retry."""
+        with self._lock:
+            keys = sorted(self._pending)
+            self._pending.clear()
+        if not keys:
+            return []
+        if not self.purge_url:
+            print(f"Cache purge (no CACHE_PURGE_URL set): {' '.join(keys)}")
+            return keys
+
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+
+        sent = []
+        for i in range(0, len(keys), self.batch_size):
+            batch = keys[i:i + self.batch_size]
+            try:
+                response = requests.post(
+                    self.purge_url,
+                    data=json.dumps({'surrogate_keys': batch}),
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                sent.extend(batch)
+            except requests.exceptions.RequestException as e:
+                print(f"Error purging surrogate keys: {e}")
+                with self._lock:
+                    self._pending.update(batch)
+        return sent
+
+
+purge_hook = PurgeHook(
+    purge_url=os.getenv('CACHE_PURGE_URL'),
+    token=os.getenv('CACHE_PURGE_TOKEN'),
+)
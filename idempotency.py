@@ -0,0 +1,285 @@
+"""
+Idempotency keys for form POST endpoints.
+
+Clients send an `Idempotency-Key` header (or an `idempotency_key` JSON/form
+field) that stays the same across retries of one submission. The first
+successful response for a key is remembered; a retry with the same key gets
+that response back (same reference number) without Turnstile verification
+or another write.
+
+Keys are claimed in an `idempotency_keys` record (create-if-absent) holding
+a fingerprint of the body and, once the request succeeds, its response, so
+retries that land on another worker or after a restart are answered the
+same way. A per-worker cache answers repeat retries without a read, and
+concurrent retries inside one worker wait for the first to finish. Handlers
+also write with the document ID from idempotent_document_id(), so racing
+retries still produce one submission.
+
+Usage in app.py:
+    from idempotency import idempotent, idempotent_document_id
+
+    idempotency.set_storage(storage)
+
+    @app.route('/api/partnership-application', methods=['POST'])
+    @idempotent
+    @require_turnstile
+    def submit_partnership_application():
+        doc_id = idempotent_document_id()
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import flash, g, jsonify, make_response, request, session
+
+from content_store import BoundedCache
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_FIELD = 'idempotency_key'
+IDEMPOTENCY_COLLECTION = 'idempotency_keys'
+# Seconds a key is remembered
+IDEMPOTENCY_TTL = float(os.getenv('IDEMPOTENCY_TTL', '86400'))
+# Seconds a retry waits for an in-flight request with the same key
+IDEMPOTENCY_WAIT = float(os.getenv('IDEMPOTENCY_WAIT', '10'))
+# Seconds a claim by a request still running (or a crashed worker) holds a key
+IDEMPOTENCY_CLAIM_TTL = float(os.getenv('IDEMPOTENCY_CLAIM_TTL', '60'))
+
+KEY_RE = re.compile(r'^[A-Za-z0-9_.:-]{8,255}$')
+
+# Fields that legitimately differ between retries of the same submission
+VOLATILE_FIELDS = {'cf-turnstile-response', IDEMPOTENCY_FIELD}
+
+# Response headers replayed to retries
+REPLAYED_HEADERS = ('Content-Type', 'Location')
+
+responses = BoundedCache(
+    max_entries=int(os.getenv('IDEMPOTENCY_MAX_KEYS', '10000')),
+    ttl=IDEMPOTENCY_TTL,
+)
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_storage = None
+
+
+def set_storage(storage):
+    """Set the storage backend holding the shared key records (see storage.py)."""
+    global _storage
+    _storage = storage
+
+
+def _client_key():
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key:
+        if request.is_json:
+            body = request.get_json(silent=True)
+            key = body.get(IDEMPOTENCY_FIELD) if isinstance(body, dict) else None
+        else:
+            key = request.form.get(IDEMPOTENCY_FIELD)
+    return key or None
+
+
+def body_fingerprint(body):
+    """Digest of a JSON body or {field: [values]} form without per-attempt fields."""
+    if isinstance(body, dict):
+        body = {k: v for k, v in body.items() if k not in VOLATILE_FIELDS}
+    raw = json.dumps(body, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _fingerprint():
+    if request.is_json:
+        return body_fingerprint(request.get_json(silent=True))
+    return body_fingerprint(dict(request.form.lists()))
+
+
+def key_document_id(key):
+    """Document ID for an '<endpoint>:<client key>' idempotency key."""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def idempotent_document_id():
+    """
+    Document ID derived from the current request's idempotency key, or None
+    when the client sent no key.
+    """
+    key = g.get('idempotency_key')
+    if not key:
+        return None
+    return key_document_id(key)
+
+
+def _expires_at(seconds):
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def claim_key(storage, key, fingerprint):
+    """
+    Claim a key for a request about to run.
+
+    Returns:
+        None if this request now holds the key, otherwise the record of the
+        request that does: finished (its 'response' is set) or still running
+    """
+    doc_id = key_document_id(key)
+    claim = {'fingerprint': fingerprint, 'response': None, 'flashes': [],
+             'expires_at': _expires_at(IDEMPOTENCY_CLAIM_TTL)}
+    created, record = storage.create_document(IDEMPOTENCY_COLLECTION, doc_id, claim)
+    if created:
+        return None
+    expires_at = record.get('expires_at')
+    if not isinstance(expires_at, datetime) or expires_at <= datetime.now(timezone.utc):
+        # Released after a failure, abandoned by a crashed worker, or past its TTL
+        storage.put(IDEMPOTENCY_COLLECTION, doc_id, claim)
+        return None
+    return record
+
+
+def save_key(storage, key, fingerprint, record=None):
+    """
+    Store a finished request's record for replay, or, with no record,
+    release the claim so the key can be retried.
+    """
+    if record is None:
+        record = {'fingerprint': fingerprint, 'response': None, 'flashes': [],
+                  'expires_at': datetime.now(timezone.utc)}
+    else:
+        record = dict(record, expires_at=_expires_at(IDEMPOTENCY_TTL))
+    storage.put(IDEMPOTENCY_COLLECTION, key_document_id(key), record)
+
+
+def _claim(key, fingerprint):
+    if _storage is None:
+        return None
+    try:
+        return claim_key(_storage, key, fingerprint)
+    except Exception as e:
+        # Without the shared record, fall back to this worker's cache
+        print(f"Error claiming idempotency key: {e}")
+        return None
+
+
+def _save(key, fingerprint, record):
+    if _storage is None:
+        return
+    try:
+        save_key(_storage, key, fingerprint, record)
+    except Exception as e:
+        print(f"Error saving idempotency key: {e}")
+
+
+def key_conflict(stored, fingerprint):
+    """
+    Why a request cannot use a key held by `stored`.
+
+    Returns:
+        (status, message), or None when the stored response can be replayed
+    """
+    if stored['fingerprint'] != fingerprint:
+        return 422, 'Idempotency key was already used for a different request'
+    if stored.get('response') is None:
+        return 409, 'A request with this key is in progress'
+    return None
+
+
+def response_record(fingerprint, status, body, headers, flashes):
+    """Record of a successful response, as replayed to retries."""
+    return {
+        'fingerprint': fingerprint,
+        'response': {
+            'status': status,
+            'body': body,
+            'headers': [[name, value] for name, value in headers if name in REPLAYED_HEADERS],
+        },
+        'flashes': [list(flashed) for flashed in flashes],
+    }
+
+
+def _answer(key, stored, fingerprint):
+    """Response to a request whose key is already held by `stored`."""
+    conflict = key_conflict(stored, fingerprint)
+    if conflict:
+        status, message = conflict
+        return jsonify({'success': False, 'message': message}), status
+    responses.set(key, stored)
+    return _replay(stored)
+
+
+def _replay(stored):
+    replayed = stored['response']
+    # Form posts answer with a redirect plus a flashed message
+    for category, message in stored['flashes']:
+        flash(message, category)
+    response = make_response(replayed['body'], replayed['status'])
+    for name, value in replayed['headers']:
+        response.headers[name] = value
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(f):
+    """
+    Deduplicate POSTs carrying an idempotency key.
+
+    Only successful responses are remembered: 4xx/5xx answers and form
+    redirects that flash an 'error' message release the key, so a request
+    that failed validation or Turnstile can be retried with the same key.
+    Reusing a key for a different body is rejected with 422.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.method != 'POST':
+            return f(*args, **kwargs)
+        client_key = _client_key()
+        if not client_key:
+            return f(*args, **kwargs)
+        if not KEY_RE.match(client_key):
+            return jsonify({'success': False, 'message': 'Invalid idempotency key'}), 400
+
+        key = f'{request.endpoint}:{client_key}'
+        fingerprint = _fingerprint()
+
+        while True:
+            stored = responses.get(key)
+            if stored is not None:
+                return _answer(key, stored, fingerprint)
+
+            with _in_flight_lock:
+                event = _in_flight.get(key)
+                if event is None:
+                    event = _in_flight[key] = threading.Event()
+                    break
+            # Another thread is handling this key; wait for its result
+            if not event.wait(IDEMPOTENCY_WAIT):
+                return jsonify({'success': False, 'message': 'A request with this key is in progress'}), 409
+
+        try:
+            g.idempotency_key = key
+            stored = _claim(key, fingerprint)
+            if stored is not None:
+                return _answer(key, stored, fingerprint)
+
+            record = None
+            try:
+                flashed_before = len(session.get('_flashes', []))
+                response = make_response(f(*args, **kwargs))
+                flashes = session.get('_flashes', [])[flashed_before:]
+                failed = response.status_code >= 400 or any(category == 'error' for category, _ in flashes)
+                if not failed and not response.is_streamed:
+                    record = response_record(fingerprint, response.status_code, response.get_data(as_text=True),
+                                             response.headers.items(), flashes)
+                    responses.set(key, record)
+                return response
+            finally:
+                _save(key, fingerprint, record)
+        finally:
+            with _in_flight_lock:
+                _in_flight.pop(key, None)
+            event.set()
+
+    return decorated_function
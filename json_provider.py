@@ -0,0 +1,139 @@
+"""
+Flask JSON provider that understands Firestore values.
+
+Datetimes (including Firestore's DatetimeWithNanoseconds) are written as
+ISO 8601 strings, GeoPoints as {"latitude", "longitude"} and document
+references as their path. When orjson is installed it is used as the fast
+path (set JSON_FAST_PATH=0 to force the stdlib encoder); large payloads can
+be written to the client in chunks instead of being built as one string.
+
+Usage in app.py:
+    from json_provider import FirestoreJSONProvider
+
+    app.json = FirestoreJSONProvider(app)
+    return app.json.stream_response({'posts': posts})
+"""
+
+import json
+import os
+from datetime import date, datetime
+
+from flask import stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from google.cloud.firestore import DocumentReference, GeoPoint
+except ImportError:
+    DocumentReference = GeoPoint = None
+
+
+# Bytes buffered before each write when streaming
+JSON_CHUNK_SIZE = int(os.getenv('JSON_CHUNK_SIZE', '65536'))
+
+
+def encode_default(o):
+    """Encode values json/orjson do not know; raises TypeError otherwise."""
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if GeoPoint is not None and isinstance(o, GeoPoint):
+        return {'latitude': o.latitude, 'longitude': o.longitude}
+    if DocumentReference is not None and isinstance(o, DocumentReference):
+        return o.path
+    return DefaultJSONProvider.default(o)
+
+
+class FirestoreJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with Firestore types and an optional orjson fast path."""
+
+    default = staticmethod(encode_default)
+    # Non-ASCII is valid in UTF-8 JSON and both encoders are faster without escaping
+    ensure_ascii = False
+
+    def __init__(self, app, fast_path=None):
+        super().__init__(app)
+        if fast_path is None:
+            fast_path = os.getenv('JSON_FAST_PATH', '1') == '1'
+        self.fast_path = bool(fast_path and orjson is not None)
+
+    def _orjson_options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # Fall back to the stdlib for json.dumps options orjson does not take
+        if self.fast_path and set(kwargs) <= {'indent', 'separators'}:
+            return orjson.dumps(obj, default=self.default,
+                                option=self._orjson_options(bool(kwargs.get('indent')))).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def _compact(self):
+        return not ((self.compact is None and self._app.debug) or self.compact is False)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if not self.fast_path:
+            return super().response(obj)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options(not self._compact()))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+    def iter_encode(self, obj, chunk_size=JSON_CHUNK_SIZE):
+        """
+        Yield the compact JSON encoding of obj as UTF-8 chunks of about
+        chunk_size bytes.
+
+        Top-level dicts and lists, and the containers directly inside them
+        (e.g. the 'posts' list of {'success': True, 'posts': [...]}), are
+        walked so each item is encoded and sent separately.
+        """
+        buffer = []
+        size = 0
+        for piece in self._iter_pieces(obj, depth=2):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield b''.join(buffer)
+                buffer, size = [], 0
+        buffer.append(b'\n')
+        yield b''.join(buffer)
+
+    def _iter_pieces(self, obj, depth):
+        if depth and isinstance(obj, dict):
+            items = sorted(obj.items()) if self.sort_keys else obj.items()
+            yield b'{'
+            for i, (key, value) in enumerate(items):
+                prefix = b',' if i else b''
+                yield prefix + self._encode(str(key)) + b':'
+                yield from self._iter_pieces(value, depth - 1)
+            yield b'}'
+        elif depth and isinstance(obj, (list, tuple)):
+            yield b'['
+            for i, value in enumerate(obj):
+                if i:
+                    yield b','
+                yield from self._iter_pieces(value, depth - 1)
+            yield b']'
+        else:
+            yield self._encode(obj)
+
+    def _encode(self, obj):
+        if self.fast_path:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options())
+        return json.dumps(obj, default=self.default, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, separators=(',', ':')).encode('utf-8')
+
+    def stream_response(self, obj, status=200):
+        """Response writing obj in chunks rather than as one buffered body."""
+        return self._app.response_class(
+            stream_with_context(self.iter_encode(obj)),
+            status=status,
+            mimetype=self.mimetype
+        )
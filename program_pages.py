@@ -0,0 +1,1188 @@
+"""
+Program landing pages (DocTALKS, DentTALKS, NurseTALKS, PharmaTALKS).
+
+The four programs share one layout, templates/programs/program.html, and
+differ only in the data below: category key, theme (CSS class prefix,
+stylesheet, scripts), copy, reel videos and the factor / earnings figures.
+Jinja compiles the layout once per worker instead of four near-identical
+templates, and a new program is a new PROGRAMS entry plus its stylesheet.
+
+Each entry's name, url, icon and color also feed the course breadcrumbs
+(courses.CATEGORY_INFO).
+
+Usage in app.py:
+    from program_pages import PROGRAMS, PROGRAM_TEMPLATE, program_assets
+
+    for category, program in PROGRAMS.items():
+        app.add_url_rule(program['url'], endpoint=category, defaults={'category': category},
+                         view_func=early_hints(PROGRAM_TEMPLATE, assets=program_assets(program))(program_page))
+
+    render_template(PROGRAM_TEMPLATE, program=PROGRAMS[category], courses=..., blog_posts=...)
+"""
+
+import math
+
+from markupsafe import Markup
+
+
+PROGRAM_TEMPLATE = 'programs/program.html'
+IMAGES_URL = 'https://storage.googleapis.com/admin-dashboard-d5f22.firebasestorage.app/website/images/'
+
+# Stroke and tint of the three factor cards / donut segments, by position
+FACTOR_COLORS = [
+    ('#3b82f6', 'rgba(59,130,246,0.1)'),
+    ('#22c55e', 'rgba(34,197,94,0.1)'),
+    ('#f59e0b', 'rgba(245,158,11,0.1)'),
+]
+DONUT_RADIUS = 80
+
+
+def _image(path):
+    return IMAGES_URL + path
+
+
+PROGRAMS = {
+    'doctalks': {
+        'name': 'DocTALKS',
+        'url': '/programs/doctalks',
+        'icon': '🩺',
+        'color': '#0e415b',
+        'prefix': 'doc',
+        'primary_var': '--doc-primary',
+        'stylesheet': 'css/doctalks.css',
+        'scripts': ['js/doctalks.js', 'js/reel-video.js'],
+        'field': 'medical',
+        'role': 'Doctor',
+        'workplace': 'hospital',
+        'article_category': 'Medical',
+        'hero': {
+            'audience': 'For Doctors & Medical Students',
+            'subtitle': 'The Global Medical Speaking Program',
+            'description': (
+                'Clinical communication designed for doctors who need clear, confident patient '
+                'interactions — for international careers, health tourism, and professional '
+                'speaking.'
+            ),
+        },
+        'reels': [
+            {
+                'video': 'videos/Sample2.mp4',
+                'likes': '3.1K',
+                'comments': '215',
+                'caption': (
+                    'Clinical communication made easy! 💬 Join thousands of medical professionals 🌍 '
+                    '#DoctorLife'
+                ),
+            },
+            {
+                'video': 'videos/Sample3.mp4',
+                'likes': '2.7K',
+                'comments': '198',
+                'caption': (
+                    'Transform your medical English skills! 📚 Expert-led training for healthcare '
+                    'professionals 👨\u200d⚕️ #HealthcareEducation'
+                ),
+            },
+            {
+                'video': 'videos/Sample1.mp4',
+                'likes': '1.8K',
+                'comments': '124',
+                'caption': 'Master medical terminology with confidence! 🎯 #MedicalEnglish #Healthcare',
+            },
+            {
+                'video': 'videos/medtalkintro.mp4',
+                'likes': '2.4K',
+                'comments': '186',
+                'caption': (
+                    'Welcome to MedTalk 🩺 Your journey to medical English starts here! ✨ #MedTalk '
+                    '#DocTalks'
+                ),
+            },
+        ],
+        'intro': {
+            'wrapper_class': 'stethoscope-wrapper',
+            'image_class': 'stethoscope-image',
+            'badge': Markup('CLINICAL<br>ENGLISH'),
+            'heading': 'Your Medical Knowledge Is World-Class.',
+            'subheading': 'Your English Should Be Consultation-Ready.',
+            'description': (
+                'Modern medicine is global. International patients, cross-border referrals, medical '
+                'conferences, and overseas clinical careers demand clear, confident, '
+                'patient-centered English.'
+            ),
+            'checks': [
+                Markup('<strong>Speaking-First System:</strong> Built for clinical communication.'),
+                Markup('<strong>Clinical Focus:</strong> Patient history, case presentations & handovers.'),
+            ],
+        },
+        'what_is': {
+            'description': (
+                'DocTALKS is a consultation-focused medical speaking program designed for doctors '
+                'and medical students who need to:'
+            ),
+            'features': [
+                {
+                    'title': 'History Taking & Diagnosis',
+                    'text': 'Take patient histories effectively and explain diagnoses clearly in English.',
+                },
+                {
+                    'title': 'Global Communication',
+                    'text': (
+                        'Communicate confidently with international colleagues, patients, and at '
+                        'conferences.'
+                    ),
+                },
+            ],
+            'footer': Markup(
+                'The program focuses on real consultations, handovers, and case presentations — not '
+                'memorizing vocabulary lists.<br><strong>DocTALKS trains how doctors actually speak '
+                'in real clinical settings.</strong>'
+            ),
+            'image': _image('doctalk/doctalks-image-3.png'),
+            'scenarios': 'Real Clinical Scenarios',
+        },
+        'focus': [
+            {
+                'image': _image('doctalk/doctalks-image-2.png'),
+                'title': 'Patient History & Consultation',
+                'text': (
+                    'Learn to take comprehensive patient histories, ask the right questions, and '
+                    'conduct consultations confidently in English.'
+                ),
+            },
+            {
+                'image': _image('doctalk/doctalks-image-3.png'),
+                'title': 'Case Presentations & Handovers',
+                'text': (
+                    'Master structured case presentations and clinical handovers using '
+                    'internationally recognized frameworks like SBAR.'
+                ),
+            },
+            {
+                'image': _image('doctalk/doctalks-image-5.png'),
+                'title': 'Breaking Bad News',
+                'text': (
+                    'Develop the language and empathy skills needed to deliver difficult diagnoses '
+                    'with sensitivity and professionalism.'
+                ),
+            },
+            {
+                'static': 'images/doctalks/teamwork-in-healthcare.png',
+                'title': 'International Medical Careers',
+                'text': (
+                    'Prepare for USMLE interviews, NHS placements, medical conferences, and '
+                    'clinical rotations in English-speaking countries.'
+                ),
+            },
+        ],
+        'structure': {
+            'units': 20,
+            'unit_label': 'Medical-Specific Units',
+            'ai_practice': (
+                'Dr Meddy Ecosystem — medical-specific AI practice designed for clinical scenarios, '
+                'not general chat.'
+            ),
+        },
+        'factors': {
+            'id': 'doc-factors-section',
+            'heading': Markup('Why Patients Choose One Doctor <br>Over Another'),
+            'intro': (
+                'International patients do not decide based on technical expertise alone. '
+                'Communication quality is a decisive factor in patient trust and satisfaction.'
+            ),
+            'cards': [
+                {
+                    'share': 40,
+                    'legend': 'Clarity of Explanation',
+                    'title': 'Clarity of Medical Explanation',
+                    'text': (
+                        'Patients need to understand their condition, treatment options, and what '
+                        'comes next. Clear explanations reduce anxiety and improve compliance.'
+                    ),
+                },
+                {
+                    'share': 35,
+                    'legend': 'Empathy & Trust',
+                    'title': 'Building Empathy & Trust',
+                    'text': (
+                        'International patients often meet their doctor for the first time. The '
+                        'ability to show empathy and establish trust within minutes directly '
+                        'affects outcomes.'
+                    ),
+                },
+                {
+                    'share': 25,
+                    'legend': 'Referral & Cost Comm.',
+                    'title': 'Referral & Cost Communication',
+                    'text': (
+                        'Discussing referrals, treatment costs, and insurance clearly is essential '
+                        'in health tourism and private international practice.'
+                    ),
+                },
+            ],
+        },
+        'earnings': {
+            'id': 'doc-earnings-section',
+            'bars': [('$350K', 95), ('$200K', 60), ('$130K', 40)],
+            'features': [
+                Markup('Patient communication is expected to be <strong>clear and empathetic</strong>'),
+                Markup('Professional interaction happens <strong>in English</strong>'),
+                Markup(
+                    'Trust and explanation are directly linked to <strong>clinical and career '
+                    'outcomes</strong>'
+                ),
+            ],
+            'note': 'Strong clinical skills are essential',
+        },
+        'testimonials': [
+            {
+                'title': 'Confident in Consultations!',
+                'text': (
+                    '"After DocTALKS, I can take patient histories and explain diagnoses without '
+                    'hesitation. The clinical scenarios were exactly what I needed — real, '
+                    'practical, and immediately useful in my hospital."'
+                ),
+                'initial': 'E',
+                'name': 'Dr. Elif Y.',
+                'role': 'Internal Medicine, Istanbul',
+            },
+            {
+                'title': 'Perfect for Clinical Careers!',
+                'text': (
+                    '"The small group size made all the difference. I spoke more English in one '
+                    'week of DocTALKS than in years of traditional courses. My international '
+                    'colleagues notice the improvement — handovers are much smoother now."'
+                ),
+                'initial': 'A',
+                'name': 'Dr. Ahmet K.',
+                'role': 'General Surgery, Ankara',
+            },
+            {
+                'title': 'Ideal for Medical Students!',
+                'text': (
+                    '"As a medical student preparing for USMLE and international rotations, '
+                    'DocTALKS gave me the confidence I was missing. The AI practice between classes '
+                    'kept me engaged every day without burnout."'
+                ),
+                'initial': 'Z',
+                'name': 'Zeynep D.',
+                'role': 'Medical Student, Izmir',
+            },
+        ],
+        'faq': [
+            {
+                'question': 'What is DocTALKS?',
+                'answer': (
+                    'DocTALKS is a consultation-focused medical speaking program designed for '
+                    'doctors and medical students. It trains real clinical communication in English '
+                    '— not grammar, not vocabulary lists, but how doctors actually speak in real '
+                    'hospitals with international patients and colleagues.'
+                ),
+            },
+            {
+                'question': 'Who is DocTALKS for?',
+                'answer': (
+                    'DocTALKS is designed for practicing doctors, specialists, and medical students '
+                    'who want to communicate confidently with international patients, work in '
+                    'health tourism, present at conferences, or pursue clinical careers abroad.'
+                ),
+            },
+            {
+                'question': 'How long is the program?',
+                'answer': (
+                    'The core program runs for 3 months (12 weeks), structured into 20 '
+                    'medical-specific units. You get 3 days of live speaking classes and 4 days of '
+                    'AI practice per week — 7 days of exposure without burnout.'
+                ),
+            },
+            {
+                'question': 'What is the class size?',
+                'answer': (
+                    'Maximum 5 participants per group. This ensures breakout-based, high speaking '
+                    'time with continuous teacher feedback. Every student gets meaningful practice '
+                    'in every session.'
+                ),
+            },
+            {
+                'question': 'Is DocTALKS different from general English courses?',
+                'answer': (
+                    'Yes. DocTALKS uses profession-specific speaking curricula with academically '
+                    'trained instructors. The AI speaking partner is designed for medical '
+                    'scenarios, not general chat. It is a structured, unit-based system — not '
+                    'random conversation practice.'
+                ),
+            },
+            {
+                'question': 'Can I access lessons after the live sessions?',
+                'answer': (
+                    'Yes. All live sessions are recorded and accessible anytime via your student '
+                    'dashboard. You can join from your hospital, home, or abroad — and review '
+                    'lessons whenever you need.'
+                ),
+            },
+        ],
+    },
+    'denttalks': {
+        'name': 'DentTALKS',
+        'url': '/programs/denttalks',
+        'icon': '🦷',
+        'color': '#0e415b',
+        'prefix': 'dent',
+        'primary_var': '--dt-primary',
+        'stylesheet': 'css/denttalks.css',
+        'scripts': ['js/reel-video.js', 'js/denttalks.js', 'js/faq.js'],
+        'field': 'dental',
+        'role': 'Dentist',
+        'workplace': 'clinic',
+        'article_category': 'Dental',
+        'hero': {
+            'audience': 'For Dentists & Dental Students',
+            'subtitle': 'The Global Dental Speaking Program',
+            'description': (
+                'Chairside-focused dental English designed for real clinical communication — with '
+                'international patients, in health tourism, and for global careers.'
+            ),
+        },
+        'reels': [
+            {
+                'video': 'videos/Sample1.mp4',
+                'likes': '1.8K',
+                'comments': '124',
+                'caption': 'Master medical terminology with confidence! 🎯 #MedicalEnglish #Healthcare',
+            },
+            {
+                'video': 'videos/Sample2.mp4',
+                'likes': '3.1K',
+                'comments': '215',
+                'caption': (
+                    'Clinical communication made easy! 💬 Join thousands of medical professionals 🌍 '
+                    '#DoctorLife'
+                ),
+            },
+            {
+                'video': 'videos/Sample3.mp4',
+                'likes': '2.7K',
+                'comments': '198',
+                'caption': (
+                    'Perfect your dental English! 🦷 Expert training for dentists worldwide 🌍 '
+                    '#DentTalks #DentalEnglish'
+                ),
+            },
+            {
+                'video': 'videos/medtalkintro.mp4',
+                'likes': '2.4K',
+                'comments': '186',
+                'caption': (
+                    'Welcome to MedTalk 🩺 Your journey to medical English starts here! ✨ #MedTalk '
+                    '#DentTalks'
+                ),
+            },
+        ],
+        'intro': {
+            'wrapper_class': 'tooth-mask-wrapper',
+            'image_class': 'tooth-image',
+            'badge': Markup('SPEAKING<br>FIRST'),
+            'heading': 'Your Dental Skills Are World-Class.',
+            'subheading': 'Your English Should Be Chairside-Ready.',
+            'description': (
+                'Modern dentistry is global. International patients, cosmetic procedures, health '
+                'tourism, and cross-border careers demand clear, confident, patient-friendly '
+                'English.'
+            ),
+            'checks': [
+                Markup('<strong>Speaking-First System:</strong> Built for chairside communication.'),
+                Markup('<strong>Clinical Focus:</strong> Patient reassurance & procedure explanations.'),
+            ],
+        },
+        'what_is': {
+            'description': (
+                'DentTALKS is a chairside-focused dental speaking program designed for dentists and '
+                'dental students who need to:'
+            ),
+            'features': [
+                {
+                    'title': 'Procedures & Anxiety',
+                    'text': 'Explain procedures clearly and manage patient anxiety.',
+                },
+                {
+                    'title': 'Trust & Confidence',
+                    'text': 'Build trust without translators & communicate confidently.',
+                },
+            ],
+            'footer': Markup(
+                'The program focuses on explaining, reassuring, and guiding patients, not '
+                'memorizing vocabulary lists.<br><strong>DentTALKS trains how dentists actually '
+                'speak in real clinics.</strong>'
+            ),
+            'image': _image('denttalk/denttalks-image-3.png'),
+            'scenarios': 'Real Clinical Scenarios',
+        },
+        'focus': [
+            {
+                'image': _image('denttalk/denttalks-image-2.png'),
+                'title': 'Chairside Procedure Explanations',
+                'text': (
+                    'Learn to explain treatments clearly, manage patient expectations, and guide '
+                    'patients through every step with confidence.'
+                ),
+            },
+            {
+                'image': _image('denttalk/denttalks-image-3.png'),
+                'title': 'Patient Anxiety & Consent',
+                'text': (
+                    'Master reassurance techniques and informed consent communication to build '
+                    'trust and reduce patient anxiety in English.'
+                ),
+            },
+            {
+                'image': _image('denttalk/denttalks-image-1.png'),
+                'title': 'Health Tourism Dentistry',
+                'text': (
+                    'Communicate professionally with international patients in cosmetic dentistry, '
+                    'implants, and cross-border dental care.'
+                ),
+            },
+            {
+                'static': 'images/doctalks/teamwork-in-healthcare.png',
+                'title': 'International Networking',
+                'text': (
+                    'Prepare for global dental congresses, overseas clinical careers, and '
+                    'professional networking in English-speaking environments.'
+                ),
+            },
+        ],
+        'structure': {
+            'units': 18,
+            'unit_label': 'Dental-Specific Units',
+            'ai_practice': (
+                'Dr Meddy Ecosystem — dental-specific AI practice designed for clinical scenarios, '
+                'not general chat.'
+            ),
+        },
+        'factors': {
+            'id': 'factors-section',
+            'heading': Markup('Why Patients Choose One Dentist <br>Over Another'),
+            'intro': (
+                'International patients do not decide based on technical skill alone. Communication '
+                'quality is a decisive factor in patient choice.'
+            ),
+            'cards': [
+                {
+                    'share': 35,
+                    'legend': 'Procedure Explanation',
+                    'title': 'Clear Procedure Explanation',
+                    'text': (
+                        'Patients need to understand what will happen, why it is needed, and what '
+                        'to expect next. Clear explanations reduce fear and increase treatment '
+                        'acceptance.'
+                    ),
+                },
+                {
+                    'share': 35,
+                    'legend': 'Building Trust',
+                    'title': 'Building Trust Quickly',
+                    'text': (
+                        'International patients often meet their dentist for the first time. The '
+                        'ability to establish trust within minutes directly affects confidence and '
+                        'cooperation.'
+                    ),
+                },
+                {
+                    'share': 30,
+                    'legend': 'Risk & Cost Comm.',
+                    'title': 'Confident Risk & Cost Communication',
+                    'text': (
+                        'Explaining risks, alternatives, and costs calmly and transparently is '
+                        'essential in health tourism and international care.'
+                    ),
+                },
+            ],
+        },
+        'earnings': {
+            'id': 'earnings-section',
+            'bars': [('$175K', 90), ('$120K', 65), ('$95K', 50)],
+            'features': [
+                Markup('Patient communication is expected to be <strong>clear and structured</strong>'),
+                Markup('Professional interaction happens <strong>in English</strong>'),
+                Markup(
+                    'Trust and explanation are directly linked to <strong>clinical and financial '
+                    'outcomes</strong>'
+                ),
+            ],
+            'note': 'Strong clinical skills are essential',
+        },
+        'testimonials': [
+            {
+                'title': 'Confident and Clear!',
+                'text': (
+                    '"After DentTALKS, I can explain procedures to my international patients '
+                    'without hesitation. The chairside scenarios were exactly what I needed — real, '
+                    'practical, and immediately useful in my clinic."'
+                ),
+                'initial': 'A',
+                'name': 'Dr. Aylin K.',
+                'role': 'Cosmetic Dentist, Istanbul',
+            },
+            {
+                'title': 'Highly Recommended!',
+                'text': (
+                    '"The small group size made all the difference. I spoke more English in one '
+                    'week of DentTALKS than in years of traditional courses. My patients notice the '
+                    'improvement — trust builds much faster now."'
+                ),
+                'initial': 'M',
+                'name': 'Dr. Mehmet B.',
+                'role': 'Implant Specialist, Antalya',
+            },
+            {
+                'title': 'Perfect for Dental Students!',
+                'text': (
+                    '"As a dental student preparing for international opportunities, DentTALKS gave '
+                    'me the confidence I was missing. The AI practice between classes kept me '
+                    'engaged every day without burnout."'
+                ),
+                'initial': 'S',
+                'name': 'Selin T.',
+                'role': 'Dental Student, Ankara',
+            },
+        ],
+        'faq': [
+            {
+                'question': 'What is DentTALKS?',
+                'answer': (
+                    'DentTALKS is a chairside-focused dental speaking program designed for dentists '
+                    'and dental students. It trains real clinical communication in English — not '
+                    'grammar, not vocabulary lists, but how dentists actually speak in real clinics '
+                    'with international patients.'
+                ),
+            },
+            {
+                'question': 'Who is DentTALKS for?',
+                'answer': (
+                    'DentTALKS is designed for practicing dentists, dental specialists, and dental '
+                    'students who want to communicate confidently with international patients, work '
+                    'in health tourism, or pursue clinical careers abroad.'
+                ),
+            },
+            {
+                'question': 'How long is the program?',
+                'answer': (
+                    'The core program runs for 3 months (12 weeks), structured into 18 '
+                    'dental-specific units. You get 3 days of live speaking classes and 4 days of '
+                    'AI practice per week — 7 days of exposure without burnout.'
+                ),
+            },
+            {
+                'question': 'What is the class size?',
+                'answer': (
+                    'Maximum 5 participants per group. This ensures breakout-based, high speaking '
+                    'time with continuous teacher feedback. Every student gets meaningful practice '
+                    'in every session.'
+                ),
+            },
+            {
+                'question': 'Is DentTALKS different from general English courses?',
+                'answer': (
+                    'Yes. DentTALKS uses profession-specific speaking curricula with academically '
+                    'trained instructors. The AI speaking partner is designed for dental scenarios, '
+                    'not general chat. It is a structured, unit-based system — not random '
+                    'conversation practice.'
+                ),
+            },
+            {
+                'question': 'Can I access lessons after the live sessions?',
+                'answer': (
+                    'Yes. All live sessions are recorded and accessible anytime via your student '
+                    'dashboard. You can join from your clinic, home, or abroad — and review lessons '
+                    'whenever you need.'
+                ),
+            },
+        ],
+    },
+    'nursetalks': {
+        'name': 'NurseTALKS',
+        'url': '/programs/nursetalks',
+        'icon': '👩\u200d⚕️',
+        'color': '#0e415b',
+        'prefix': 'nurse',
+        'primary_var': '--nurse-primary',
+        'stylesheet': 'css/nursetalks.css',
+        'scripts': ['js/reel-video.js', 'js/nursetalks.js'],
+        'field': 'nursing',
+        'role': 'Nurse',
+        'workplace': 'ward',
+        'article_category': 'Nursing',
+        'hero': {
+            'audience': 'For Nurses & Nursing Students',
+            'subtitle': 'The Global Nursing Speaking Program',
+            'description': (
+                'Ward-focused nursing communication for confident patient care, reassurance, and '
+                'handovers — designed for nurses advancing international careers.'
+            ),
+        },
+        'reels': [
+            {
+                'video': 'videos/Sample1.mp4',
+                'likes': '2.4K',
+                'comments': '186',
+                'caption': (
+                    'Excel in nursing communication! 👩\u200d⚕️ Professional English for nurses worldwide '
+                    '🌍 #NurseTalks #NursingEnglish'
+                ),
+            },
+            {
+                'video': 'videos/Sample2.mp4',
+                'likes': '3.1K',
+                'comments': '215',
+                'caption': (
+                    'Clinical communication made easy! 💬 Join thousands of medical professionals 🌍 '
+                    '#DoctorLife'
+                ),
+            },
+            {
+                'video': 'videos/Sample3.mp4',
+                'likes': '2.7K',
+                'comments': '198',
+                'caption': (
+                    'Transform your medical English skills! 📚 Expert-led training for healthcare '
+                    'professionals 👨\u200d⚕️ #HealthcareEducation'
+                ),
+            },
+            {
+                'video': 'videos/medtalkintro.mp4',
+                'likes': '2.4K',
+                'comments': '186',
+                'caption': (
+                    'Welcome to MedTalk 🩺 Your journey to medical English starts here! ✨ #MedTalk '
+                    '#NurseTalks'
+                ),
+            },
+        ],
+        'intro': {
+            'wrapper_class': 'stethoscope-wrapper',
+            'image_class': 'stethoscope-image',
+            'badge': Markup('NURSING<br>ENGLISH'),
+            'heading': 'Your Nursing Skills Are Life-Saving.',
+            'subheading': 'Your English Should Be Ward-Ready.',
+            'description': (
+                'Modern nursing is global. International patients, multidisciplinary teams, patient '
+                'handovers, and overseas nursing careers demand clear, confident, patient-centered '
+                'English.'
+            ),
+            'checks': [
+                Markup('<strong>Speaking-First System:</strong> Built for ward-based communication.'),
+                Markup(
+                    '<strong>Clinical Focus:</strong> Patient handovers, medication administration '
+                    '& discharge.'
+                ),
+            ],
+        },
+        'what_is': {
+            'description': (
+                'NurseTALKS is a ward-focused nursing speaking program designed for nurses and '
+                'nursing students who need to:'
+            ),
+            'features': [
+                {
+                    'title': 'Patient Handover & Documentation',
+                    'text': 'Communicate patient status, care plans, and shift reports clearly in English.',
+                },
+                {
+                    'title': 'Global Communication',
+                    'text': (
+                        'Present at conferences and communicate with international '
+                        'multidisciplinary teams.'
+                    ),
+                },
+            ],
+            'footer': Markup(
+                'The program focuses on real handovers, medication rounds, and patient education — '
+                'not memorizing vocabulary lists.<br><strong>NurseTALKS trains how nurses actually '
+                'speak in real clinical settings.</strong>'
+            ),
+            'image': _image('nursetalks/nursetalks-1.png'),
+            'scenarios': 'Real Ward Scenarios',
+        },
+        'focus': [
+            {
+                'image': _image('nursetalks/nursetalks-2.png'),
+                'title': 'Patient Handover & Shift Reports',
+                'text': (
+                    'Learn to deliver clear, structured patient handovers and shift reports '
+                    'confidently in English.'
+                ),
+            },
+            {
+                'image': _image('nursetalks/nursetalks-3.png'),
+                'title': 'Medication Administration',
+                'text': (
+                    'Master the language needed to explain medications, dosages, and administration '
+                    'routes to patients and colleagues.'
+                ),
+            },
+            {
+                'image': _image('nursetalks/nursetalks-1.png'),
+                'title': 'Patient Education & Discharge',
+                'text': (
+                    'Develop skills in educating patients about their conditions, post-discharge '
+                    'care, and follow-up instructions in English.'
+                ),
+            },
+            {
+                'static': 'images/doctalks/teamwork-in-healthcare.png',
+                'title': 'International Nursing Careers',
+                'text': (
+                    'Prepare for global nursing roles, international certifications, and careers in '
+                    'English-speaking professional environments.'
+                ),
+            },
+        ],
+        'structure': {
+            'units': 18,
+            'unit_label': 'Nursing-Specific Units',
+            'ai_practice': (
+                'Dr Meddy Ecosystem — nursing-specific AI practice designed for nursing scenarios, '
+                'not general chat.'
+            ),
+        },
+        'factors': {
+            'id': 'nurse-factors-section',
+            'heading': Markup('Why Patients Trust One Nurse<br>Over Another'),
+            'intro': (
+                'Patients do not decide based on technical skills alone. Communication quality is a '
+                'decisive factor in patient trust and nursing care outcomes.'
+            ),
+            'cards': [
+                {
+                    'share': 40,
+                    'legend': 'Clarity of Instruction',
+                    'title': 'Clear Nursing Instruction',
+                    'text': (
+                        'Patients need to understand their care plan, medications, and what to '
+                        'expect. Clear instructions improve compliance and reduce clinical errors.'
+                    ),
+                },
+                {
+                    'share': 35,
+                    'legend': 'Empathy & Reassurance',
+                    'title': 'Building Empathy & Reassurance',
+                    'text': (
+                        'Patients often rely on their nurse as their most constant healthcare '
+                        'provider. The ability to reassure and build empathy directly affects '
+                        'patient comfort and recovery.'
+                    ),
+                },
+                {
+                    'share': 25,
+                    'legend': 'Handover Quality',
+                    'title': 'Handover Quality',
+                    'text': (
+                        'Delivering clear, accurate patient handovers between shifts and '
+                        'departments is essential for patient safety and professional credibility.'
+                    ),
+                },
+            ],
+        },
+        'earnings': {
+            'id': 'nurse-earnings-section',
+            'bars': [('$85K', 85), ('$65K', 65), ('$45K', 45)],
+            'features': [
+                Markup('Patient communication is expected to be <strong>clear and reassuring</strong>'),
+                Markup('Professional interaction happens <strong>in English</strong>'),
+                Markup(
+                    'Trust and explanation are directly linked to <strong>patient outcomes and '
+                    'career growth</strong>'
+                ),
+            ],
+            'note': 'Strong nursing skills are essential',
+        },
+        'testimonials': [
+            {
+                'title': 'Confident in Handovers!',
+                'text': (
+                    '"After NurseTALKS, I can deliver patient handovers without hesitation. The '
+                    'ward scenarios were exactly what I needed."'
+                ),
+                'initial': 'A',
+                'name': 'Nurse Ayşe T.',
+                'role': 'ICU Nurse, Istanbul',
+            },
+            {
+                'title': 'Great for Ward Communication!',
+                'text': (
+                    '"The small group size made all the difference. My communication with doctors '
+                    'and colleagues about patient care plans has improved dramatically."'
+                ),
+                'initial': 'M',
+                'name': 'Nurse Mehmet B.',
+                'role': 'Emergency Nurse, Ankara',
+            },
+            {
+                'title': 'Perfect for Nursing Students!',
+                'text': (
+                    '"As a nursing student preparing for international opportunities, NurseTALKS '
+                    'gave me the confidence I was missing. The AI practice kept me engaged every '
+                    'day."'
+                ),
+                'initial': 'S',
+                'name': 'Selin K.',
+                'role': 'Nursing Student, Izmir',
+            },
+        ],
+        'faq': [
+            {
+                'question': 'What is NurseTALKS?',
+                'answer': (
+                    'NurseTALKS is a ward-focused nursing speaking program designed for nurses and '
+                    'nursing students. It trains real nursing communication in English — not '
+                    'grammar, not vocabulary lists, but how nurses actually speak when delivering '
+                    'handovers, administering medications, and collaborating with healthcare teams.'
+                ),
+            },
+            {
+                'question': 'Who is NurseTALKS for?',
+                'answer': (
+                    'NurseTALKS is designed for practicing nurses, clinical nurses, and nursing '
+                    'students who want to communicate confidently with patients, collaborate with '
+                    'healthcare professionals, work in multidisciplinary teams, or pursue nursing '
+                    'careers abroad.'
+                ),
+            },
+            {
+                'question': 'How long is the program?',
+                'answer': (
+                    'The core program runs for 3 months (12 weeks), structured into 18 '
+                    'nursing-specific units. You get 3 days of live speaking classes and 4 days of '
+                    'AI practice per week — 7 days of exposure without burnout.'
+                ),
+            },
+            {
+                'question': 'What is the class size?',
+                'answer': (
+                    'Maximum 5 participants per group. This ensures breakout-based, high speaking '
+                    'time with continuous teacher feedback. Every student gets meaningful practice '
+                    'in every session.'
+                ),
+            },
+            {
+                'question': 'Is NurseTALKS different from general English courses?',
+                'answer': (
+                    'Yes. NurseTALKS uses profession-specific speaking curricula with academically '
+                    'trained instructors. The AI speaking partner is designed for nursing '
+                    'scenarios, not general chat. It is a structured, unit-based system — not '
+                    'random conversation practice.'
+                ),
+            },
+            {
+                'question': 'Can I access lessons after the live sessions?',
+                'answer': (
+                    'Yes. All live sessions are recorded and accessible anytime via your student '
+                    'dashboard. You can join from your ward, home, or abroad — and review lessons '
+                    'whenever you need.'
+                ),
+            },
+        ],
+    },
+    'pharmatalks': {
+        'name': 'PharmaTALKS',
+        'url': '/programs/pharmatalks',
+        'icon': '💊',
+        'color': '#0e415b',
+        'prefix': 'pharma',
+        'primary_var': '--pharma-primary',
+        'stylesheet': 'css/pharmatalks.css',
+        'scripts': ['js/reel-video.js', 'js/pharmatalks.js'],
+        'field': 'pharmaceutical',
+        'role': 'Pharmacist',
+        'workplace': 'pharmacy',
+        'article_category': 'Pharmacy',
+        'hero': {
+            'audience': 'For Pharmacists & Pharmacy Students',
+            'subtitle': 'The Global Pharmaceutical Speaking Program',
+            'description': (
+                'Patient counseling and medication communication for pharmacists working in '
+                'clinical, retail, and international healthcare environments.'
+            ),
+        },
+        'reels': [
+            {
+                'video': 'videos/Sample3.mp4',
+                'likes': '2.7K',
+                'comments': '198',
+                'caption': (
+                    'Transform your medical English skills! 📚 Expert-led training for healthcare '
+                    'professionals 👨\u200d⚕️ #HealthcareEducation'
+                ),
+            },
+            {
+                'video': 'videos/Sample1.mp4',
+                'likes': '1.8K',
+                'comments': '124',
+                'caption': 'Master medical terminology with confidence! 🎯 #MedicalEnglish #Healthcare',
+            },
+            {
+                'video': 'videos/Sample2.mp4',
+                'likes': '3.1K',
+                'comments': '215',
+                'caption': (
+                    'Pharmacy excellence through English! 💊 Specialized training for pharmacists 🎓 '
+                    '#PharmaTalks #PharmacyEnglish'
+                ),
+            },
+            {
+                'video': 'videos/medtalkintro.mp4',
+                'likes': '2.4K',
+                'comments': '186',
+                'caption': (
+                    'Welcome to MedTalk 🩺 Your journey to medical English starts here! ✨ #MedTalk '
+                    '#PharmaTalks'
+                ),
+            },
+        ],
+        'intro': {
+            'wrapper_class': 'stethoscope-wrapper',
+            'image_class': 'stethoscope-image',
+            'badge': Markup('PHARMACY<br>ENGLISH'),
+            'heading': 'Your Pharmaceutical Knowledge Is World-Class.',
+            'subheading': 'Your English Should Be Counter-Ready.',
+            'description': (
+                'Modern pharmacy is global. International patients, cross-border pharmaceutical '
+                'supply chains, global drug regulations, and overseas career opportunities demand '
+                'clear, confident, patient-centered English.'
+            ),
+            'checks': [
+                Markup('<strong>Speaking-First System:</strong> Built for pharmacy communication.'),
+                Markup('<strong>Clinical Focus:</strong> Patient counseling & drug explanations.'),
+            ],
+        },
+        'what_is': {
+            'description': (
+                'PharmaTALKS is a counter-focused pharmaceutical speaking program designed for '
+                'pharmacists and pharmacy students who need to:'
+            ),
+            'features': [
+                {
+                    'title': 'Patient Counseling & Drug Info',
+                    'text': 'Counsel patients on medications, dosages, and interactions clearly in English.',
+                },
+                {
+                    'title': 'Industry & Global Communication',
+                    'text': (
+                        'Present at conferences and communicate with international pharmaceutical '
+                        'teams.'
+                    ),
+                },
+            ],
+            'footer': Markup(
+                'The program focuses on real pharmacy counseling, medication dispensing, and drug '
+                'interaction discussions — not memorizing vocabulary lists.<br><strong>PharmaTALKS '
+                'trains how pharmacists actually speak in real pharmacy settings.</strong>'
+            ),
+            'image': _image('pharmatalks/pharmatalks-3.png'),
+            'scenarios': 'Real Pharmacy Scenarios',
+        },
+        'focus': [
+            {
+                'image': _image('pharmatalks/pharmatalks-2.png'),
+                'title': 'Patient Medication Counseling',
+                'text': (
+                    'Learn to explain prescriptions, dosages, side effects, and drug interactions '
+                    'clearly and confidently in English.'
+                ),
+            },
+            {
+                'image': _image('pharmatalks/pharmatalks-3.png'),
+                'title': 'Clinical Pharmacy Communication',
+                'text': (
+                    'Master the language needed to collaborate with doctors and nurses on '
+                    'medication management and patient care plans.'
+                ),
+            },
+            {
+                'image': _image('pharmatalks/pharmatalks-4.png'),
+                'title': 'Pharmaceutical Industry English',
+                'text': (
+                    'Develop skills in medical writing, drug presentations, and regulatory '
+                    'communication for the global pharmaceutical industry.'
+                ),
+            },
+            {
+                'static': 'images/doctalks/teamwork-in-healthcare.png',
+                'title': 'International Pharmacy Careers',
+                'text': (
+                    'Prepare for FPGEC, global pharmacy roles, and international conferences in '
+                    'English-speaking professional environments.'
+                ),
+            },
+        ],
+        'structure': {
+            'units': 16,
+            'unit_label': 'Pharmacy-Specific Units',
+            'ai_practice': (
+                'Dr Meddy Ecosystem — pharmacy-specific AI practice designed for pharmacy '
+                'scenarios, not general chat.'
+            ),
+        },
+        'factors': {
+            'id': 'pharma-factors-section',
+            'heading': Markup('Why Patients Trust One Pharmacist <br>Over Another'),
+            'intro': (
+                'Patients do not decide based on technical knowledge alone. Communication quality '
+                'is a decisive factor in patient trust and medication adherence.'
+            ),
+            'cards': [
+                {
+                    'share': 40,
+                    'legend': 'Medication Explanation',
+                    'title': 'Clear Medication Explanation',
+                    'text': (
+                        'Patients need to understand their medications, dosages, and what to '
+                        'expect. Clear explanations improve adherence and reduce medication errors.'
+                    ),
+                },
+                {
+                    'share': 30,
+                    'legend': 'Trust & Reassurance',
+                    'title': 'Building Trust & Reassurance',
+                    'text': (
+                        'Patients often rely on their pharmacist as their most accessible '
+                        'healthcare provider. The ability to reassure and build trust directly '
+                        'affects patient confidence and loyalty.'
+                    ),
+                },
+                {
+                    'share': 30,
+                    'legend': 'Drug Interaction Comm.',
+                    'title': 'Drug Interaction Communication',
+                    'text': (
+                        'Explaining drug interactions, contraindications, and alternative therapies '
+                        'clearly is essential for patient safety and professional credibility.'
+                    ),
+                },
+            ],
+        },
+        'earnings': {
+            'id': 'pharma-earnings-section',
+            'bars': [('$130K', 90), ('$90K', 65), ('$60K', 45)],
+            'features': [
+                Markup('Patient counseling is expected to be <strong>clear and reassuring</strong>'),
+                Markup('Professional interaction happens <strong>in English</strong>'),
+                Markup(
+                    'Trust and explanation are directly linked to <strong>patient outcomes and '
+                    'career growth</strong>'
+                ),
+            ],
+            'note': 'Strong pharmaceutical knowledge is essential',
+        },
+        'testimonials': [
+            {
+                'title': 'Clear Patient Counseling!',
+                'text': (
+                    '"After PharmaTALKS, I can counsel patients about their medications without '
+                    'hesitation. The pharmacy scenarios were exactly what I needed."'
+                ),
+                'initial': 'B',
+                'name': 'Eczaci Burcu T.',
+                'role': 'Clinical Pharmacist, Istanbul',
+            },
+            {
+                'title': 'Great for Hospital Pharmacy!',
+                'text': (
+                    '"The small group size made all the difference. My communication with doctors '
+                    'and nurses about medication plans has improved dramatically."'
+                ),
+                'initial': 'M',
+                'name': 'Eczaci Murat D.',
+                'role': 'Hospital Pharmacist, Ankara',
+            },
+            {
+                'title': 'Perfect for Pharmacy Students!',
+                'text': (
+                    '"As a pharmacy student preparing for international opportunities, PharmaTALKS '
+                    'gave me the confidence I was missing. The AI practice kept me engaged every '
+                    'day."'
+                ),
+                'initial': 'C',
+                'name': 'Ceren Y.',
+                'role': 'Pharmacy Student, Izmir',
+            },
+        ],
+        'faq': [
+            {
+                'question': 'What is PharmaTALKS?',
+                'answer': (
+                    'PharmaTALKS is a counter-focused pharmaceutical speaking program designed for '
+                    'pharmacists and pharmacy students. It trains real pharmacy communication in '
+                    'English — not grammar, not vocabulary lists, but how pharmacists actually '
+                    'speak when counseling patients, explaining medications, and collaborating with '
+                    'healthcare teams.'
+                ),
+            },
+            {
+                'question': 'Who is PharmaTALKS for?',
+                'answer': (
+                    'PharmaTALKS is designed for practicing pharmacists, clinical pharmacists, and '
+                    'pharmacy students who want to communicate confidently with patients, '
+                    'collaborate with healthcare professionals, work in the pharmaceutical '
+                    'industry, or pursue pharmacy careers abroad.'
+                ),
+            },
+            {
+                'question': 'How long is the program?',
+                'answer': (
+                    'The core program runs for 3 months (12 weeks), structured into 16 '
+                    'pharmacy-specific units. You get 3 days of live speaking classes and 4 days of '
+                    'AI practice per week — 7 days of exposure without burnout.'
+                ),
+            },
+            {
+                'question': 'What is the class size?',
+                'answer': (
+                    'Maximum 5 participants per group. This ensures breakout-based, high speaking '
+                    'time with continuous teacher feedback. Every student gets meaningful practice '
+                    'in every session.'
+                ),
+            },
+            {
+                'question': 'Is PharmaTALKS different from general English courses?',
+                'answer': (
+                    'Yes. PharmaTALKS uses profession-specific speaking curricula with academically '
+                    'trained instructors. The AI speaking partner is designed for pharmacy '
+                    'scenarios, not general chat. It is a structured, unit-based system — not '
+                    'random conversation practice.'
+                ),
+            },
+            {
+                'question': 'Can I access lessons after the live sessions?',
+                'answer': (
+                    'Yes. All live sessions are recorded and accessible anytime via your student '
+                    'dashboard. You can join from your pharmacy, home, or abroad — and review '
+                    'lessons whenever you need.'
+                ),
+            },
+        ],
+    },
+}
+
+
+def _donut(cards):
+    """Set color, tint and the donut stroke-dasharray / offset on each factor card."""
+    circumference = round(2 * math.pi * DONUT_RADIUS, 2)
+    start = 0.0
+    for card, (color, tint) in zip(cards, FACTOR_COLORS):
+        dash = round(circumference * card['share'] / 100, 2)
+        card['color'] = color
+        card['tint'] = tint
+        card['dash'] = f"{dash:.2f} {circumference - dash:.2f}"
+        card['offset'] = f"-{start:.2f}" if start else '0'
+        start = round(start + dash, 2)
+
+
+for _key, _program in PROGRAMS.items():
+    _program['key'] = _key
+    _donut(_program['factors']['cards'])
+
+
+def program_assets(program):
+    """Static files the layout renders for a program (for early hints)."""
+    return [program['stylesheet']] + list(program['scripts'])
@@ -0,0 +1,92 @@
+"""
+Local stand-in for the CDN purge API.
+
+Accepts the JSON POSTs sent by http_cache.PurgeHook and records the
+surrogate keys, so purge behaviour can be checked without a real CDN.
+
+Usage:
+    python purge_receiver.py --port 9099
+    CACHE_PURGE_URL=http://127.0.0.1:9099/purge flask --app app --debug run
+
+Or in-process:
+    receiver = PurgeReceiver().start()
+    ... receiver.received ...
+    receiver.stop()
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class PurgeReceiver:
+    """Threaded HTTP server collecting purged surrogate keys in `received`."""
+
+    def __init__(self, host='127.0.0.1', port=0, token=None):
+        self.received = []
+        self.token = token
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if receiver.token and self.headers.get('Authorization') != f'Bearer {receiver.token}':
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+                keys = payload.get('surrogate_keys', [])
+                receiver.received.append(keys)
+                print(f"Purged: {' '.join(keys)}")
+                body = json.dumps({'status': 'ok', 'purged': len(keys)}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/purge'
+
+    @property
+    def keys(self):
+        """Every key received so far, flattened."""
+        return [key for batch in self.received for key in batch]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local CDN purge receiver.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9099)
+    parser.add_argument('--token', default=None)
+    args = parser.parse_args()
+
+    receiver = PurgeReceiver(args.host, args.port, args.token)
+    print(f"Listening for purges on {receiver.url}")
+    try:
+        receiver.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,326 @@
+"""
+In-process full-text search over blog posts and courses.
+
+An inverted index with BM25 ranking and prefix matching on the last query
+term (for typeahead). Documents are added, replaced and removed one at a
+time, so the index follows catalog changes without full rebuilds. The
+catalog's first load is indexed on the first search, so workers that never
+search never decode the whole catalog.
+
+Usage in app.py:
+    from search_index import search_index, ensure_indexed, handle_catalog_change, handle_catalog_refresh
+
+    catalog.subscribe(handle_catalog_change)
+    catalog.after_refresh(handle_catalog_refresh)
+    ensure_indexed(catalog)
+    results = search_index.search('cardiology case', limit=10)
+"""
+
+import bisect
+import heapq
+import html
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+TAG_RE = re.compile(r'<[^>]+>')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with you your
+""".split())
+
+# Field weights multiply term frequencies, so title hits outrank body hits
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'lessons': 1.5,
+    'description': 1.0,
+    'content': 1.0,
+}
+
+# Upper bound on vocabulary terms a single prefix may expand to
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def strip_html(value):
+    """Drop tags and unescape entities from an HTML fragment."""
+    if not value:
+        return ''
+    return html.unescape(TAG_RE.sub(' ', str(value)))
+
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    """
+    BM25 inverted index.
+
+    Args:
+        k1: Term frequency saturation parameter
+        b: Document length normalisation parameter
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}       # term -> {doc_key: weighted tf}
+        self._doc_terms = {}      # doc_key -> {term: weighted tf}, for removal
+        self._doc_len = {}        # doc_key -> weighted length
+        self._docs = {}           # doc_key -> result metadata
+        self._total_len = 0.0
+        self._vocab = []          # sorted terms, for prefix lookups
+        self._vocab_dirty = False
+        self._lock = threading.RLock()
+        self.build_seconds = 0.0
+        self._latencies = deque(maxlen=1000)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_key, fields, meta):
+        """
+        Index (or re-index) a document.
+
+        Args:
+            doc_key: Unique key such as 'blog:<id>'
+            fields: Mapping of field name to plain text
+            meta: Dict returned to callers for each hit
+        """
+        terms = Counter()
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text or ''):
+                terms[token] += weight
+
+        with self._lock:
+            self._remove_locked(doc_key)
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    if not self._vocab_dirty:
+                        bisect.insort(self._vocab, term)
+                postings[doc_key] = tf
+            length = sum(terms.values())
+            self._doc_terms[doc_key] = dict(terms)
+            self._doc_len[doc_key] = length
+            self._docs[doc_key] = meta
+            self._total_len += length
+
+    def remove(self, doc_key):
+        with self._lock:
+            self._remove_locked(doc_key)
+
+    def _remove_locked(self, doc_key):
+        terms = self._doc_terms.pop(doc_key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_key, None)
+            if not postings:
+                del self._postings[term]
+                if not self._vocab_dirty:
+                    i = bisect.bisect_left(self._vocab, term)
+                    if i < len(self._vocab) and self._vocab[i] == term:
+                        del self._vocab[i]
+        self._total_len -= self._doc_len.pop(doc_key, 0.0)
+        self._docs.pop(doc_key, None)
+
+    def build(self, documents):
+        """
+        Bulk (re)build from an iterable of (doc_key, fields, meta) tuples.
+
+        Vocabulary sorting is deferred to the end instead of per term.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._vocab_dirty = True
+            for doc_key, fields, meta in documents:
+                self.add(doc_key, fields, meta)
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        self.build_seconds = time.perf_counter() - started
+        return self.build_seconds
+
+    def _expand_prefix(self, prefix):
+        i = bisect.bisect_left(self._vocab, prefix)
+        expansions = []
+        while i < len(self._vocab) and len(expansions) < MAX_PREFIX_EXPANSIONS:
+            term = self._vocab[i]
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+            i += 1
+        return expansions
+
+    def search(self, query, limit=10, kind=None, prefix=True):
+        """
+        Rank documents against a query.
+
+        Args:
+            query: Free text; the last term is prefix-matched when `prefix`
+            limit: Maximum number of results
+            kind: Optional 'blog' or 'course' filter
+            prefix: Treat the last query term as a prefix (typeahead)
+
+        Returns:
+            List of result metadata dicts with a 'score' key, best first
+        """
+        started = time.perf_counter()
+        tokens = tokenize(query)
+        if not tokens and prefix:
+            # A lone stopword-ish prefix like "th" is still useful to typeahead
+            tokens = TOKEN_RE.findall(query.lower())[-1:]
+        if not tokens:
+            return []
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            # Every document may be empty or stopwords only
+            avg_len = self._total_len / n_docs or 1.0
+
+            # Each query position contributes its best-matching term
+            groups = [[t] for t in tokens[:-1]]
+            last = tokens[-1]
+            if prefix:
+                expansions = self._expand_prefix(last)
+                groups.append(expansions or [last])
+            else:
+                groups.append([last])
+
+            doc_len = self._doc_len
+            base_norm = self.k1 * (1 - self.b)
+            len_norm = self.k1 * self.b / avg_len
+            k1_plus_1 = self.k1 + 1
+
+            scores = {}
+            for terms in groups:
+                best = {}
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_key, tf in postings.items():
+                        score = idf * tf * k1_plus_1 / (tf + base_norm + len_norm * doc_len[doc_key])
+                        if score > best.get(doc_key, 0.0):
+                            best[doc_key] = score
+                for doc_key, score in best.items():
+                    scores[doc_key] = scores.get(doc_key, 0.0) + score
+
+            if kind:
+                scores = {k: s for k, s in scores.items() if self._docs[k].get('type') == kind}
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            results = [dict(self._docs[doc_key], score=round(score, 4)) for doc_key, score in ranked]
+
+        self._latencies.append(time.perf_counter() - started)
+        return results
+
+    def stats(self):
+        """Index size, last build time and query latency percentiles in ms."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+
+        return {
+            'documents': len(self._docs),
+            'terms': len(self._postings),
+            'build_ms': round(self.build_seconds * 1000, 3),
+            'queries': len(latencies),
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+        }
+
+
+def blog_document(post):
+    """Map a blog post dict to (doc_key, fields, meta)."""
+    slug = post.get('slug') or post['id']
+    return (
+        f"blog:{post['id']}",
+        {
+            'title': post.get('title', ''),
+            'content': strip_html(post.get('content', '')),
+        },
+        {
+            'type': 'blog',
+            'id': post['id'],
+            'title': post.get('title', ''),
+            'url': f'/blog/{slug}',
+            'excerpt': post.get('excerpt', ''),
+        },
+    )
+
+
+def course_document(course):
+    """Map a processed course dict to (doc_key, fields, meta)."""
+    lesson_titles = [
+        lesson.get('title', '')
+        for section in course.get('sections', [])
+        for lesson in section.get('lessons', [])
+    ]
+    return (
+        f"course:{course['id']}",
+        {
+            'title': course.get('title', ''),
+            'description': strip_html(course.get('description', '')),
+            'lessons': ' '.join(lesson_titles),
+        },
+        {
+            'type': 'course',
+            'id': course['id'],
+            'title': course.get('title', ''),
+            'url': f"/course/{course['id']}",
+            'category': course.get('category', ''),
+        },
+    )
+
+
+search_index = SearchIndex()
+# Set when the catalog's first load still has to be indexed
+_initial_load_pending = threading.Event()
+_initial_load_lock = threading.Lock()
+
+
+def handle_catalog_change(kind, doc_id, doc):
+    """Catalog listener keeping the search index in step with content."""
+    if doc is None:
+        search_index.remove(f'{kind}:{doc_id}')
+    elif kind == 'blog':
+        search_index.add(*blog_document(doc))
+    elif kind == 'course':
+        search_index.add(*course_document(doc))
+
+
+def handle_catalog_refresh(initial):
+    """Catalog refresh hook: leave a first load for ensure_indexed()."""
+    if initial:
+        _initial_load_pending.set()
+
+
+def ensure_indexed(catalog):
+    """Index every catalog document once after the catalog's first load."""
+    if not _initial_load_pending.is_set():
+        return
+    with _initial_load_lock:
+        if not _initial_load_pending.is_set():
+            return
+        for post in catalog.blogs.values():
+            search_index.add(*blog_document(post))
+        for course in catalog.courses.values():
+            search_index.add(*course_document(course))
+        _initial_load_pending.clear()
@@ -499,6 +499,15 @@ document.addEventListener('DOMContentLoaded', function () {
     //  FORM SUBMISSION
     // ══════════════════════════════════════════
 
+    // One key per application, reused when the user retries after a network
+    // error so the server does not store the application twice
+    let idempotencyKey = null;
+
+    function newIdempotencyKey() {
+        if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+        return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2, 12);
+    }
+
     if (submitBtn) {
         submitBtn.addEventListener('click', async function (e) {
             e.preventDefault();
@@ -510,16 +519,18 @@ document.addEventListener('DOMContentLoaded', function () {
 
             try {
                 const formData = collectFormData();
+                if (!idempotencyKey) idempotencyKey = newIdempotencyKey();
 
                 const response = await fetch('/api/partnership-application', {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
+                    headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
                     body: JSON.stringify(formData),
                 });
 
                 const result = await response.json();
 
                 if (result.success) {
+                    idempotencyKey = null;
                     formNav.style.display = 'none';
                     formSteps.forEach(step => step.classList.remove('active'));
                     successMsg.style.display = 'block';
@@ -0,0 +1,804 @@
+"""
+Storage backends for site content and form submissions.
+
+Handlers talk to a Storage object instead of the Firestore client, so the
+site can also run on an in-memory store (fixtures, tests, benchmarks) or a
+local SQLite file without cloud credentials.
+
+Every read returns plain dicts carrying the document 'id' and an
+'update_time' version string; blog records always have a 'slug'.
+
+Backend selection (create_storage):
+    STORAGE_BACKEND: 'firestore' (default), 'sqlite' or 'memory'
+    STORAGE_SQLITE_PATH: database file for the sqlite backend
+    STORAGE_FIXTURES: JSON file ({collection: {id: document}}) loaded into
+        the memory or sqlite backend at startup
+
+Usage in app.py:
+    from storage import create_storage, SERVER_TIMESTAMP
+
+    storage = create_storage()
+    posts = storage.list_blogs(limit=3)
+    storage.add_submission('contact_submissions', {..., 'timestamp': SERVER_TIMESTAMP})
+"""
+
+import abc
+import argparse
+import copy
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from content_store import FIRESTORE_READ_TIMEOUT, _decode_value, _encode_value
+
+
+CONTENT_COLLECTIONS = ('blogs', 'courses', 'team_members')
+SUBMISSION_COLLECTIONS = (
+    'contact_submissions',
+    'newsletter_subscribers',
+    'course_enrollments',
+    'partnership_applications',
+)
+
+# Timestamp each submission collection is ordered and filtered by
+SUBMISSION_DATE_FIELDS = {
+    'contact_submissions': 'timestamp',
+    'newsletter_subscribers': 'subscribed_at',
+    'course_enrollments': 'enrolled_at',
+    'partnership_applications': 'submitted_at',
+}
+
+# Longest document ID or slug accepted from clients
+DOCUMENT_ID_MAX_LENGTH = int(os.getenv('DOCUMENT_ID_MAX_LENGTH', '128'))
+# Firestore reserves __name__-style IDs
+RESERVED_ID_RE = re.compile(r'^__.*__$')
+
+
+class _ServerTimestamp:
+    """Placeholder resolved to the write time by whichever backend stores it."""
+
+    def __repr__(self):
+        return 'SERVER_TIMESTAMP'
+
+
+SERVER_TIMESTAMP = _ServerTimestamp()
+
+
+def doc_version(doc):
+    """Stable version string for a Firestore document snapshot."""
+    update_time = getattr(doc, 'update_time', None)
+    if update_time is None:
+        return ''
+    return update_time.isoformat() if hasattr(update_time, 'isoformat') else str(update_time)
+
+
+def is_valid_document_id(doc_id):
+    """
+    Whether a client-supplied document ID or slug can be looked up without
+    the read failing.
+
+    Firestore rejects empty IDs, '.' and '..', IDs containing '/' and
+    reserved __.*__ IDs; such reads would otherwise count as backend failures.
+    """
+    return (
+        isinstance(doc_id, str)
+        and 0 < len(doc_id) <= DOCUMENT_ID_MAX_LENGTH
+        and '/' not in doc_id
+        and doc_id not in ('.', '..')
+        and not RESERVED_ID_RE.match(doc_id)
+    )
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _resolve_timestamps(data, value):
+    return {k: (value if v is SERVER_TIMESTAMP else v) for k, v in data.items()}
+
+
+def _sort_key(value):
+    """Comparable form of a createdAt value (datetimes or strings)."""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _project(data, fields):
+    """
+    Keep only the given (dotted) field paths of a document, as a Firestore
+    projection would; id and update_time are always kept.
+    """
+    if fields is None:
+        return data
+    projected = {key: data[key] for key in ('id', 'update_time') if key in data}
+    for path in fields:
+        parts = path.split('.')
+        value = data
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return projected
+
+
+def _check_submission_collection(collection):
+    if collection not in SUBMISSION_COLLECTIONS:
+        raise ValueError(f"Unknown submission collection '{collection}'")
+
+
+class Storage(abc.ABC):
+    """
+    Interface shared by all backends.
+
+    Reads raise on backend errors; callers wrap them in fetch_with_fallback.
+    """
+
+    @abc.abstractmethod
+    def list_blogs(self, status='published', limit=None, newest_first=True):
+        """
+        Blog posts with the given status.
+
+        With newest_first, posts are ordered by createdAt descending and,
+        as in Firestore, posts without createdAt are left out.
+        """
+
+    @abc.abstractmethod
+    def get_blog(self, slug):
+        """Blog post by slug, falling back to document ID; None if missing."""
+
+    @abc.abstractmethod
+    def list_courses(self, status='published', category=None):
+        """Courses with the given status, optionally in one category."""
+
+    @abc.abstractmethod
+    def get_course(self, course_id):
+        """Course by document ID; None if missing."""
+
+    @abc.abstractmethod
+    def get_courses(self, course_ids, fields=None):
+        """
+        Several courses in one round trip.
+
+        Args:
+            course_ids: Document IDs
+            fields: Field paths to return (all when None)
+
+        Returns:
+            {course_id: course} for the courses that exist
+        """
+
+    @abc.abstractmethod
+    def list_team_members(self, status='active'):
+        """Team members with the given status."""
+
+    @abc.abstractmethod
+    def add_submission(self, collection, data, doc_id=None):
+        """
+        Store a form submission.
+
+        Args:
+            collection: One of SUBMISSION_COLLECTIONS
+            data: Document fields; SERVER_TIMESTAMP values become the write time
+            doc_id: Document ID to use instead of a generated one
+
+        Returns:
+            The document ID
+        """
+
+    def create_submission(self, collection, doc_id, data):
+        """
+        Store a submission under doc_id unless that document already exists.
+
+        Returns:
+            The stored document: data if it was written, otherwise the
+            existing document (e.g. from a racing retry)
+        """
+        _check_submission_collection(collection)
+        return self.create_document(collection, doc_id, data)[1]
+
+    @abc.abstractmethod
+    def create_document(self, collection, doc_id, data):
+        """
+        Write a document unless one with that ID already exists, atomically.
+
+        Returns:
+            (True, data) if it was written, otherwise (False, the existing
+            document)
+        """
+
+    @abc.abstractmethod
+    def find_submission(self, collection, field, value):
+        """First submission whose field equals value, or None."""
+
+    @abc.abstractmethod
+    def add_enrollment(self, data, course_id, shard, doc_id=None):
+        """
+        Store a course_enrollments submission and add one to the course's
+        counter shard in the same atomic write. With doc_id, nothing is
+        written or counted if that enrollment already exists.
+
+        Returns:
+            The enrollment document ID
+        """
+
+    @abc.abstractmethod
+    def read_enrollment_count(self, course_id):
+        """Sum of a course's counter shards."""
+
+    @abc.abstractmethod
+    def set_enrolled_count(self, course_id, count):
+        """Write the rolled-up count into the course document."""
+
+    @abc.abstractmethod
+    def page_submissions(self, collection, start=None, end=None, after=None, limit=500):
+        """
+        One page of submissions ordered by their date field, then ID.
+
+        Args:
+            collection: One of SUBMISSION_COLLECTIONS
+            start: Only submissions at or after this datetime
+            end: Only submissions before this datetime
+            after: (datetime, doc_id) of the last row already returned
+            limit: Page size
+        """
+
+    @abc.abstractmethod
+    def all_documents(self, collection):
+        """Every document in a collection, in no particular order."""
+
+    @abc.abstractmethod
+    def put(self, collection, doc_id, data):
+        """Create or replace a document (fixtures, copying, idempotency records)."""
+
+    def load_fixtures(self, path):
+        """Load a {collection: {id: document}} JSON file; returns the count."""
+        with open(path, 'r', encoding='utf-8') as fh:
+            fixtures = json.load(fh, object_hook=_decode_value)
+        count = 0
+        for collection, docs in fixtures.items():
+            for doc_id, data in docs.items():
+                self.put(collection, doc_id, data)
+                count += 1
+        return count
+
+    def close(self):
+        pass
+
+
+class FirestoreStorage(Storage):
+    """Storage on a google.cloud.firestore.Client."""
+
+    def __init__(self, client, timeout=FIRESTORE_READ_TIMEOUT):
+        self.client = client
+        self.timeout = timeout
+
+    @staticmethod
+    def _record(doc):
+        data = doc.to_dict()
+        data['id'] = doc.id
+        data['update_time'] = doc_version(doc)
+        return data
+
+    def _blog_record(self, doc):
+        data = self._record(doc)
+        data.setdefault('slug', doc.id)
+        return data
+
+    def list_blogs(self, status='published', limit=None, newest_first=True):
+        query = self.client.collection('blogs').where('status', '==', status)
+        if newest_first:
+            query = query.order_by('createdAt', direction='DESCENDING')
+        if limit:
+            query = query.limit(limit)
+        return [self._blog_record(doc) for doc in query.stream(timeout=self.timeout)]
+
+    def get_blog(self, slug):
+        docs = list(self.client.collection('blogs').where('slug', '==', slug).limit(1).stream(timeout=self.timeout))
+        if not docs:
+            doc = self.client.collection('blogs').document(slug).get(timeout=self.timeout)
+            if doc.exists:
+                docs = [doc]
+        return self._blog_record(docs[0]) if docs else None
+
+    def list_courses(self, status='published', category=None):
+        query = self.client.collection('courses')
+        if category is not None:
+            query = query.where('category', '==', category)
+        query = query.where('status', '==', status)
+        return [self._record(doc) for doc in query.stream(timeout=self.timeout)]
+
+    def get_course(self, course_id):
+        doc = self.client.collection('courses').document(course_id).get(timeout=self.timeout)
+        return self._record(doc) if doc.exists else None
+
+    def get_courses(self, course_ids, fields=None):
+        collection = self.client.collection('courses')
+        refs = [collection.document(course_id) for course_id in course_ids]
+        if not refs:
+            return {}
+        docs = self.client.get_all(refs, field_paths=list(fields) if fields is not None else None,
+                                   timeout=self.timeout)
+        return {doc.id: self._record(doc) for doc in docs if doc.exists}
+
+    def list_team_members(self, status='active'):
+        query = self.client.collection('team_members').where('status', '==', status)
+        return [self._record(doc) for doc in query.stream(timeout=self.timeout)]
+
+    def add_submission(self, collection, data, doc_id=None):
+        from google.cloud import firestore
+
+        _check_submission_collection(collection)
+        data = _resolve_timestamps(data, firestore.SERVER_TIMESTAMP)
+        if doc_id:
+            self.client.collection(collection).document(doc_id).set(data, timeout=self.timeout)
+            return doc_id
+        _, ref = self.client.collection(collection).add(data, timeout=self.timeout)
+        return ref.id
+
+    def create_document(self, collection, doc_id, data):
+        from google.api_core.exceptions import AlreadyExists
+        from google.cloud import firestore
+
+        ref = self.client.collection(collection).document(doc_id)
+        try:
+            ref.create(_resolve_timestamps(data, firestore.SERVER_TIMESTAMP), timeout=self.timeout)
+        except AlreadyExists:
+            return False, self._record(ref.get(timeout=self.timeout))
+        return True, dict(data, id=doc_id)
+
+    def find_submission(self, collection, field, value):
+        docs = list(self.client.collection(collection).where(field, '==', value).limit(1).stream(timeout=self.timeout))
+        return self._record(docs[0]) if docs else None
+
+    def _shards(self, course_id):
+        return self.client.collection('courses').document(course_id).collection('enrollment_shards')
+
+    def add_enrollment(self, data, course_id, shard, doc_id=None):
+        from google.api_core.exceptions import AlreadyExists
+        from google.cloud import firestore
+
+        enrollment_ref = self.client.collection('course_enrollments').document(doc_id)
+        # A batch commits atomically; the Increment transform needs no read,
+        # so concurrent enrollments on one shard do not contend
+        batch = self.client.batch()
+        batch.create(enrollment_ref, _resolve_timestamps(data, firestore.SERVER_TIMESTAMP))
+        batch.set(self._shards(course_id).document(str(shard)), {'count': firestore.Increment(1)}, merge=True)
+        try:
+            batch.commit(timeout=self.timeout)
+        except AlreadyExists:
+            # Same idempotent enrollment already recorded (and counted)
+            pass
+        return enrollment_ref.id
+
+    def read_enrollment_count(self, course_id):
+        return sum((doc.to_dict() or {}).get('count', 0) for doc in self._shards(course_id).stream(timeout=self.timeout))
+
+    def set_enrolled_count(self, course_id, count):
+        self.client.collection('courses').document(course_id).update({'enrolled_count': count}, timeout=self.timeout)
+
+    def page_submissions(self, collection, start=None, end=None, after=None, limit=500):
+        _check_submission_collection(collection)
+        field = SUBMISSION_DATE_FIELDS[collection]
+        ref = self.client.collection(collection)
+        query = ref.order_by(field).order_by('__name__')
+        if start is not None:
+            query = query.where(field, '>=', start)
+        if end is not None:
+            query = query.where(field, '<', end)
+        if after is not None:
+            query = query.start_after({field: after[0], '__name__': ref.document(after[1])})
+        return [self._record(doc) for doc in query.limit(limit).stream(timeout=self.timeout)]
+
+    def all_documents(self, collection):
+        return [self._record(doc) for doc in self.client.collection(collection).stream(timeout=self.timeout)]
+
+    def put(self, collection, doc_id, data):
+        self.client.collection(collection).document(doc_id).set(data, timeout=self.timeout)
+
+    def close(self):
+        self.client.close()
+
+
+class MemoryStorage(Storage):
+    """Dict-backed storage; documents are deep-copied in and out."""
+
+    def __init__(self):
+        self._collections = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        # Serializes check-then-write for create_document
+        self._create_lock = threading.Lock()
+        self._next_id = 0
+
+    def _docs(self, collection):
+        with self._lock:
+            docs = [dict(data, id=doc_id) for doc_id, data in self._collections.get(collection, {}).items()]
+        return copy.deepcopy(docs)
+
+    def put(self, collection, doc_id, data):
+        data = copy.deepcopy(_resolve_timestamps(data, _now()))
+        data.pop('id', None)
+        data['update_time'] = _now().isoformat()
+        if collection == 'blogs':
+            data.setdefault('slug', doc_id)
+        with self._lock:
+            self._collections.setdefault(collection, {})[doc_id] = data
+
+    def list_blogs(self, status='published', limit=None, newest_first=True):
+        posts = [p for p in self._docs('blogs') if p.get('status') == status]
+        if newest_first:
+            posts = [p for p in posts if p.get('createdAt') is not None]
+            posts.sort(key=lambda p: _sort_key(p['createdAt']), reverse=True)
+        return posts[:limit] if limit else posts
+
+    def get_blog(self, slug):
+        posts = self._docs('blogs')
+        for post in posts:
+            if post.get('slug') == slug:
+                return post
+        for post in posts:
+            if post['id'] == slug:
+                return post
+        return None
+
+    def list_courses(self, status='published', category=None):
+        return [c for c in self._docs('courses')
+                if c.get('status') == status and (category is None or c.get('category') == category)]
+
+    def _get(self, collection, doc_id):
+        with self._lock:
+            data = self._collections.get(collection, {}).get(doc_id)
+        return copy.deepcopy(dict(data, id=doc_id)) if data is not None else None
+
+    def get_course(self, course_id):
+        return self._get('courses', course_id)
+
+    def get_courses(self, course_ids, fields=None):
+        courses = {}
+        for course_id in course_ids:
+            course = self._get('courses', course_id)
+            if course is not None:
+                courses[course_id] = _project(course, fields)
+        return courses
+
+    def list_team_members(self, status='active'):
+        return [m for m in self._docs('team_members') if m.get('status') == status]
+
+    def add_submission(self, collection, data, doc_id=None):
+        _check_submission_collection(collection)
+        if not doc_id:
+            with self._lock:
+                self._next_id += 1
+                doc_id = f'{collection}-{self._next_id}'
+        self.put(collection, doc_id, data)
+        return doc_id
+
+    def find_submission(self, collection, field, value):
+        for doc in self._docs(collection):
+            if doc.get(field) == value:
+                return doc
+        return None
+
+    def create_document(self, collection, doc_id, data):
+        with self._create_lock:
+            existing = self._get(collection, doc_id)
+            if existing is not None:
+                return False, existing
+            self.put(collection, doc_id, data)
+        return True, dict(data, id=doc_id)
+
+    def add_enrollment(self, data, course_id, shard, doc_id=None):
+        if doc_id:
+            with self._create_lock:
+                if self._get('course_enrollments', doc_id) is not None:
+                    return doc_id
+                self.put('course_enrollments', doc_id, data)
+        else:
+            doc_id = self.add_submission('course_enrollments', data)
+        with self._lock:
+            shards = self._counters.setdefault(course_id, {})
+            shards[shard] = shards.get(shard, 0) + 1
+        return doc_id
+
+    def read_enrollment_count(self, course_id):
+        with self._lock:
+            return sum(self._counters.get(course_id, {}).values())
+
+    def set_enrolled_count(self, course_id, count):
+        course = self.get_course(course_id)
+        if course is None:
+            raise KeyError(course_id)
+        course['enrolled_count'] = count
+        self.put('courses', course_id, course)
+
+    def page_submissions(self, collection, start=None, end=None, after=None, limit=500):
+        _check_submission_collection(collection)
+        field = SUBMISSION_DATE_FIELDS[collection]
+        rows = []
+        for doc in self._docs(collection):
+            if doc.get(field) is None:
+                continue
+            key = (_sort_key(doc[field]), doc['id'])
+            if start is not None and key[0] < _sort_key(start):
+                continue
+            if end is not None and key[0] >= _sort_key(end):
+                continue
+            if after is not None and key <= (_sort_key(after[0]), after[1]):
+                continue
+            rows.append((key, doc))
+        rows.sort(key=lambda row: row[0])
+        return [doc for _, doc in rows[:limit]]
+
+    def all_documents(self, collection):
+        return self._docs(collection)
+
+
+class SQLiteStorage(Storage):
+    """
+    Single-file storage: one documents table holding JSON bodies, with the
+    queried fields (status, slug, category, email, createdAt) in indexed
+    columns. For submissions, created_at holds the collection's date field.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            collection TEXT NOT NULL,
+            id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            status TEXT,
+            slug TEXT,
+            category TEXT,
+            email TEXT,
+            created_at TEXT,
+            update_time TEXT NOT NULL,
+            PRIMARY KEY (collection, id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_documents_slug ON documents (collection, slug);
+        CREATE INDEX IF NOT EXISTS idx_documents_category_status ON documents (collection, category, status);
+        CREATE INDEX IF NOT EXISTS idx_documents_status_created ON documents (collection, status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_documents_email ON documents (collection, email);
+        CREATE INDEX IF NOT EXISTS idx_documents_created_id ON documents (collection, created_at, id);
+        CREATE TABLE IF NOT EXISTS counter_shards (
+            name TEXT NOT NULL,
+            shard INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (name, shard)
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row(row) for row in rows]
+
+    @staticmethod
+    def _row(row):
+        doc_id, body, update_time = row
+        data = json.loads(body, object_hook=_decode_value)
+        data['id'] = doc_id
+        data['update_time'] = update_time
+        return data
+
+    def put(self, collection, doc_id, data):
+        with self._lock, self._conn:
+            self._put(collection, doc_id, data)
+
+    def _put(self, collection, doc_id, data, replace=True):
+        """Write a document; returns False if replace=False and it exists."""
+        data = _resolve_timestamps(data, _now())
+        data.pop('id', None)
+        data.pop('update_time', None)
+        if collection == 'blogs':
+            data.setdefault('slug', doc_id)
+        created = data.get(SUBMISSION_DATE_FIELDS.get(collection, 'createdAt'))
+        cursor = self._conn.execute(
+            f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (collection, doc_id, json.dumps(data, default=_encode_value),
+             data.get('status'), data.get('slug'), data.get('category'), data.get('email'),
+             _sort_key(created) if created is not None else None, _now().isoformat())
+        )
+        return cursor.rowcount > 0
+
+    def list_blogs(self, status='published', limit=None, newest_first=True):
+        sql = "SELECT id, data, update_time FROM documents WHERE collection = 'blogs' AND status = ?"
+        if newest_first:
+            sql += ' AND created_at IS NOT NULL ORDER BY created_at DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self._query(sql, (status,))
+
+    def get_blog(self, slug):
+        rows = self._query(
+            "SELECT id, data, update_time FROM documents WHERE collection = 'blogs' AND slug = ? LIMIT 1", (slug,))
+        if not rows:
+            rows = self._query(
+                "SELECT id, data, update_time FROM documents WHERE collection = 'blogs' AND id = ?", (slug,))
+        return rows[0] if rows else None
+
+    def list_courses(self, status='published', category=None):
+        if category is None:
+            return self._query(
+                "SELECT id, data, update_time FROM documents WHERE collection = 'courses' AND status = ?", (status,))
+        return self._query(
+            "SELECT id, data, update_time FROM documents WHERE collection = 'courses' AND category = ? AND status = ?",
+            (category, status))
+
+    def get_course(self, course_id):
+        rows = self._query(
+            "SELECT id, data, update_time FROM documents WHERE collection = 'courses' AND id = ?", (course_id,))
+        return rows[0] if rows else None
+
+    def get_courses(self, course_ids, fields=None):
+        course_ids = list(course_ids)
+        if not course_ids:
+            return {}
+        placeholders = ', '.join('?' * len(course_ids))
+        rows = self._query(
+            f"SELECT id, data, update_time FROM documents WHERE collection = 'courses' AND id IN ({placeholders})",
+            course_ids)
+        return {row['id']: _project(row, fields) for row in rows}
+
+    def list_team_members(self, status='active'):
+        return self._query(
+            "SELECT id, data, update_time FROM documents WHERE collection = 'team_members' AND status = ?", (status,))
+
+    def add_submission(self, collection, data, doc_id=None):
+        _check_submission_collection(collection)
+        doc_id = doc_id or os.urandom(10).hex()
+        self.put(collection, doc_id, data)
+        return doc_id
+
+    def find_submission(self, collection, field, value):
+        if field in ('status', 'email'):
+            rows = self._query(
+                f'SELECT id, data, update_time FROM documents WHERE collection = ? AND {field} = ? LIMIT 1',
+                (collection, value))
+            return rows[0] if rows else None
+        for doc in self.all_documents(collection):
+            if doc.get(field) == value:
+                return doc
+        return None
+
+    def create_document(self, collection, doc_id, data):
+        with self._lock, self._conn:
+            created = self._put(collection, doc_id, data, replace=False)
+        if created:
+            return True, dict(data, id=doc_id)
+        return False, self._query('SELECT id, data, update_time FROM documents WHERE collection = ? AND id = ?',
+                                  (collection, doc_id))[0]
+
+    def add_enrollment(self, data, course_id, shard, doc_id=None):
+        doc_id = doc_id or os.urandom(10).hex()
+        with self._lock, self._conn:
+            if not self._put('course_enrollments', doc_id, data, replace=False):
+                return doc_id
+            self._conn.execute(
+                'INSERT INTO counter_shards VALUES (?, ?, 1) '
+                'ON CONFLICT (name, shard) DO UPDATE SET count = count + 1',
+                (f'enrollments:{course_id}', shard)
+            )
+        return doc_id
+
+    def read_enrollment_count(self, course_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COALESCE(SUM(count), 0) FROM counter_shards WHERE name = ?',
+                (f'enrollments:{course_id}',)
+            ).fetchone()
+        return row[0]
+
+    def set_enrolled_count(self, course_id, count):
+        # BEGIN IMMEDIATE takes the write lock before the read, so another
+        # process can't replace the course between reading and writing it
+        with self._lock, self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            rows = self._conn.execute(
+                "SELECT id, data, update_time FROM documents WHERE collection = 'courses' AND id = ?",
+                (course_id,)
+            ).fetchall()
+            if not rows:
+                raise KeyError(course_id)
+            course = self._row(rows[0])
+            course['enrolled_count'] = count
+            self._put('courses', course_id, course)
+
+    def page_submissions(self, collection, start=None, end=None, after=None, limit=500):
+        _check_submission_collection(collection)
+        sql = 'SELECT id, data, update_time FROM documents WHERE collection = ? AND created_at IS NOT NULL'
+        params = [collection]
+        if start is not None:
+            sql += ' AND created_at >= ?'
+            params.append(_sort_key(start))
+        if end is not None:
+            sql += ' AND created_at < ?'
+            params.append(_sort_key(end))
+        if after is not None:
+            sql += ' AND (created_at, id) > (?, ?)'
+            params += [_sort_key(after[0]), after[1]]
+        sql += ' ORDER BY created_at, id LIMIT ?'
+        params.append(limit)
+        return self._query(sql, params)
+
+    def all_documents(self, collection):
+        return self._query('SELECT id, data, update_time FROM documents WHERE collection = ?', (collection,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_storage(backend=None):
+    """
+    Build the configured backend.
+
+    Returns:
+        A Storage, or None if the Firestore client could not be created
+    """
+    backend = backend or os.getenv('STORAGE_BACKEND', 'firestore')
+    if backend == 'firestore':
+        try:
+            from firestore_client import create_client
+
+            client = create_client()
+            print("Firestore initialized successfully!")
+            return FirestoreStorage(client)
+        except Exception as e:
+            print(f"Error initializing Firestore: {e}")
+            return None
+
+    if backend == 'sqlite':
+        storage = SQLiteStorage(os.getenv('STORAGE_SQLITE_PATH', 'medtalks.sqlite3'))
+    elif backend == 'memory':
+        storage = MemoryStorage()
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND '{backend}'")
+
+    fixtures = os.getenv('STORAGE_FIXTURES')
+    if fixtures:
+        print(f"Loaded {storage.load_fixtures(fixtures)} fixture documents into {backend} storage")
+    return storage
+
+
+def copy_collections(source, target, collections=CONTENT_COLLECTIONS):
+    """Copy whole collections between backends; returns the document count."""
+    count = 0
+    for collection in collections:
+        for doc in source.all_documents(collection):
+            doc_id = doc.pop('id')
+            doc.pop('update_time', None)
+            target.put(collection, doc_id, doc)
+            count += 1
+    return count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Copy site content from Firestore into a local SQLite file.')
+    parser.add_argument('path', help='SQLite database file to create or update')
+    parser.add_argument('--include-submissions', action='store_true',
+                        help='Also copy form submissions (personal data).')
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    source = create_storage('firestore')
+    if source is None:
+        raise SystemExit(1)
+    collections = CONTENT_COLLECTIONS + (SUBMISSION_COLLECTIONS if args.include_submissions else ())
+    target = SQLiteStorage(args.path)
+    print(f"Copied {copy_collections(source, target, collections)} documents to {args.path}")
+    target.close()
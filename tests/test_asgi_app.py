@@ -0,0 +1,57 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('quart')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+os.environ.setdefault('ENROLLMENT_ROLLUP_SECONDS', '0')
+os.environ['STORAGE_BACKEND'] = 'memory'
+
+import asgi_app
+
+
+def run(scenario):
+    async def main():
+        async with asgi_app.app.test_app() as test_app:
+            storage = asgi_app.storage
+            storage.put('blogs', 'post-1', {'title': 'Heart sounds', 'slug': 'heart-sounds', 'status': 'published',
+                                            'content': '<p>Hi</p>', 'createdAt': '2024-01-01T00:00:00'})
+            storage.put('courses', 'cardio-101', {'title': 'Cardiology', 'status': 'published',
+                                                  'category': 'doctalks', 'sections': []})
+            await scenario(test_app.test_client(), storage)
+    asyncio.run(main())
+
+
+def test_pages_read_through_the_storage_layer():
+    async def scenario(client, storage):
+        assert (await client.get('/')).status_code == 200
+        assert (await client.get('/blog/heart-sounds')).status_code == 200
+        assert (await client.get('/course/cardio-101')).status_code == 200
+        for slug in ('__x__', 'a' * 300):
+            assert (await client.get(f'/blog/{slug}')).status_code == 302
+        assert (await client.get('/course/__x__')).status_code == 302
+    run(scenario)
+
+
+def test_enrollment_is_validated_counted_and_idempotent():
+    async def scenario(client, storage):
+        unknown = await client.post('/api/course/enroll', json={'course_id': '__x__', 'email': 'a@example.com'})
+        assert unknown.status_code == 400
+
+        body = {'course_id': 'cardio-101', 'email': 'a@example.com'}
+        headers = {'Idempotency-Key': 'enroll-key-0001'}
+        first = await client.post('/api/course/enroll', json=body, headers=headers)
+        retry = await client.post('/api/course/enroll', json=body, headers=headers)
+        assert first.status_code == retry.status_code == 200
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert storage.read_enrollment_count('cardio-101') == 1
+        assert len(storage.all_documents('course_enrollments')) == 1
+
+        other = await client.post('/api/course/enroll', json=dict(body, email='b@example.com'), headers=headers)
+        assert other.status_code == 422
+    run(scenario)
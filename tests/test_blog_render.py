@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+from blog_render import process_html
+
+
+def test_embed_is_dropped_without_swallowing_the_rest():
+    html, words, toc = process_html('<p>Intro</p><embed src="x"><h2>Dosage</h2><p>Rest</p>')
+    assert 'embed' not in html
+    assert html.startswith('<p>Intro</p>')
+    assert 'Dosage</h2><p>Rest</p>' in html
+    assert words == 3
+    assert [entry['text'] for entry in toc] == ['Dosage']
+
+
+def test_self_closed_drop_tags_do_not_hide_later_content():
+    html, words, _ = process_html('<p>Intro</p><embed src="x"/><script/><p>Rest</p>')
+    assert html == '<p>Intro</p><p>Rest</p>'
+    assert words == 2
+
+
+def test_script_content_is_still_dropped():
+    html, words, _ = process_html('<p>Intro</p><script>alert(1)</script><p>Rest</p>')
+    assert html == '<p>Intro</p><p>Rest</p>'
+    assert words == 2
@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+from catalog import BLOG, ContentCatalog
+from storage import MemoryStorage
+
+
+def make_catalog(tmp_path, **kwargs):
+    storage = MemoryStorage()
+    storage.put('blogs', 'post-1', {'title': 'One', 'status': 'published'})
+    catalog = ContentCatalog(snapshot_path=str(tmp_path / 'catalog.snap'), **kwargs)
+    catalog.set_storage(storage)
+    return catalog, storage
+
+
+def test_failed_storage_read_keeps_the_published_generation(tmp_path):
+    catalog, storage = make_catalog(tmp_path, refresh_interval=0, publish_retry=60)
+    catalog.refresh()
+    generation = catalog.snapshot.view.generation
+
+    def unavailable(*args, **kwargs):
+        raise TimeoutError('backend unavailable')
+
+    storage.list_blogs = unavailable
+    catalog.refresh()
+    catalog.refresh()
+    assert catalog.snapshot.view.generation == generation
+    assert list(catalog.blogs) == ['post-1']
+
+
+def test_first_load_is_not_reported_per_document(tmp_path):
+    catalog, storage = make_catalog(tmp_path, refresh_interval=0)
+    changes, refreshes = [], []
+    catalog.subscribe(lambda kind, doc_id, doc: changes.append((kind, doc_id)))
+    catalog.after_refresh(refreshes.append)
+
+    catalog.refresh()
+    assert changes == []
+    assert refreshes == [True]
+
+    storage.put('blogs', 'post-2', {'title': 'Two', 'status': 'published'})
+    catalog.refresh()
+    assert changes == [(BLOG, 'post-2')]
+    assert refreshes == [True, False]
@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+import content_store
+from content_store import CircuitBreaker, LastKnownGoodStore, fetch_with_fallback
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    monkeypatch.setattr(content_store, 'breaker', breaker)
+    monkeypatch.setattr(content_store, 'store', LastKnownGoodStore())
+    return breaker
+
+
+def _raise(error):
+    def load():
+        raise error
+    return load
+
+
+def test_client_errors_do_not_open_the_circuit(breaker):
+    for _ in range(breaker.failure_threshold + 2):
+        with pytest.raises(ValueError):
+            fetch_with_fallback('blog:..', _raise(ValueError('bad document path')))
+    assert breaker.state == breaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_backend_errors_open_the_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(TimeoutError):
+            fetch_with_fallback('blogs:recent:3', _raise(TimeoutError()))
+    assert breaker.state == breaker.OPEN
+
+
+def test_client_error_hands_back_the_half_open_trial(breaker):
+    breaker.state = breaker.OPEN
+    breaker.opened_at = 0.0
+    with pytest.raises(ValueError):
+        fetch_with_fallback('blog:..', _raise(ValueError('bad document path')))
+    assert fetch_with_fallback('blogs:recent:3', lambda: []) == []
+    assert breaker.state == breaker.CLOSED
+
+
+def test_not_found_results_are_not_stored(breaker):
+    assert fetch_with_fallback('blog:missing', lambda: None) is None
+    assert content_store.store.get('blog:missing') == (False, None)
+
+    fetch_with_fallback('blog:post', lambda: {'id': 'post'})
+    assert content_store.store.get('blog:post') == (True, {'id': 'post'})
+
+
+def test_snapshot_is_only_written_by_save(tmp_path):
+    path = tmp_path / 'snapshot.json'
+    store = LastKnownGoodStore(snapshot_path=str(path), snapshot_interval=0)
+    store.put('blog:post', {'id': 'post'})
+    assert not path.exists()
+
+    store.save_snapshot()
+    restored = LastKnownGoodStore(snapshot_path=str(path))
+    assert restored.load_snapshot() == 1
+    assert restored.get('blog:post') == (True, {'id': 'post'})
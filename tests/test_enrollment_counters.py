@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+from enrollment_counters import EnrollmentRollup
+from storage import MemoryStorage, SERVER_TIMESTAMP
+
+
+def enroll(storage, course_id, email):
+    storage.add_enrollment({'email': email, 'enrolled_at': SERVER_TIMESTAMP}, course_id, 0)
+
+
+def test_each_worker_only_writes_changed_counts():
+    storage = MemoryStorage()
+    storage.put('courses', 'c1', {'title': 'Cardio', 'status': 'published'})
+    storage.put('courses', 'c2', {'title': 'Teeth', 'status': 'published'})
+    enroll(storage, 'c1', 'a@example.com')
+
+    assert EnrollmentRollup().run_once(storage, ['c1', 'c2', 'gone']) == {'c1': 1}
+    update_time = storage.get_course('c1')['update_time']
+
+    # A worker started after a deploy knows nothing it has written before
+    fresh = EnrollmentRollup()
+    assert fresh.run_once(storage, ['c1', 'c2']) == {}
+    assert storage.get_course('c1')['update_time'] == update_time
+
+    enroll(storage, 'c1', 'b@example.com')
+    fresh.mark_dirty('c1')
+    assert fresh.run_once(storage) == {'c1': 2}
+    assert storage.get_course('c1')['enrolled_count'] == 2
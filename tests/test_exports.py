@@ -0,0 +1,89 @@
+import csv
+import io
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+os.environ.setdefault('ENROLLMENT_ROLLUP_SECONDS', '0')
+os.environ.setdefault('SITE_URL', 'https://medtalks.example')
+os.environ['STORAGE_BACKEND'] = 'memory'
+
+import app as medtalks
+import exports
+from exports import export_rows
+from storage import MemoryStorage
+
+TOKEN = 'export-test-token'
+URL = '/api/export/contact_submissions.csv'
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = MemoryStorage()
+    monkeypatch.setattr(medtalks, 'storage', storage)
+    monkeypatch.setattr(exports, 'EXPORT_API_TOKEN', TOKEN)
+    return storage
+
+
+@pytest.fixture
+def client():
+    return medtalks.app.test_client()
+
+
+def auth(token=TOKEN):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def read_csv(response):
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+def add_contacts(storage, count):
+    # Pairs of submissions share a timestamp, so paging must break ties by ID
+    for n in range(count):
+        storage.add_submission('contact_submissions', {
+            'name': f'Person {n}',
+            'timestamp': datetime(2024, 1, 1 + n // 2, tzinfo=timezone.utc),
+        })
+
+
+def test_export_requires_the_token(storage, client, monkeypatch):
+    assert client.get(URL).status_code == 401
+    assert client.get(URL, headers=auth('wrong')).status_code == 401
+    assert client.get(URL, headers={'Authorization': TOKEN}).status_code == 401
+    assert client.get(URL, headers=auth()).status_code == 200
+
+    monkeypatch.setattr(exports, 'EXPORT_API_TOKEN', '')
+    assert client.get(URL, headers=auth('')).status_code == 403
+
+
+def test_pages_have_no_duplicates_or_gaps(storage):
+    add_contacts(storage, 7)
+    ids = [doc['id'] for doc in export_rows(storage, 'contact_submissions', page_size=2)]
+    assert len(ids) == len(set(ids)) == 7
+
+
+def test_cursor_resumes_after_the_last_row(storage, client):
+    add_contacts(storage, 7)
+    rows = read_csv(client.get(URL, headers=auth()))
+    assert len(rows) == 7
+
+    resumed = read_csv(client.get(f"{URL}?cursor={rows[2]['cursor']}", headers=auth()))
+    assert [row['id'] for row in resumed] == [row['id'] for row in rows[3:]]
+    assert client.get(f'{URL}?cursor=not-a-cursor', headers=auth()).status_code == 400
+
+
+def test_formula_cells_are_escaped(storage, client):
+    names = ['=HYPERLINK("http://evil.test")', '+1', '-2', '@SUM(A1)', 'Plain name']
+    for n, name in enumerate(names):
+        storage.add_submission('contact_submissions', {
+            'name': name,
+            'timestamp': datetime(2024, 1, 1 + n, tzinfo=timezone.utc),
+        })
+    rows = read_csv(client.get(URL, headers=auth()))
+    assert [row['name'] for row in rows] == ["'" + name for name in names[:4]] + ['Plain name']
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import sys
+import uuid
+
+import pytest
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+import idempotency
+from idempotency import idempotent, idempotent_document_id
+from storage import MemoryStorage, SQLiteStorage
+
+
+def make_app(get_storage):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+
+    @app.route('/apply', methods=['POST'])
+    @idempotent
+    def apply():
+        doc = {'name': request.get_json()['name'], 'reference_number': uuid.uuid4().hex}
+        stored = get_storage().create_submission('partnership_applications', idempotent_document_id(), doc)
+        return jsonify({'success': True, 'reference_number': stored['reference_number']}), 200
+
+    @app.route('/subscribe', methods=['POST'])
+    @idempotent
+    def subscribe():
+        email = request.get_json()['email']
+        if get_storage().find_submission('newsletter_subscribers', 'email', email):
+            return jsonify({'success': False, 'message': 'This email is already subscribed'}), 400
+        get_storage().add_submission('newsletter_subscribers', {'email': email})
+        return jsonify({'success': True}), 200
+
+    return app
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path, monkeypatch):
+    """(storage, factory for another process's storage on the same data)."""
+    if request.param == 'memory':
+        storage = MemoryStorage()
+        other = lambda: storage
+    else:
+        path = str(tmp_path / 'site.sqlite3')
+        storage = SQLiteStorage(path)
+        other = lambda: SQLiteStorage(path)
+    monkeypatch.setattr(idempotency, '_storage', storage)
+    idempotency.responses.clear()
+    yield storage, other
+    idempotency.responses.clear()
+
+
+def post(client, path, body, key='retry-key-0001'):
+    return client.post(path, json=body, headers={'Idempotency-Key': key})
+
+
+def switch_process(monkeypatch, other):
+    """Forget this worker's cache and talk to storage as another process would."""
+    storage = other()
+    idempotency.responses.clear()
+    monkeypatch.setattr(idempotency, '_storage', storage)
+    return storage
+
+
+def test_retry_is_replayed(backend):
+    storage, _ = backend
+    client = make_app(lambda: storage).test_client()
+    first = post(client, '/apply', {'name': 'Ada'})
+    retry = post(client, '/apply', {'name': 'Ada'})
+    assert retry.status_code == 200
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json()['reference_number'] == first.get_json()['reference_number']
+
+
+def test_reused_key_with_other_body_is_rejected(backend, monkeypatch):
+    storage, other = backend
+    client = make_app(lambda: storage).test_client()
+    post(client, '/apply', {'name': 'Ada'})
+    assert post(client, '/apply', {'name': 'Grace'}).status_code == 422
+
+    storage = switch_process(monkeypatch, other)
+    client = make_app(lambda: storage).test_client()
+    assert post(client, '/apply', {'name': 'Grace'}).status_code == 422
+    assert len(storage.all_documents('partnership_applications')) == 1
+
+
+def test_retry_on_another_worker_is_replayed(backend, monkeypatch):
+    storage, other = backend
+    client = make_app(lambda: storage).test_client()
+    first = post(client, '/apply', {'name': 'Ada'})
+    assert post(client, '/subscribe', {'email': 'ada@example.com'}).status_code == 200
+
+    storage = switch_process(monkeypatch, other)
+    client = make_app(lambda: storage).test_client()
+    retry = post(client, '/apply', {'name': 'Ada'})
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json()['reference_number'] == first.get_json()['reference_number']
+    subscribed = post(client, '/subscribe', {'email': 'ada@example.com'})
+    assert subscribed.status_code == 200
+    assert subscribed.get_json() == {'success': True}
+
+
+def test_failed_request_releases_the_key(backend, monkeypatch):
+    storage, other = backend
+    storage.add_submission('newsletter_subscribers', {'email': 'ada@example.com'})
+    client = make_app(lambda: storage).test_client()
+    assert post(client, '/subscribe', {'email': 'ada@example.com'}).status_code == 400
+
+    storage = switch_process(monkeypatch, other)
+    client = make_app(lambda: storage).test_client()
+    assert post(client, '/subscribe', {'email': 'grace@example.com'}).status_code == 200
+
+
+def test_key_still_claimed_elsewhere_is_in_progress(backend):
+    storage, _ = backend
+    fingerprint = hashlib.sha256(json.dumps({'name': 'Ada'}).encode('utf-8')).hexdigest()
+    idempotency.claim_key(storage, 'apply:retry-key-0001', fingerprint)
+    client = make_app(lambda: storage).test_client()
+    assert post(client, '/apply', {'name': 'Ada'}).status_code == 409
+    assert post(client, '/apply', {'name': 'Grace'}).status_code == 422
+
+    idempotency.save_key(storage, 'apply:retry-key-0001', fingerprint)
+    assert post(client, '/apply', {'name': 'Ada'}).status_code == 200
@@ -0,0 +1,21 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+
+def test_search_with_only_stopword_documents():
+    index = SearchIndex()
+    index.add('x', {'title': 'the'}, {})
+    assert index.search('a') == []
+    assert index.search('cardiology') == []
+
+
+def test_search_still_ranks_after_empty_documents():
+    index = SearchIndex()
+    index.add('empty', {'title': ''}, {'id': 'empty'})
+    index.add('hit', {'title': 'Cardiology basics'}, {'id': 'hit'})
+    results = index.search('cardiology')
+    assert [result['id'] for result in results] == ['hit']
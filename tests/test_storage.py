@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+from storage import MemoryStorage, SQLiteStorage, Storage, SERVER_TIMESTAMP, create_storage
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def storage(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryStorage()
+    else:
+        storage = SQLiteStorage(str(tmp_path / 'site.sqlite3'))
+        yield storage
+        storage.close()
+
+
+def day(n):
+    return datetime(2024, 1, n, tzinfo=timezone.utc)
+
+
+def test_blogs_by_slug_then_id(storage):
+    storage.put('blogs', 'doc-1', {'slug': 'heart-sounds', 'status': 'published', 'createdAt': day(1)})
+    storage.put('blogs', 'doc-2', {'status': 'published', 'createdAt': day(2)})
+    storage.put('blogs', 'doc-3', {'slug': 'draft', 'status': 'draft', 'createdAt': day(3)})
+    storage.put('blogs', 'doc-4', {'slug': 'undated', 'status': 'published'})
+
+    assert storage.get_blog('heart-sounds')['id'] == 'doc-1'
+    assert storage.get_blog('doc-1')['slug'] == 'heart-sounds'
+    assert storage.get_blog('doc-2')['slug'] == 'doc-2'
+    assert storage.get_blog('missing') is None
+
+    assert [post['id'] for post in storage.list_blogs()] == ['doc-2', 'doc-1']
+    assert [post['id'] for post in storage.list_blogs(limit=1)] == ['doc-2']
+    assert {post['id'] for post in storage.list_blogs(newest_first=False)} == {'doc-1', 'doc-2', 'doc-4'}
+    assert all(post['update_time'] for post in storage.list_blogs())
+
+
+def test_courses(storage):
+    storage.put('courses', 'c1', {'title': 'Cardio', 'status': 'published', 'category': 'doctalks',
+                                  'pricing': {'amount': 10, 'currency': 'EUR'}})
+    storage.put('courses', 'c2', {'title': 'Teeth', 'status': 'published', 'category': 'denttalks'})
+    storage.put('courses', 'c3', {'title': 'Old', 'status': 'archived', 'category': 'doctalks'})
+
+    assert {c['id'] for c in storage.list_courses()} == {'c1', 'c2'}
+    assert [c['id'] for c in storage.list_courses(category='doctalks')] == ['c1']
+    assert storage.get_course('c3')['status'] == 'archived'
+    assert storage.get_course('missing') is None
+
+    found = storage.get_courses(['c1', 'missing', 'c2'], fields=['title', 'pricing.amount'])
+    assert set(found) == {'c1', 'c2'}
+    assert found['c1']['pricing'] == {'amount': 10}
+    assert 'category' not in found['c1']
+    assert found['c1']['id'] == 'c1'
+
+
+def test_enrollment_counters(storage):
+    storage.put('courses', 'c1', {'title': 'Cardio', 'status': 'published'})
+    storage.add_enrollment({'email': 'a@example.com', 'enrolled_at': SERVER_TIMESTAMP}, 'c1', 0, doc_id='e1')
+    storage.add_enrollment({'email': 'a@example.com', 'enrolled_at': SERVER_TIMESTAMP}, 'c1', 1, doc_id='e1')
+    storage.add_enrollment({'email': 'b@example.com', 'enrolled_at': SERVER_TIMESTAMP}, 'c1', 1)
+    assert storage.read_enrollment_count('c1') == 2
+    assert storage.read_enrollment_count('c2') == 0
+    assert isinstance(storage.find_submission('course_enrollments', 'email', 'a@example.com')['enrolled_at'], datetime)
+
+    storage.set_enrolled_count('c1', 2)
+    course = storage.get_course('c1')
+    assert course['enrolled_count'] == 2
+    assert course['title'] == 'Cardio'
+    with pytest.raises(KeyError):
+        storage.set_enrolled_count('missing', 1)
+    assert storage.get_course('missing') is None
+
+
+def test_submissions(storage):
+    storage.add_submission('newsletter_subscribers', {'email': 'a@example.com', 'subscribed_at': day(1)})
+    assert storage.find_submission('newsletter_subscribers', 'email', 'a@example.com')['subscribed_at'] == day(1)
+    assert storage.find_submission('newsletter_subscribers', 'email', 'b@example.com') is None
+
+    first = storage.create_submission('partnership_applications', 'key', {'reference_number': 'R1', 'submitted_at': day(1)})
+    retry = storage.create_submission('partnership_applications', 'key', {'reference_number': 'R2', 'submitted_at': day(1)})
+    assert first['reference_number'] == retry['reference_number'] == 'R1'
+    with pytest.raises(ValueError):
+        storage.add_submission('blogs', {})
+
+    assert storage.create_document('idempotency_keys', 'k', {'n': 1}) == (True, {'n': 1, 'id': 'k'})
+    created, existing = storage.create_document('idempotency_keys', 'k', {'n': 2})
+    assert not created and existing['n'] == 1
+
+
+def test_page_submissions(storage):
+    for n in (3, 1, 2, 2):
+        storage.add_submission('contact_submissions', {'timestamp': day(n), 'n': n})
+    storage.add_submission('contact_submissions', {'n': 0})
+
+    page = storage.page_submissions('contact_submissions', limit=2)
+    assert [doc['n'] for doc in page] == [1, 2]
+    last = page[-1]
+    rest = storage.page_submissions('contact_submissions', after=(last['timestamp'], last['id']))
+    assert [doc['n'] for doc in rest] == [2, 3]
+    assert [doc['n'] for doc in storage.page_submissions('contact_submissions', start=day(2), end=day(3))] == [2, 2]
+
+
+def test_create_storage(monkeypatch, tmp_path):
+    fixtures = tmp_path / 'fixtures.json'
+    fixtures.write_text(json.dumps({'courses': {'c1': {'status': 'published'}}}))
+    monkeypatch.setenv('STORAGE_FIXTURES', str(fixtures))
+    monkeypatch.setenv('STORAGE_SQLITE_PATH', str(tmp_path / 'site.sqlite3'))
+
+    memory = create_storage('memory')
+    assert isinstance(memory, MemoryStorage)
+    assert memory.get_course('c1')['status'] == 'published'
+
+    monkeypatch.setenv('STORAGE_BACKEND', 'sqlite')
+    sqlite = create_storage()
+    assert isinstance(sqlite, SQLiteStorage)
+    assert sqlite.path == str(tmp_path / 'site.sqlite3')
+    assert sqlite.get_course('c1')['status'] == 'published'
+    sqlite.close()
+
+    with pytest.raises(ValueError):
+        create_storage('redis')
+
+
+def test_incomplete_backend_fails_when_created():
+    class Partial(Storage):
+        def list_blogs(self, status='published', limit=None, newest_first=True):
+            return []
+
+    with pytest.raises(TypeError):
+        Partial()
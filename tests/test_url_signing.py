@@ -0,0 +1,63 @@
+import base64
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('CONTENT_SNAPSHOT_PATH', '')
+
+from url_signing import URLSigner, parse_keys, sign_course_videos
+
+KEY = base64.urlsafe_b64encode(b'0123456789abcdef').decode('ascii')
+VIDEO = 'https://cdn.example.com/lesson-1.mp4'
+NOW = 1_700_000_000
+
+
+def make_signer(**kwargs):
+    return URLSigner(keys=parse_keys(f'main:{KEY},old:{KEY}'), ttl=600, bucket_seconds=3600, **kwargs)
+
+
+def test_signed_url_round_trip():
+    signer = make_signer()
+    signed = signer.sign(VIDEO, now=NOW)
+    assert signed.startswith(VIDEO + '?Expires=') and '&KeyName=main&Signature=' in signed
+    assert signer.verify(signed, now=NOW) == (True, '')
+    assert make_signer(active_key='old').verify(signed, now=NOW) == (True, '')
+    assert signer.sign(VIDEO + '?quality=hd', now=NOW).startswith(VIDEO + '?quality=hd&Expires=')
+
+
+def test_expired_and_tampered_urls_are_rejected():
+    signer = make_signer()
+    signed = signer.sign(VIDEO, now=NOW)
+    expires = signer.expires_at(NOW)
+    assert signer.verify(signed, now=expires + 1) == (False, 'expired')
+    assert signer.verify(signed.replace('lesson-1', 'lesson-2'), now=NOW) == (False, 'bad signature')
+    assert signer.verify(signed.replace(f'Expires={expires}', f'Expires={expires + 3600}'),
+                         now=NOW) == (False, 'bad signature')
+    assert signer.verify(signed.replace('KeyName=main', 'KeyName=gone'), now=NOW) == (False, 'unknown key')
+    assert signer.verify(VIDEO, now=NOW) == (False, 'missing signature')
+
+
+def test_signature_is_stable_within_a_bucket():
+    signer = make_signer()
+    # Expiry is rounded up from now + ttl, so buckets start ttl before each boundary
+    start = NOW - NOW % 3600 - signer.ttl
+    first = signer.sign(VIDEO, now=start + 1)
+    assert signer.sign(VIDEO, now=start + 3599) == first
+    assert make_signer().sign(VIDEO, now=start + 1800) == first
+    assert signer.sign(VIDEO, now=start + 3601) != first
+    assert signer.expires_at(start + 1) - (start + 1) >= signer.ttl
+
+
+def test_unsigned_without_keys():
+    assert URLSigner().sign(VIDEO) == VIDEO
+
+
+def test_course_pages_only_link_preview_lessons():
+    course = {'sections': [{'lessons': [
+        {'video_url': VIDEO, 'is_preview': True},
+        {'video_url': 'https://cdn.example.com/paid.mp4'},
+    ]}]}
+    lessons = sign_course_videos(course)['sections'][0]['lessons']
+    assert [lesson['playback_url'] for lesson in lessons] == [VIDEO, '']
+    assert lessons[1]['video_url'] == 'https://cdn.example.com/paid.mp4'
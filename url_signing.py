@@ -0,0 +1,160 @@
+"""
+Signed video URLs with rotating keys and bucketed expiry.
+
+URLs are signed in the Cloud CDN signed-URL format: `Expires` and `KeyName`
+query parameters plus `Signature`, the URL-safe base64 HMAC-SHA1 of the URL
+up to and including KeyName, keyed with the base64url-decoded key.
+
+Expiry times are rounded up to the end of a bucket (VIDEO_URL_BUCKET_SECONDS),
+so every request inside one bucket gets the same signed URL for a video and
+signatures are computed once per video per bucket and then served from a
+BoundedCache. A link is valid for at least VIDEO_URL_TTL seconds, which has
+to outlast every cached copy of the pages embedding it (s-maxage plus
+stale-while-revalidate plus stale-if-error; app.py raises the TTL to that
+when it is set lower). Frozen pages are never signed.
+
+Keys are configured as VIDEO_SIGNING_KEYS="name:base64key,old:base64key"; new
+links are signed with VIDEO_SIGNING_KEY_NAME (default: the first key) and any
+listed key verifies, so a key can be rotated in before and out after its
+links expire. Without keys URLs are returned unsigned.
+
+Usage:
+    from url_signing import video_signer
+
+    url = video_signer.sign('https://cdn.example.com/lesson-1.mp4')
+    video_signer.verify(url)
+"""
+
+import base64
+import hashlib
+import hmac
+import math
+import os
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from content_store import BoundedCache
+
+
+VIDEO_URL_TTL = int(os.getenv('VIDEO_URL_TTL', str(10 * 86400)))
+VIDEO_URL_BUCKET_SECONDS = int(os.getenv('VIDEO_URL_BUCKET_SECONDS', '3600'))
+
+SIGNED_PARAMS = ('Expires', 'KeyName', 'Signature')
+
+
+def parse_keys(value):
+    """{name: key bytes} from 'name:base64key,...'; malformed entries are skipped."""
+    keys = {}
+    for item in (value or '').split(','):
+        name, _, encoded = item.strip().partition(':')
+        if not name or not encoded:
+            continue
+        try:
+            keys[name] = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+        except ValueError:
+            print(f"Ignoring malformed video signing key '{name}'")
+    return keys
+
+
+def _signature(key, url_to_sign):
+    digest = hmac.new(key, url_to_sign.encode('utf-8'), hashlib.sha1).digest()
+    return base64.urlsafe_b64encode(digest).decode('ascii')
+
+
+class URLSigner:
+    """
+    HMAC URL signer.
+
+    Args:
+        keys: {key name: key bytes}
+        active_key: Name of the key new URLs are signed with
+        ttl: Minimum seconds a signed URL stays valid
+        bucket_seconds: Expiry rounding; URLs signed in one bucket are identical
+        cache_size: Signed URLs memoized
+    """
+
+    def __init__(self, keys=None, active_key=None, ttl=VIDEO_URL_TTL,
+                 bucket_seconds=VIDEO_URL_BUCKET_SECONDS, cache_size=5000):
+        self.keys = dict(keys or {})
+        if active_key and active_key not in self.keys:
+            print(f"Unknown video signing key '{active_key}', signing with the first key")
+            active_key = None
+        self.active_key = active_key or next(iter(self.keys), None)
+        self.ttl = ttl
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.cache = BoundedCache(max_entries=cache_size, ttl=self.bucket_seconds)
+
+    @property
+    def enabled(self):
+        return self.active_key is not None
+
+    def expires_at(self, now=None):
+        """Expiry shared by every URL signed in the current bucket."""
+        now = time.time() if now is None else now
+        return int(math.ceil((now + self.ttl) / self.bucket_seconds) * self.bucket_seconds)
+
+    def sign(self, url, now=None):
+        """Signed URL for `url`, or `url` itself when unset or signing is off."""
+        if not url or not self.enabled:
+            return url
+        expires = self.expires_at(now)
+        cache_key = (url, self.active_key, expires)
+        signed = self.cache.get(cache_key)
+        if signed is None:
+            separator = '&' if '?' in url else '?'
+            url_to_sign = f'{url}{separator}Expires={expires}&KeyName={self.active_key}'
+            signed = f'{url_to_sign}&Signature={_signature(self.keys[self.active_key], url_to_sign)}'
+            self.cache.set(cache_key, signed)
+        return signed
+
+    def verify(self, url, now=None):
+        """
+        Check a signed URL.
+
+        Returns:
+            (ok, reason) where reason is '' when ok
+        """
+        values = dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+        if not all(name in values for name in SIGNED_PARAMS) or '&Signature=' not in url:
+            return False, 'missing signature'
+        # The signature covers the URL up to and including KeyName
+        url_to_sign = url[:url.rindex('&Signature=')]
+        key = self.keys.get(values['KeyName'])
+        if key is None:
+            return False, 'unknown key'
+        try:
+            expires = int(values['Expires'])
+        except ValueError:
+            return False, 'malformed expiry'
+        if expires < (time.time() if now is None else now):
+            return False, 'expired'
+        if not hmac.compare_digest(_signature(key, url_to_sign), values['Signature']):
+            return False, 'bad signature'
+        return True, ''
+
+
+def sign_course_videos(course):
+    """
+    Set `playback_url` on every lesson of a processed course.
+
+    Preview lessons keep their public video_url. Paid lessons get an empty
+    one: course pages are cached and shared by every viewer, so they never
+    carry a playable link to paid content. video_url itself is left
+    untouched.
+
+    Args:
+        course: Processed course dictionary (modified in place)
+
+    Returns:
+        The same course dictionary
+    """
+    for section in course.get('sections', []):
+        for lesson in section.get('lessons', []):
+            lesson['playback_url'] = lesson.get('video_url', '') if lesson.get('is_preview') else ''
+    return course
+
+
+video_signer = URLSigner(
+    keys=parse_keys(os.getenv('VIDEO_SIGNING_KEYS', '')),
+    active_key=os.getenv('VIDEO_SIGNING_KEY_NAME') or None,
+)
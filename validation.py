@@ -0,0 +1,323 @@
+"""
+Form validation shared by the Flask (app.py) and ASGI (asgi_app.py) apps.
+"""
+
+import random
+import re
+import string
+from datetime import datetime
+
+
+# --- Partnership Application Schema ---
+PARTNERSHIP_SCHEMA = {
+    'allowed_job_titles': [
+        'Director / Founder', 'Academic Coordinator', 'Faculty / Trainer',
+        'Business Development', 'Consultant', 'Other'
+    ],
+    'allowed_countries': [
+        'India', 'United States', 'United Kingdom', 'Canada', 'Australia',
+        'New Zealand', 'Ireland', 'South Africa', 'Singapore', 'Philippines',
+        'Turkey', 'United Arab Emirates', 'Saudi Arabia', 'Germany', 'France',
+        'Japan', 'South Korea', 'Nepal', 'Sri Lanka', 'Bangladesh',
+        'Pakistan', 'Nigeria', 'Other'
+    ],
+    'allowed_org_types': [
+        'Medical College', 'Nursing College', 'Hospital', 'EdTech Company',
+        'Study Abroad Consultancy', 'Individual Trainer', 'Other'
+    ],
+    'allowed_student_volumes': ['0-100', '100-500', '500-1000', '1000+', 'Not Applicable'],
+    'allowed_partnership_types': [
+        'Authorized Training Partner', 'Campus Program Partner',
+        'Reseller / Referral Partner', 'Corporate Hospital Training Partner',
+        'Faculty Representative'
+    ],
+    'allowed_timelines': ['Immediately', '1-3 months', '3-6 months', 'Not sure yet'],
+    'allowed_target_segments': [
+        'MBBS Students', 'Nursing Students', 'Doctors / Clinicians',
+        'IELTS/OET Aspirants', 'International Placement'
+    ],
+}
+
+def validate_partnership_application(data):
+    """Validate all fields of the partnership application against the schema.
+    Returns (is_valid, errors_dict, sanitized_data)."""
+    errors = {}
+    clean = {}
+
+    # --- Step 1: Personal Information ---
+    # First Name
+    first_name = (data.get('firstName') or '').strip()
+    if not first_name:
+        errors['firstName'] = 'First name is required.'
+    elif len(first_name) < 2 or len(first_name) > 50:
+        errors['firstName'] = 'First name must be 2-50 characters.'
+    elif not re.match(r"^[A-Za-z\s\-'.]+$", first_name):
+        errors['firstName'] = 'First name contains invalid characters.'
+    else:
+        clean['first_name'] = first_name
+
+    # Last Name (optional)
+    last_name = (data.get('lastName') or '').strip()
+    if last_name:
+        if len(last_name) > 50:
+            errors['lastName'] = 'Last name must be at most 50 characters.'
+        elif not re.match(r"^[A-Za-z\s\-'.]+$", last_name):
+            errors['lastName'] = 'Last name contains invalid characters.'
+        else:
+            clean['last_name'] = last_name
+    else:
+        clean['last_name'] = ''
+
+    # Email
+    email = (data.get('email') or '').strip().lower()
+    email_regex = r'^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$'
+    if not email:
+        errors['email'] = 'Email address is required.'
+    elif not re.match(email_regex, email):
+        errors['email'] = 'Please enter a valid email address.'
+    else:
+        clean['email'] = email
+
+    # Country Code (accept any non-empty value since we have 50+ codes)
+    country_code = (data.get('countryCode') or '').strip()
+    if not country_code:
+        errors['countryCode'] = 'Country code is required.'
+    elif not re.match(r'^\+\d{1,4}(-[A-Z]{2})?$', country_code):
+        errors['countryCode'] = 'Invalid country code format.'
+    else:
+        clean['country_code'] = country_code
+
+    # Phone
+    phone = (data.get('phone') or '').strip()
+    phone_digits = re.sub(r'[\s\-()]+', '', phone)
+    if not phone:
+        errors['phone'] = 'Phone number is required.'
+    elif not re.match(r'^\d{7,15}$', phone_digits):
+        errors['phone'] = 'Phone must be 7-15 digits.'
+    else:
+        clean['phone'] = phone_digits
+
+    # isWhatsapp (optional boolean)
+    clean['is_whatsapp'] = bool(data.get('isWhatsapp', False))
+
+    # Job Title
+    job_title = (data.get('jobTitle') or '').strip()
+    if not job_title:
+        errors['jobTitle'] = 'Role in organization is required.'
+    elif job_title not in PARTNERSHIP_SCHEMA['allowed_job_titles']:
+        errors['jobTitle'] = 'Invalid role selected.'
+    else:
+        clean['job_title'] = job_title
+
+    # LinkedIn
+    linkedin = (data.get('linkedin') or '').strip()
+    if not linkedin:
+        errors['linkedin'] = 'LinkedIn profile URL is required.'
+    elif not re.match(r'^https?://(www\.)?linkedin\.com/in/.+', linkedin):
+        errors['linkedin'] = 'Please enter a valid LinkedIn profile URL (e.g. https://linkedin.com/in/your-profile).'
+    else:
+        clean['linkedin'] = linkedin
+
+    # --- Step 2: Institution Details ---
+    # Company
+    company = (data.get('company') or '').strip()
+    if not company:
+        errors['company'] = 'Institution/company name is required.'
+    elif len(company) < 2 or len(company) > 100:
+        errors['company'] = 'Institution name must be 2-100 characters.'
+    else:
+        clean['company'] = company
+
+    # Website (optional)
+    website = (data.get('website') or '').strip()
+    if website:
+        if not re.match(r'^https?://.+\..+', website):
+            errors['website'] = 'Please enter a valid URL starting with http:// or https://.'
+        else:
+            clean['website'] = website
+    else:
+        clean['website'] = ''
+
+    # Country
+    country = (data.get('country') or '').strip()
+    if not country:
+        errors['country'] = 'Country is required.'
+    elif country not in PARTNERSHIP_SCHEMA['allowed_countries']:
+        errors['country'] = 'Invalid country selected.'
+    else:
+        clean['country'] = country
+
+    # Organization Type
+    org_type = (data.get('orgType') or '').strip()
+    if not org_type:
+        errors['orgType'] = 'Organization type is required.'
+    elif org_type not in PARTNERSHIP_SCHEMA['allowed_org_types']:
+        errors['orgType'] = 'Invalid organization type selected.'
+    else:
+        clean['org_type'] = org_type
+
+    # Student Volume
+    student_volume = (data.get('studentVolume') or '').strip()
+    if not student_volume:
+        errors['studentVolume'] = 'Student volume is required.'
+    elif student_volume not in PARTNERSHIP_SCHEMA['allowed_student_volumes']:
+        errors['studentVolume'] = 'Invalid student volume selected.'
+    else:
+        clean['student_volume'] = student_volume
+
+    # Current English Training
+    current_training = (data.get('currentEnglishTraining') or '').strip()
+    if not current_training:
+        errors['currentEnglishTraining'] = 'Please indicate if you currently offer English training.'
+    elif current_training not in ['Yes', 'No']:
+        errors['currentEnglishTraining'] = 'Invalid selection.'
+    else:
+        clean['current_english_training'] = current_training
+
+    # --- Step 3: Partnership Details ---
+    # Partnership Type
+    partnership_type = (data.get('partnershipType') or '').strip()
+    if not partnership_type:
+        errors['partnershipType'] = 'Partnership type is required.'
+    elif partnership_type not in PARTNERSHIP_SCHEMA['allowed_partnership_types']:
+        errors['partnershipType'] = 'Invalid partnership type selected.'
+    else:
+        clean['partnership_type'] = partnership_type
+
+    # Expected Timeline
+    timeline = (data.get('expectedTimeline') or '').strip()
+    if not timeline:
+        errors['expectedTimeline'] = 'Expected timeline is required.'
+    elif timeline not in PARTNERSHIP_SCHEMA['allowed_timelines']:
+        errors['expectedTimeline'] = 'Invalid timeline selected.'
+    else:
+        clean['expected_timeline'] = timeline
+
+    # Target Segments (array, at least 1)
+    target_segments = data.get('targetSegments', [])
+    if not isinstance(target_segments, list):
+        target_segments = [target_segments] if target_segments else []
+    target_segments = [s.strip() for s in target_segments if isinstance(s, str) and s.strip()]
+    if not target_segments:
+        errors['targetSegments'] = 'Please select at least one target segment.'
+    else:
+        invalid_segments = [s for s in target_segments if s not in PARTNERSHIP_SCHEMA['allowed_target_segments']]
+        if invalid_segments:
+            errors['targetSegments'] = 'One or more selected segments are invalid.'
+        else:
+            clean['target_segments'] = target_segments
+
+    # --- Step 4: Business Experience ---
+    # Monthly Volume
+    monthly_volume = (data.get('monthlyVolume') or '').strip()
+    if not monthly_volume:
+        errors['monthlyVolume'] = 'Expected monthly volume is required.'
+    elif len(monthly_volume) < 2 or len(monthly_volume) > 100:
+        errors['monthlyVolume'] = 'Monthly volume must be 2-100 characters.'
+    else:
+        clean['monthly_volume'] = monthly_volume
+
+    # Why Partner
+    why_partner = (data.get('whyPartner') or '').strip()
+    if not why_partner:
+        errors['whyPartner'] = 'Please explain why you want to partner with us.'
+    elif len(why_partner) < 20:
+        errors['whyPartner'] = 'Please provide at least 20 characters.'
+    elif len(why_partner) > 2000:
+        errors['whyPartner'] = 'Please keep your response under 2000 characters.'
+    else:
+        clean['why_partner'] = why_partner
+
+    # --- Step 5: Agreement ---
+    # Additional Info (optional)
+    additional_info = (data.get('additionalInfo') or '').strip()
+    if additional_info and len(additional_info) > 2000:
+        errors['additionalInfo'] = 'Additional info must be under 2000 characters.'
+    else:
+        clean['additional_info'] = additional_info
+
+    # Agree to Terms
+    if not data.get('agreeToTerms'):
+        errors['agreeToTerms'] = 'You must agree to the terms and conditions.'
+    else:
+        clean['agree_to_terms'] = True
+
+    # Authority
+    if not data.get('authority'):
+        errors['authority'] = 'You must confirm you have authority for partnership discussions.'
+    else:
+        clean['authority_confirmed'] = True
+
+    # Demo Call
+    demo_call = (data.get('demoCall') or '').strip()
+    if demo_call not in ['Yes', 'No']:
+        errors['demoCall'] = 'Please indicate your demo call preference.'
+    else:
+        clean['demo_call'] = demo_call
+
+    return (len(errors) == 0, errors, clean)
+
+
+def generate_reference_number():
+    """Unique application reference: MT-YYYYMMDD-XXXXX."""
+    date_part = datetime.utcnow().strftime('%Y%m%d')
+    random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+    return f"MT-{date_part}-{random_part}"
+
+
+def get_remote_ip(headers, remote_addr):
+    """Client IP, preferring the first X-Forwarded-For hop."""
+    remote_ip = headers.get('X-Forwarded-For', remote_addr)
+    if remote_ip and ',' in remote_ip:
+        remote_ip = remote_ip.split(',')[0].strip()
+    return remote_ip
+
+
+def build_partnership_document(clean_data, reference_number, remote_ip, submitted_at):
+    """
+    Firestore document for a validated partnership application.
+
+    Args:
+        clean_data: Sanitized fields from validate_partnership_application
+        reference_number: Reference shown to the applicant
+        remote_ip: Client IP address
+        submitted_at: Timestamp value (usually firestore.SERVER_TIMESTAMP)
+    """
+    return {
+        # Reference
+        'reference_number': reference_number,
+        # Personal Info
+        'first_name': clean_data['first_name'],
+        'last_name': clean_data['last_name'],
+        'full_name': f"{clean_data['first_name']} {clean_data['last_name']}".strip(),
+        'email': clean_data['email'],
+        'country_code': clean_data['country_code'],
+        'phone': clean_data['phone'],
+        'full_phone': f"{clean_data['country_code']}{clean_data['phone']}",
+        'is_whatsapp': clean_data['is_whatsapp'],
+        'job_title': clean_data['job_title'],
+        'linkedin': clean_data['linkedin'],
+        # Institution Details
+        'company': clean_data['company'],
+        'website': clean_data['website'],
+        'country': clean_data['country'],
+        'org_type': clean_data['org_type'],
+        'student_volume': clean_data['student_volume'],
+        'current_english_training': clean_data['current_english_training'],
+        # Partnership Details
+        'partnership_type': clean_data['partnership_type'],
+        'expected_timeline': clean_data['expected_timeline'],
+        'target_segments': clean_data['target_segments'],
+        # Business Experience
+        'monthly_volume': clean_data['monthly_volume'],
+        'why_partner': clean_data['why_partner'],
+        # Agreement
+        'additional_info': clean_data['additional_info'],
+        'agree_to_terms': clean_data['agree_to_terms'],
+        'authority_confirmed': clean_data['authority_confirmed'],
+        'demo_call': clean_data['demo_call'],
+        # Metadata
+        'submitted_at': submitted_at,
+        'status': 'new',
+        'ip_address': remote_ip,
+    }
@@ -1,16 +1,38 @@
 """
 Video CDN URL config — reads Firebase Storage URLs from environment variables.
 Import get_video_urls() and pass the result into render_template() calls.
+
+The variables are read once at import. With VIDEO_SIGN_HERO=1 and signing
+keys configured (see url_signing), the URLs are returned signed; signatures
+are memoized per expiry bucket, so this stays cheap on every render. The
+freeze command renders them unsigned.
 """
 
 import os
 
+from url_signing import video_signer
+
+
+VIDEO_URLS = {
+    'video_dr_meddy_url':      os.environ.get('VIDEO_DR_MEDDY_URL', ''),
+    'video_recording_url':     os.environ.get('VIDEO_RECORDING_URL', ''),
+    'video_sample1_url':       os.environ.get('VIDEO_SAMPLE1_URL', ''),
+    'video_sample2_url':       os.environ.get('VIDEO_SAMPLE2_URL', ''),
+    'video_sample3_url':       os.environ.get('VIDEO_SAMPLE3_URL', ''),
+    'video_medtalk_intro_url': os.environ.get('VIDEO_MEDTALK_INTRO_URL', ''),
+}
 
-def get_video_urls():
+SIGN_HERO_VIDEOS = os.getenv('VIDEO_SIGN_HERO', '0') == '1'
+
+
+def get_video_urls(signed=None):
     """
     Returns a dict of all CDN video URLs from environment variables.
     Use this in every Flask route that renders a template with video.
 
+    Args:
+        signed: Sign the URLs (default: VIDEO_SIGN_HERO)
+
     Usage in app.py:
         from video_config import get_video_urls
 
@@ -18,11 +40,8 @@ def get_video_urls():
         def index():
             return render_template('index.html', **get_video_urls())
     """
-    return {
-        'video_dr_meddy_url':      os.environ.get('VIDEO_DR_MEDDY_URL', ''),
-        'video_recording_url':     os.environ.get('VIDEO_RECORDING_URL', ''),
-        'video_sample1_url':       os.environ.get('VIDEO_SAMPLE1_URL', ''),
-        'video_sample2_url':       os.environ.get('VIDEO_SAMPLE2_URL', ''),
-        'video_sample3_url':       os.environ.get('VIDEO_SAMPLE3_URL', ''),
-        'video_medtalk_intro_url': os.environ.get('VIDEO_MEDTALK_INTRO_URL', ''),
-    }
\ No newline at end of file
+    if signed is None:
+        signed = SIGN_HERO_VIDEOS
+    if not signed:
+        return dict(VIDEO_URLS)
+    return {name: video_signer.sign(url) for name, url in VIDEO_URLS.items()}
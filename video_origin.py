@@ -0,0 +1,145 @@
+"""
+Local stand-in for the signed-URL video CDN.
+
+Serves files from a directory only when the request carries a valid
+signature (see url_signing), answering 403 with the reason otherwise, so
+signed lesson and hero links can be checked end to end without a real CDN.
+Supports single byte ranges, which is what <video> elements request.
+
+Usage:
+    python video_origin.py --port 9100 --dir static/videos
+    VIDEO_SIGNING_KEYS=dev:$(python -c "import os,base64;print(base64.urlsafe_b64encode(os.urandom(16)).decode())") \\
+    VIDEO_SIGN_HERO=1 VIDEO_MEDTALK_INTRO_URL=http://127.0.0.1:9100/medtalkintro.mp4 flask --app app --debug run
+
+Or in-process:
+    origin = VideoOrigin(directory, signer=video_signer).start()
+    ... origin.url_for('lesson-1.mp4') ...
+    origin.stop()
+"""
+
+import argparse
+import mimetypes
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from url_signing import video_signer
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class VideoOrigin:
+    """
+    Threaded HTTP server verifying signed URLs before serving files.
+
+    Args:
+        directory: Directory files are served from
+        signer: URLSigner whose keys verify requests
+    """
+
+    def __init__(self, directory, host='127.0.0.1', port=0, signer=None):
+        self.directory = os.path.abspath(directory)
+        self.signer = signer or video_signer
+        self.served = []
+        self.rejected = []
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = f'{origin.base_url}{self.path}'
+                ok, reason = origin.signer.verify(url)
+                if not ok:
+                    origin.rejected.append((self.path, reason))
+                    self._reply(403, reason.encode('utf-8'), 'text/plain')
+                    return
+                path = os.path.normpath(os.path.join(origin.directory, unquote(urlsplit(self.path).path).lstrip('/')))
+                if not path.startswith(origin.directory + os.sep) or not os.path.isfile(path):
+                    self._reply(404, b'not found', 'text/plain')
+                    return
+                origin.served.append(self.path)
+                self._send_file(path)
+
+            def _send_file(self, path):
+                size = os.path.getsize(path)
+                start, end = 0, size - 1
+                status = 200
+                match = RANGE_RE.match(self.headers.get('Range', ''))
+                if match and (match.group(1) or match.group(2)):
+                    if match.group(1):
+                        start = int(match.group(1))
+                        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                    else:
+                        start = max(0, size - int(match.group(2)))
+                    if start > end:
+                        self.send_response(416)
+                        self.send_header('Content-Range', f'bytes */{size}')
+                        self.end_headers()
+                        return
+                    status = 206
+                self.send_response(status)
+                self.send_header('Content-Type', mimetypes.guess_type(path)[0] or 'application/octet-stream')
+                self.send_header('Content-Length', str(end - start + 1))
+                self.send_header('Accept-Ranges', 'bytes')
+                if status == 206:
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                self.end_headers()
+                with open(path, 'rb') as fh:
+                    fh.seek(start)
+                    remaining = end - start + 1
+                    while remaining > 0:
+                        chunk = fh.read(min(65536, remaining))
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                        remaining -= len(chunk)
+
+            def _reply(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url_for(self, name):
+        """Unsigned URL of a file under the served directory."""
+        return f'{self.base_url}/{name}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local signed-URL video origin.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--dir', default=os.path.join('static', 'videos'))
+    args = parser.parse_args()
+
+    if not video_signer.enabled:
+        print("VIDEO_SIGNING_KEYS is not set; every request will be rejected")
+    origin = VideoOrigin(args.dir, args.host, args.port)
+    print(f"Serving signed videos from {origin.directory} on {origin.base_url}")
+    try:
+        origin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass